@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.AsyncCommandableHttpClient
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Asynchronous commandable HTTP client implementation
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+from abc import ABC
+from typing import Any, List, Optional
+
+from pip_services3_commons.errors import InvocationException
+
+from .AsyncRestClient import AsyncRestClient
+
+
+class AsyncCommandableHttpClient(AsyncRestClient, ABC):
+    """
+    Abstract client that calls commandable HTTP service from asyncio code.
+    It is an asynchronous counterpart of :class:`CommandableHttpClient <pip_services3_rpc.clients.CommandableHttpClient.CommandableHttpClient>`.
+    Each command is exposed as POST operation that receives all parameters in body object.
+
+    ### Configuration parameters ###
+        - base_route:              base route for remote URI
+        - connection(s):             one or several endpoints of the remote service
+            - discovery_key:         (optional) a key to retrieve the connection from IDiscovery
+            - protocol:              connection protocol: http or https
+            - host:                  host name or IP address
+            - port:                  port number
+            - uri:                   resource URI or connection string with all parameters in it
+        - options:
+            - retries:               number of retries (default: 3)
+            - retry_delay:           initial retry delay in milliseconds (default: 100)
+            - retry_max_delay:       maximum retry delay in milliseconds (default: 5 sec)
+            - retry_budget:          maximum number of accumulated retry tokens (default: 10)
+            - retry_budget_ratio:    number of retry tokens earned by every call (default: 0.2)
+            - connect_timeout:       connection timeout in milliseconds (default: 10 sec)
+            - timeout:               read timeout in milliseconds for every attempt (default: 10 sec)
+            - total_timeout:         timeout in milliseconds for the whole call including retries (default: 0, no limit).
+                                     The time left is sent to the service in *X-Request-Timeout* header
+            - pool_size:             number of hosts the connection pool is sized for (default: 10)
+            - max_connections:       maximum number of keep-alive connections per host (default: 100)
+            - keep_alive_timeout:    idle time in milliseconds after which pooled connections are dropped (default: 5 sec)
+            - compression:           accepts compressed responses with gzip, deflate or brotli encoding
+                                     and decodes them transparently (default: true)
+            - json_codec:            the codec to encode requests and decode responses: "json" for the standard
+                                     json module (default) or "orjson" for C-accelerated orjson package
+            - balancing:             strategy to spread calls across several endpoints: round_robin (default),
+                                     least_requests or p2c, see :class:`LoadBalancer <pip_services3_rpc.clients.LoadBalancer.LoadBalancer>`
+            - eject_failures:        number of consecutive failures after which an endpoint is not used (default: 3)
+            - eject_timeout:         time in milliseconds a failing endpoint is not used (default: 10 sec)
+            - circuit_breaker:       true to stop calls to failing or slow endpoints for a while (default: false),
+                                     see :class:`CircuitBreaker <pip_services3_rpc.clients.CircuitBreaker.CircuitBreaker>` for breaker_* options
+
+    ### References ###
+        - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
+        - `*:counters:*:*:1.0`         (optional) :class:`ICounters <pip_services3_components.count.ICounters.ICounters>` components to pass collected measurements
+        - `*:discovery:*:*:1.0`        (optional) :class:`IDiscovery <pip_services3_components.connect.IDiscovery.IDiscovery>` services to resolve connection
+
+    Example:
+
+    .. code-block:: python
+
+        class MyAsyncCommandableHttpClient(AsyncCommandableHttpClient, IMyClient):
+            # ...
+
+            async def get_data(self, correlation_id, id):
+                return await self.call_command("get_data", correlation_id, {'id': id})
+
+            # ...
+
+        client = MyAsyncCommandableHttpClient()
+        client.configure(ConfigParams.from_tuples("connection.protocol", "http",
+                                                  "connection.host", "localhost",
+                                                  "connection.port", 8080))
+        await client.open("123")
+        data = await client.get_data("123", "1")
+        # ...
+    """
+
+    def __init__(self, base_route: str):
+        """
+        Creates a new instance of the client.
+
+        :param base_route: a base route for remote service.
+        """
+        super(AsyncCommandableHttpClient, self).__init__()
+        self._base_route = base_route
+
+    async def call_command(self, name: str, correlation_id: Optional[str], params: Any,
+                           timeout: Optional[int] = None) -> Any:
+        """
+        Calls a remote method via HTTP commadable protocol. The call is made via POST operation and all parameters are sent in body object. The complete route to remote method is defined as baseRoute + "/" + name.
+
+        :param name: a name of the command to call.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :param params: command parameters.
+
+        :param timeout: (optional) the timeout in milliseconds for the whole call including retries,
+                        that overrides *options.total_timeout*.
+
+        :return: result of the command.
+        """
+        timing = self._instrument(correlation_id, self._base_route + '.' + name)
+        try:
+            return await self._call('POST', name, correlation_id, None, params, timeout=timeout)
+        except Exception as err:
+            timing.end_failure(err)
+            raise err
+        finally:
+            timing.end_timing()
+
+    async def call_commands(self, correlation_id: Optional[str], commands: List[dict],
+                            parallel: Optional[bool] = None) -> List[Any]:
+        """
+        Calls several remote commands in one round trip via "batch" operation of commandable HTTP service.
+        The service has to be configured with *batch.enabled* option.
+
+        Results are returned in the order of commands. Commands that failed
+        are returned as :class:`ApplicationException <pip_services3_commons.errors.ApplicationException.ApplicationException>`
+        objects instead of their results, so failure of one command does not affect the others.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :param commands: a list of commands to call, each as *{"command": name, "args": params}*.
+
+        :param parallel: (optional) true to execute the commands concurrently, false to execute them one after another
+                         or None to use the default of the service.
+
+        :return: a list with results of the commands or raised exceptions.
+        """
+        params = None if parallel is None else {'parallel': 'true' if parallel else 'false'}
+        timing = self._instrument(correlation_id, self._base_route + '.batch')
+        try:
+            responses = await self._call('POST', 'batch', correlation_id, params, commands)
+            return [self._to_batch_result(response) for response in responses or []]
+        except Exception as err:
+            timing.end_failure(err)
+            raise err
+        finally:
+            timing.end_timing()
+
+    async def call_commands_parallel(self, correlation_id: Optional[str], commands: List[dict],
+                                     timeout: Optional[int] = None) -> List[Any]:
+        """
+        Calls several remote commands at once, each via its own POST operation.
+        The calls share pooled keep-alive connections of the client and every call is instrumented
+        as a separate :func:`call_command`, so the total time is close to the time of the slowest call.
+
+        Results are returned in the order of commands. Commands that failed
+        are returned as :class:`ApplicationException <pip_services3_commons.errors.ApplicationException.ApplicationException>`
+        objects instead of their results. Commands that did not complete before the shared deadline
+        are cancelled and returned as InvocationException with "DEADLINE_EXCEEDED" code.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :param commands: a list of commands to call, each as *{"command": name, "args": params}*.
+
+        :param timeout: (optional) the shared deadline for all calls in milliseconds.
+
+        :return: a list with results of the commands or raised exceptions.
+        """
+        if len(commands) == 0:
+            return []
+
+        tasks = [asyncio.ensure_future(self.call_command(command.get('command'), correlation_id, command.get('args')))
+                 for command in commands]
+        await asyncio.wait(tasks, timeout=timeout / 1000 if timeout is not None else None)
+
+        results = []
+        for (command, task) in zip(commands, tasks):
+            if not task.done():
+                task.cancel()
+                results.append(InvocationException(correlation_id, 'DEADLINE_EXCEEDED',
+                                                   'Command ' + str(command.get('command'))
+                                                   + ' did not complete in ' + str(timeout) + ' ms')
+                               .with_details('command', command.get('command')))
+            elif task.exception() is not None:
+                results.append(task.exception())
+            else:
+                results.append(task.result())
+        return results
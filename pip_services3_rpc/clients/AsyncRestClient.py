@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.AsyncRestClient
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Asynchronous REST client implementation
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import time
+from typing import Optional, Any
+
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ConfigException, InvocationException
+
+from .BaseRestClient import BaseRestClient
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncRestClient(BaseRestClient):
+    """
+    Abstract client that calls remote endpoints using HTTP/REST protocol from asyncio code.
+    It is an asynchronous counterpart of :class:`RestClient <pip_services3_rpc.clients.RestClient.RestClient>`
+    that uses a pooled non-blocking aiohttp session, so a single event loop can carry
+    thousands of concurrent calls.
+
+    The client requires the optional *aiohttp* package (pip install pip_services3_rpc[async]).
+    Its :func:`open` and :func:`close` methods are coroutines and must be awaited.
+
+    ### Configuration parameters ###
+        - base_route:              base route for remote URI
+        - connection(s):             one or several endpoints of the remote service
+            - discovery_key:         (optional) a key to retrieve the connection from :class:`IDiscovery <pip_services3_components.connect.IDiscovery.IDiscovery>`
+            - protocol:              connection protocol: http or https
+            - host:                  host name or IP address
+            - port:                  port number
+            - uri:                   resource URI or connection string with all parameters in it
+        - options:
+            - retries:               number of retries (default: 3)
+            - retry_delay:           initial retry delay in milliseconds (default: 100)
+            - retry_max_delay:       maximum retry delay in milliseconds (default: 5 sec)
+            - retry_budget:          maximum number of accumulated retry tokens (default: 10)
+            - retry_budget_ratio:    number of retry tokens earned by every call (default: 0.2)
+            - connect_timeout:       connection timeout in milliseconds (default: 10 sec)
+            - timeout:               read timeout in milliseconds for every attempt (default: 10 sec)
+            - total_timeout:         timeout in milliseconds for the whole call including retries (default: 0, no limit).
+                                     The time left is sent to the service in *X-Request-Timeout* header
+            - pool_size:             number of hosts the connection pool is sized for (default: 10)
+            - max_connections:       maximum number of keep-alive connections per host (default: 100)
+            - keep_alive_timeout:    idle time in milliseconds after which pooled connections are dropped (default: 5 sec)
+            - compression:           accepts compressed responses with gzip, deflate or brotli encoding
+                                     and decodes them transparently (default: true)
+            - json_codec:            the codec to encode requests and decode responses: "json" for the standard
+                                     json module (default) or "orjson" for C-accelerated orjson package
+            - balancing:             strategy to spread calls across several endpoints: round_robin (default),
+                                     least_requests or p2c, see :class:`LoadBalancer <pip_services3_rpc.clients.LoadBalancer.LoadBalancer>`
+            - eject_failures:        number of consecutive failures after which an endpoint is not used (default: 3)
+            - eject_timeout:         time in milliseconds a failing endpoint is not used (default: 10 sec)
+            - circuit_breaker:       true to stop calls to failing or slow endpoints for a while (default: false),
+                                     see :class:`CircuitBreaker <pip_services3_rpc.clients.CircuitBreaker.CircuitBreaker>` for breaker_* options
+
+    ### References ###
+        - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
+        - `*:counters:*:*:1.0`         (optional) :class:`ICounters <pip_services3_components.count.ICounters.ICounters>` components to pass collected measurements
+        - `*:discovery:*:*:1.0`        (optional) :class:`IDiscovery <pip_services3_components.connect.IDiscovery.IDiscovery>` services to resolve connection
+
+    Example:
+
+    .. code-block:: python
+
+        class MyAsyncRestClient(AsyncRestClient, IMyClient):
+            async def get_data(self, correlation_id, id):
+                timing = self._instrument(correlation_id, 'myclient.get_data')
+                try:
+                    return await self._call('get', '/data/' + id, correlation_id)
+                finally:
+                    timing.end_timing()
+
+            # ...
+
+        client = MyAsyncRestClient()
+        client.configure(ConfigParams.from_tuples("connection.protocol", "http",
+                                                  "connection.host", "localhost",
+                                                  "connection.port", 8080))
+        await client.open("123")
+        data = await client.get_data("123", "1")
+        # ...
+        await client.close("123")
+    """
+    _default_config = ConfigParams.from_tuples(
+        "options.max_connections", 100
+    ).set_defaults(BaseRestClient._default_config)
+
+    def __init__(self):
+        """
+        Creates a new instance of the client.
+        """
+        super(AsyncRestClient, self).__init__()
+        # The maximum number of keep-alive connections per host.
+        self._max_connections = 100
+
+    async def open(self, correlation_id: Optional[str]):
+        """
+        Opens the component. The session is bound to the running event loop.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        """
+        if self.is_open():
+            return
+
+        if aiohttp is None:
+            raise ConfigException(correlation_id, 'NO_AIOHTTP',
+                                  'AsyncRestClient requires aiohttp package to be installed')
+
+        self._resolve_endpoints(correlation_id)
+
+        self._client = self._create_session()
+
+        self._logger.debug(correlation_id, "Connected via REST to " + self._uri)
+
+    async def close(self, correlation_id: Optional[str]):
+        """
+        Closes component and frees used resources.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        """
+        if self._client is not None:
+            await self._client.close()
+            self._logger.debug(correlation_id, "Disconnected from " + self._uri)
+
+        self._client = None
+        self._uri = None
+
+    def _create_session(self) -> Any:
+        """
+        Creates a non-blocking HTTP session with a pool of keep-alive connections.
+
+        :return: a new aiohttp client session.
+        """
+        connector = aiohttp.TCPConnector(limit=self._pool_size * self._max_connections,
+                                         limit_per_host=self._max_connections,
+                                         keepalive_timeout=self._keep_alive_timeout / 1000)
+        timeout = aiohttp.ClientTimeout(connect=self._connect_timeout / 1000,
+                                        sock_read=self._timeout / 1000)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def __get_request_timeout(self, correlation_id: Optional[str], deadline: Optional[float]) -> Any:
+        (connect_timeout, read_timeout) = self._get_attempt_timeout(correlation_id, deadline)
+        total_timeout = deadline - time.perf_counter() if deadline is not None else None
+        return aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout, sock_read=read_timeout)
+
+    @staticmethod
+    def __fix_params(params: dict) -> dict:
+        # aiohttp accepts only strings and numbers as query values
+        result = {}
+        for (k, v) in params.items():
+            if v is None:
+                continue
+            result[k] = str(v).lower() if isinstance(v, bool) else v
+        return result
+
+    async def __send_request(self, method: str, route: str, correlation_id: Optional[str], params: dict,
+                             headers: dict, data: Any, deadline: Optional[float] = None) -> (int, dict, bytes):
+        name = self._get_operation_name(method)
+        self._retry_policy.deposit()
+        attempt = 0
+
+        while True:
+            self._counters.increment_one(name + '.attempt_count')
+            trace_timing = self._tracer.begin_trace(correlation_id, name, route)
+
+            try:
+                timeout = self.__get_request_timeout(correlation_id, deadline)
+            except Exception as ex:
+                trace_timing.end_failure(ex)
+                raise
+
+            uri = self._acquire_endpoint(correlation_id, method, route)
+            start_time = time.perf_counter()
+            try:
+                async with self._client.request(method, (uri or '') + route,
+                                                headers=self._add_deadline_header(headers, deadline), data=data,
+                                                params=self.__fix_params(params), timeout=timeout) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    content = await response.read()
+            except Exception as ex:
+                trace_timing.end_failure(ex)
+                connect_error = isinstance(ex, aiohttp.ClientConnectorError)
+                transport_error = isinstance(ex, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+                self._release_endpoint(uri, method, route, (time.perf_counter() - start_time) * 1000,
+                                       error=connect_error or transport_error)
+                delay = self._retry_policy.get_delay(attempt)
+                if not self._retry_policy.can_retry(method, attempt, connect_error=connect_error,
+                                                    error=transport_error) \
+                        or self._is_past_deadline(deadline, delay):
+                    raise InvocationException(correlation_id, 'REST_ERROR',
+                                              'REST operation failed: ' + str(ex)).wrap(ex)
+            else:
+                trace_timing.end_trace()
+                self._release_endpoint(uri, method, route, (time.perf_counter() - start_time) * 1000,
+                                       status=status)
+                retry_after = response_headers.get('Retry-After')
+                delay = self._retry_policy.get_delay(attempt, retry_after)
+                if not self._retry_policy.can_retry(method, attempt, status=status, retry_after=retry_after) \
+                        or self._is_past_deadline(deadline, delay):
+                    return status, response_headers, content
+
+            self._counters.increment_one(name + '.retry_count')
+            self._logger.debug(correlation_id, "Retrying %s %s in %d ms after attempt %d",
+                               method, route, int(delay * 1000), attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _call(self, method: str, route: str, correlation_id: Optional[str] = None, params: dict = None,
+                    data: Any = None, timeout: Optional[int] = None) -> Any:
+        """
+        Calls a remote method via HTTP/REST protocol without blocking the event loop.
+
+        :param method: HTTP method: "get", "head", "post", "put", "delete"
+
+        :param route: a command route. Base route will be added to this route
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :param params: (optional) query parameters.
+
+        :param data: (optional) body object.
+
+        :param timeout: (optional) the timeout in milliseconds for the whole call including retries,
+                        that overrides *options.total_timeout*.
+
+        :return: result object
+        """
+        if self._client is None:
+            raise InvocationException(correlation_id, 'NOT_OPENED', 'REST client is not opened')
+
+        deadline = self._get_deadline(timeout)
+        method, route, params, headers = self._prepare_request(method, route, correlation_id, params)
+
+        data = self._encode_body(data, headers)
+        status, _, content = await self.__send_request(method, route, correlation_id, params, headers, data,
+                                                       deadline)
+
+        return self._parse_response(correlation_id, status, content)
@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.BaseRestClient
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Transport independent part of REST clients
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from typing import Optional, Any, Tuple
+
+from pip_services3_commons.config import ConfigParams, IConfigurable
+from pip_services3_commons.data import PagingParams
+from pip_services3_commons.errors import ErrorDescription, ApplicationExceptionFactory
+from pip_services3_commons.errors import UnknownException, InvocationException
+from pip_services3_commons.refer import IReferenceable, IReferences
+from pip_services3_components.count import CompositeCounters
+from pip_services3_components.log import CompositeLogger
+from pip_services3_components.trace.CompositeTracer import CompositeTracer
+
+from .CircuitBreaker import CircuitBreaker
+from .CircuitOpenException import CircuitOpenException
+from .LoadBalancer import LoadBalancer
+from .RetryPolicy import RetryPolicy
+from ..connect.HttpConnectionResolver import HttpConnectionResolver
+from ..services.HttpCompressor import HttpCompressor
+from ..services.HttpRequestDeadline import HttpRequestDeadline
+from ..services.InstrumentTiming import InstrumentTiming
+from ..services.JsonCodec import JsonCodec
+
+
+class BaseRestClient(IConfigurable, IReferenceable):
+    """
+    Abstract base for REST clients that holds everything what does not depend on HTTP transport:
+    configuration, references, instrumentation, request routes and parameters, and conversion
+    of responses into results and errors. Synchronous :class:`RestClient <pip_services3_rpc.clients.RestClient.RestClient>`
+    and asynchronous :class:`AsyncRestClient <pip_services3_rpc.clients.AsyncRestClient.AsyncRestClient>`
+    add their own sessions and calls on top of it.
+
+    ### Configuration parameters ###
+        - base_route:              base route for remote URI
+        - connection(s):             one or several endpoints of the remote service
+            - discovery_key:         (optional) a key to retrieve the connection from :class:`IDiscovery <pip_services3_components.connect.IDiscovery.IDiscovery>`
+            - protocol:              connection protocol: http or https
+            - host:                  host name or IP address
+            - port:                  port number
+            - uri:                   resource URI or connection string with all parameters in it
+        - options:
+            - retries:               number of retries (default: 3)
+            - retry_delay:           initial retry delay in milliseconds (default: 100)
+            - retry_max_delay:       maximum retry delay in milliseconds (default: 5 sec)
+            - retry_budget:          maximum number of accumulated retry tokens (default: 10)
+            - retry_budget_ratio:    number of retry tokens earned by every call (default: 0.2)
+            - connect_timeout:       connection timeout in milliseconds (default: 10 sec)
+            - timeout:               read timeout in milliseconds for every attempt (default: 10 sec)
+            - total_timeout:         timeout in milliseconds for the whole call including retries (default: 0, no limit).
+                                     The time left is sent to the service in *X-Request-Timeout* header
+            - pool_size:             number of per-host connection pools (default: 10)
+            - max_connections:       maximum number of keep-alive connections per host
+            - keep_alive_timeout:    idle time in milliseconds after which pooled connections are dropped (default: 5 sec)
+            - compression:           accepts compressed responses with gzip, deflate or brotli encoding
+                                     and decodes them transparently (default: true)
+            - json_codec:            the codec to encode requests and decode responses: "json" for the standard
+                                     json module (default) or "orjson" for C-accelerated orjson package
+            - balancing:             strategy to spread calls across several endpoints: round_robin (default),
+                                     least_requests or p2c, see :class:`LoadBalancer <pip_services3_rpc.clients.LoadBalancer.LoadBalancer>`
+            - eject_failures:        number of consecutive failures after which an endpoint is not used (default: 3)
+            - eject_timeout:         time in milliseconds a failing endpoint is not used (default: 10 sec)
+            - circuit_breaker:       true to stop calls to failing or slow endpoints for a while (default: false),
+                                     see :class:`CircuitBreaker <pip_services3_rpc.clients.CircuitBreaker.CircuitBreaker>` for breaker_* options
+
+    ### References ###
+        - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
+        - `*:counters:*:*:1.0`         (optional) :class:`ICounters <pip_services3_components.count.ICounters.ICounters>` components to pass collected measurements
+        - `*:discovery:*:*:1.0`        (optional) :class:`IDiscovery <pip_services3_components.connect.IDiscovery.IDiscovery>` services to resolve connection
+    """
+    _default_config = ConfigParams.from_tuples(
+        "connection.protocol", "http",
+        "connection.host", "0.0.0.0",
+        "connection.port", 3000,
+
+        "options.timeout", 10000,
+        "options.request_max_size", 1024 * 1024,
+        "options.connect_timeout", 10000,
+        "options.total_timeout", 0,
+        "options.retries", 3,
+        "options.pool_size", 10,
+        "options.max_connections", 10,
+        "options.keep_alive_timeout", 5000,
+        "options.compression", True,
+        "options.json_codec", "json",
+        "options.debug", True
+    )
+
+    def __init__(self):
+        """
+        Creates a new instance of the client.
+        """
+        # The HTTP client session.
+        self._client: Any = None
+        # The remote service uri which is calculated on open.
+        self._uri: str = None
+        # The invocation timeout in milliseconds.
+        self._timeout = 1000
+        # The connection timeout in milliseconds.
+        self._connect_timeout = 1000
+        # The timeout of the whole call including retries in milliseconds, 0 for no limit.
+        self._total_timeout = 0
+        # The connection resolver.
+        self._connection_resolver: HttpConnectionResolver = HttpConnectionResolver()
+        # The logger.
+        self._logger: CompositeLogger = CompositeLogger()
+        # The performance counters.
+        self._counters: CompositeCounters = CompositeCounters()
+        # The tracer.
+        self._tracer: CompositeTracer = CompositeTracer()
+        # The configuration options.
+        self._options: ConfigParams = ConfigParams()
+        # The base route.
+        self._base_route: str = None
+        # The policy that decides when and how failed calls are retried.
+        self._retry_policy: RetryPolicy = RetryPolicy()
+        # The balancer that spreads calls across endpoints of the remote service.
+        self._balancer: LoadBalancer = LoadBalancer()
+        # The breaker that rejects calls to failing endpoints.
+        self._breaker: CircuitBreaker = CircuitBreaker(self.__on_circuit_changed)
+        # The default headers to be added to every request.
+        self._headers: dict = {}
+        # The number of per-host connection pools.
+        self._pool_size = 10
+        # The maximum number of keep-alive connections per host.
+        self._max_connections = 10
+        # The idle time in milliseconds after which pooled connections are dropped.
+        self._keep_alive_timeout = 5000
+        # The codec to encode request bodies and decode responses.
+        self._codec: JsonCodec = JsonCodec()
+
+        self._correlation_id_location: str = "query"
+
+    def set_references(self, references: IReferences):
+        """
+        Sets references to dependent components.
+
+        :param references: references to locate the component dependencies.
+        """
+        self._logger.set_references(references)
+        self._counters.set_references(references)
+        self._tracer.set_references(references)
+        self._connection_resolver.set_references(references)
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        config = config.set_defaults(self._default_config)
+        self._connection_resolver.configure(config)
+        self._retry_policy.configure(config)
+        self._balancer.configure(config)
+        self._breaker.configure(config)
+
+        self._options.override(config.get_section("options"))
+        self._connect_timeout = config.get_as_integer_with_default("options.connect_timeout", self._connect_timeout)
+        self._timeout = config.get_as_integer_with_default("options.timeout", self._timeout)
+        self._total_timeout = config.get_as_integer_with_default("options.total_timeout", self._total_timeout)
+        self._pool_size = config.get_as_integer_with_default("options.pool_size", self._pool_size)
+        self._max_connections = config.get_as_integer_with_default("options.max_connections",
+                                                                   self._max_connections)
+        self._keep_alive_timeout = config.get_as_integer_with_default("options.keep_alive_timeout",
+                                                                      self._keep_alive_timeout)
+
+        self._base_route = config.get_as_string_with_default("base_route", self._base_route)
+        self._correlation_id_location = config.get_as_string_with_default("options.correlation_id_place",
+                                                                          self._correlation_id_location)
+        self._correlation_id_location = config.get_as_string_with_default("options.correlation_id",
+                                                                          self._correlation_id_location)
+
+        self._codec = JsonCodec.create(config.get_as_string("options.json_codec"))
+
+        if config.get_as_boolean_with_default("options.compression", True):
+            self._headers['Accept-Encoding'] = ', '.join(HttpCompressor.get_supported_encodings())
+        else:
+            self._headers['Accept-Encoding'] = 'identity'
+
+    def _instrument(self, correlation_id: Optional[str], name: str) -> InstrumentTiming:
+        """
+        Adds instrumentation to log calls and measure call time.
+        It returns a Timing object that is used to end the time measurement.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :param name: a method name.
+        :return: InstrumentTiming object to end the time measurement.
+        """
+        self._logger.trace(correlation_id, "Calling %s method", name)
+        self._counters.increment_one(name + ".call_count")
+
+        counter_timing = self._counters.begin_timing(name + '.call_time')
+        trace_timing = self._tracer.begin_trace(correlation_id, name, None)
+        return InstrumentTiming(correlation_id, name, "call",
+                                self._logger, self._counters, counter_timing, trace_timing)
+
+    def is_open(self) -> bool:
+        """
+        Checks if the component is opened.
+
+        :return: true if the component has been opened and false otherwise.
+        """
+        return self._client is not None
+
+    def _to_json(self, obj):
+        if obj is None:
+            return None
+
+        if isinstance(obj, set):
+            obj = list(obj)
+        if isinstance(obj, list):
+            return [self._to_json(item) for item in obj]
+
+        if isinstance(obj, dict):
+            return {k: self._to_json(v) for (k, v) in obj.items()}
+
+        if hasattr(obj, 'to_json'):
+            return obj.to_json()
+        if hasattr(obj, '__dict__'):
+            return self._to_json(obj.__dict__)
+        return obj
+
+    def fix_route(self, route) -> str:
+        if route is not None and len(route) > 0:
+            if route[0] != '/':
+                route = f'/{route}'
+            return route
+
+        return ''
+
+    def _create_request_route(self, route: str) -> str:
+        builder = ''
+        if self._uri is not None and len(self._uri) > 0:
+            return self._uri + self._create_request_path(route)
+
+        if route[0] != '/':
+            builder += '/'
+        builder += route
+
+        return builder
+
+    def _create_request_path(self, route: str) -> str:
+        """
+        Builds the path of a request relative to endpoint URI.
+
+        :param route: a command route. Base route will be added to this route
+        :return: the request path.
+        """
+        builder = self.fix_route(self._base_route)
+
+        if route[0] != '/':
+            builder += '/'
+        builder += route
+
+        return builder
+
+    def _resolve_endpoints(self, correlation_id: Optional[str]):
+        """
+        Resolves all configured connections and passes them to the load balancer.
+        The first one becomes the main client URI.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        """
+        connections = self._connection_resolver.resolve_endpoints(correlation_id)
+        uris = [connection.get_as_string('uri') for connection in connections]
+        self._balancer.set_endpoints(uris)
+        self._uri = uris[0]
+
+    def _get_deadline(self, timeout: Optional[int] = None) -> Optional[float]:
+        """
+        Calculates the time by which a call shall complete including all its retries.
+        When the client is called while a request with a deadline is processed,
+        the call is limited by that deadline as well.
+
+        :param timeout: (optional) the call timeout in milliseconds that overrides *options.total_timeout*.
+        :return: the deadline as :func:`time.perf_counter` value or None when the call time is not limited.
+        """
+        timeout = timeout if timeout is not None else self._total_timeout
+        deadline = time.perf_counter() + timeout / 1000 if timeout > 0 else None
+
+        current = HttpRequestDeadline.get_current()
+        if current is not None and (deadline is None or current < deadline):
+            deadline = current
+        return deadline
+
+    def _get_attempt_timeout(self, correlation_id: Optional[str], deadline: Optional[float]) -> Tuple[float, float]:
+        """
+        Gets connect and read timeouts for the next call attempt, shortened to the time left before the deadline.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :param deadline: the deadline returned by :func:`_get_deadline`.
+        :return: connect and read timeouts in seconds.
+        :raises: InvocationException with "DEADLINE_EXCEEDED" code when the deadline has passed.
+        """
+        connect_timeout = self._connect_timeout / 1000
+        read_timeout = self._timeout / 1000
+        if deadline is None:
+            return connect_timeout, read_timeout
+
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise InvocationException(correlation_id, 'DEADLINE_EXCEEDED', 'REST call did not complete in time')
+        return min(connect_timeout, remaining), min(read_timeout, remaining)
+
+    @staticmethod
+    def _add_deadline_header(headers: dict, deadline: Optional[float]) -> dict:
+        """
+        Adds the time left before the deadline to request headers, so the remote service
+        does not process requests the client stopped waiting for.
+
+        :param headers: the request headers.
+        :param deadline: the deadline returned by :func:`_get_deadline`.
+        :return: a copy of the headers with the deadline header or the same headers when the time is not limited.
+        """
+        if deadline is None:
+            return headers
+        headers = dict(headers)
+        headers[HttpRequestDeadline.HEADER] = str(HttpRequestDeadline.get_remaining_time(deadline))
+        return headers
+
+    @staticmethod
+    def _is_past_deadline(deadline: Optional[float], delay: float = 0) -> bool:
+        """
+        Checks if the deadline passes before the given delay ends, so there is no time for another attempt.
+
+        :param deadline: the deadline returned by :func:`_get_deadline`.
+        :param delay: (optional) the delay in seconds before the next attempt.
+        :return: true if the deadline passes.
+        """
+        return deadline is not None and time.perf_counter() + delay >= deadline
+
+    def _acquire_endpoint(self, correlation_id: Optional[str], method: str, route: str) -> Optional[str]:
+        """
+        Chooses the endpoint URI for the next call attempt. Endpoints with open circuit breakers are skipped.
+        The endpoint shall be released by :func:`_release_endpoint` when the attempt ends.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :param method: the HTTP method of the call.
+        :param route: the request route relative to endpoint URI.
+        :return: the endpoint URI or None when no endpoints were resolved.
+        :raises: CircuitOpenException when circuits of all endpoints are open.
+        """
+        for _ in range(max(1, len(self._balancer.get_endpoints()))):
+            uri = self._balancer.acquire()
+            uri = uri if uri is not None else self._uri
+            if self._breaker.allow(self._breaker.get_key(uri, method, route)):
+                return uri
+            self._balancer.cancel(uri)
+
+        self._counters.increment_one(self.__get_counter_prefix() + '.circuit_rejected_count')
+        raise CircuitOpenException(correlation_id, 'CIRCUIT_OPEN',
+                                   'Circuit breaker is open for ' + method + ' ' + route) \
+            .with_details('method', method).with_details('route', route)
+
+    def _release_endpoint(self, uri: Optional[str], method: str, route: str, latency: float,
+                          status: int = None, error: bool = False):
+        """
+        Reports the result of a call attempt to the load balancer and the circuit breaker.
+
+        :param uri: the endpoint URI returned by :func:`_acquire_endpoint`.
+        :param method: the HTTP method of the call.
+        :param route: the request route relative to endpoint URI.
+        :param latency: the attempt time in milliseconds.
+        :param status: (optional) the HTTP status code of the response.
+        :param error: true when the attempt failed with a transport error.
+        """
+        if uri is None:
+            return
+
+        failed = error or (status is not None and self._retry_policy.is_transient_status(status))
+        self._balancer.release(uri, latency, failed)
+        # Internal errors of the remote service count as failures for the breaker as well
+        self._breaker.record(self._breaker.get_key(uri, method, route), latency,
+                             error or (status is not None and status >= 500))
+
+    def __get_counter_prefix(self) -> str:
+        return (self._base_route or 'rest').strip('/').replace('/', '.')
+
+    def __on_circuit_changed(self, key: str, state: str):
+        self._counters.increment_one(self.__get_counter_prefix() + '.circuit_' + state + '_count')
+        if state == CircuitBreaker.OPEN:
+            self._logger.warn(None, "Circuit breaker for %s is open", key)
+        else:
+            self._logger.info(None, "Circuit breaker for %s is %s", key, state.replace('_', '-'))
+
+    def add_correlation_id(self, params: Any = None, correlation_id: Optional[str] = None) -> Any:
+        """
+        Adds a correlation id (correlation_id) to invocation parameter map.
+
+        :param params: invocation parameters.
+        :param correlation_id: (optional) a correlation id to be added.
+
+        :returns: invocation parameters with added correlation id.
+        """
+        params = params or {}
+        if not (correlation_id is None):
+            params['correlation_id'] = correlation_id
+
+        return params
+
+    def _add_filter_params(self, params: Any = None, filters: Any = None) -> dict:
+        """
+        Adds filter parameters (with the same name as they defined)
+        to invocation parameter map.
+
+        :param params:  invocation parameters.
+        :param filters: (optional) filter parameters
+        :returns: invocation parameters with added filter parameters.
+        """
+        params = params or {}
+        if not (filters is None):
+            params.update(filters)
+
+        return params
+
+    def _add_paging_params(self, params: dict = None, paging: PagingParams = None) -> dict:
+        """
+        Adds paging parameters (skip, take, total) to invocation parameter map.
+
+        :param params: invocation parameters.
+        :param paging: (optional) paging parameters
+
+        :returns: invocation parameters with added paging parameters.
+        """
+        params = params or {}
+        if paging:
+            if paging.total:
+                params['total'] = paging.total
+            if paging.skip:
+                params['skip'] = paging.skip
+            if paging.take:
+                params['take'] = paging.take
+
+        return params
+
+    def _get_operation_name(self, method: str) -> str:
+        return self.__get_counter_prefix() + '.' + method.lower()
+
+    def _prepare_request(self, method: str, route: str, correlation_id: Optional[str],
+                         params: Optional[dict]) -> Tuple[str, str, dict, dict]:
+        """
+        Validates the HTTP method and builds the full route, query parameters and headers of a request.
+
+        :param method: HTTP method: "get", "head", "post", "put", "delete"
+        :param route: a command route. Base route will be added to this route
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :param params: (optional) query parameters.
+        :return: a tuple with the upper case method, the route relative to endpoint URI, query parameters and headers.
+        """
+        method = method.upper()
+
+        if method not in ['GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH']:
+            raise UnknownException(correlation_id, 'UNSUPPORTED_METHOD',
+                                   'Method is not supported by REST client').with_details('verb', method)
+
+        route = self._create_request_path(route)
+        params = self.add_correlation_id(params, None)
+        # Headers are copied, so concurrent calls do not share correlation ids
+        headers = dict(self._headers)
+
+        if self._correlation_id_location == 'query' or self._correlation_id_location == 'both':
+            params = self.add_correlation_id(params, correlation_id)
+
+        if self._correlation_id_location == 'headers' or self._correlation_id_location == 'both':
+            if correlation_id is not None:
+                headers['correlation_id'] = correlation_id
+
+        return method, route, params, headers
+
+    def _encode_body(self, data: Any, headers: dict) -> Optional[bytes]:
+        """
+        Encodes the request body into JSON and sets its content type.
+
+        :param data: (optional) body object.
+        :param headers: request headers to add the content type to.
+        :return: the encoded body or None if there is no body.
+        """
+        if data is None:
+            return None
+
+        headers['Content-Type'] = 'application/json'
+        return self._codec.encode(data).encode('utf-8')
+
+    def _parse_response(self, correlation_id: Optional[str], status: int, content: bytes) -> Any:
+        """
+        Converts a received response into the call result or raises the error sent by the remote service.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :param status: the HTTP status code of the response.
+        :param content: the response body.
+        :return: the deserialized result object.
+        """
+        if status == 204:
+            return None
+
+        try:
+            # Retrieve JSON data
+            result = self._codec.decode(content) if content else None
+        except ValueError:
+            # Data is not in JSON
+            text = content.decode('utf-8', errors='replace')
+            if status < 400:
+                raise UnknownException(correlation_id, 'FORMAT_ERROR',
+                                       'Failed to deserialize JSON data: ' + text) \
+                    .with_details('response', text)
+            else:
+                raise UnknownException(correlation_id, 'UNKNOWN', 'Unknown error occured: ' + text) \
+                    .with_details('response', text)
+
+        # Return result
+        if status < 400:
+            return result
+
+        # Raise error
+        # Todo: We need to implement proper from_value method
+        error = ErrorDescription.from_json(result)
+        error.status = status
+
+        raise ApplicationExceptionFactory.create(error)
+
+    def _to_batch_result(self, response: Any) -> Any:
+        """
+        Converts an entry of a batch response into the command result or an exception for failed commands.
+
+        :param response: a batch response entry with *result* or *error* property.
+        :return: the command result or the raised exception.
+        """
+        if isinstance(response, dict) and response.get('error') is not None:
+            return ApplicationExceptionFactory.create(ErrorDescription.from_json(response['error']))
+        return response.get('result') if isinstance(response, dict) else None
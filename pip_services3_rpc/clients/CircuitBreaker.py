@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.CircuitBreaker
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Circuit breaker implementation
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from collections import deque
+from threading import Lock
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from pip_services3_commons.config import IConfigurable, ConfigParams
+
+
+class _Circuit:
+
+    def __init__(self, window: int):
+        self.state = CircuitBreaker.CLOSED
+        # Outcomes of the last calls as (failed, slow) pairs
+        self.outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self.failures = 0
+        self.slow_calls = 0
+        self.opened_until = 0.0
+        self.trial_calls = 0
+        self.trial_successes = 0
+
+
+class CircuitBreaker(IConfigurable):
+    """
+    Stops calls to a remote endpoint that fails or responds too slowly, so callers fail fast
+    instead of waiting for timeouts. Every key (an endpoint or an endpoint route) has its own circuit.
+
+    A closed circuit lets calls through and keeps outcomes of the last *breaker_window* calls.
+    When at least *breaker_min_calls* were made and the percentage of failed calls reaches *breaker_failure_rate*
+    or the percentage of calls slower than *breaker_slow_call_time* reaches *breaker_slow_call_rate*,
+    the circuit opens and rejects all calls for *breaker_open_time*. After that the circuit becomes half-open
+    and lets *breaker_trial_calls* calls through: if they all succeed the circuit closes, otherwise it opens again.
+
+    ### Configuration parameters ###
+        - options:
+            - circuit_breaker:          true to enable circuit breaker (default: false)
+            - breaker_per_route:        true to keep separate circuits for every route of an endpoint (default: false)
+            - breaker_window:           number of last calls used to calculate failure rates (default: 100)
+            - breaker_min_calls:        minimum number of calls before the circuit can open (default: 20)
+            - breaker_failure_rate:     percentage of failed calls that opens the circuit (default: 50)
+            - breaker_slow_call_time:   call time in milliseconds after which a call is slow (default: 10 sec)
+            - breaker_slow_call_rate:   percentage of slow calls that opens the circuit (default: 100)
+            - breaker_open_time:        time in milliseconds the circuit stays open (default: 30 sec)
+            - breaker_trial_calls:      number of trial calls in half-open state (default: 3)
+
+    Example:
+
+    .. code-block:: python
+
+        breaker = CircuitBreaker()
+        breaker.configure(ConfigParams.from_tuples("options.circuit_breaker", True))
+
+        if not breaker.allow("http://host1:8080"):
+            raise CircuitOpenException()
+        # ... call the endpoint
+        breaker.record("http://host1:8080", 15.0, failed=False)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    # Maximum number of kept circuits, idle closed circuits are dropped above it
+    _max_circuits = 1000
+
+    def __init__(self, listener: Callable[[str, str], None] = None):
+        """
+        Creates a new instance of the circuit breaker.
+
+        :param listener: (optional) a function called with a key and a new state when a circuit changes its state.
+        """
+        self._enabled = False
+        self._per_route = False
+        self._window = 100
+        self._min_calls = 20
+        self._failure_rate = 50.0
+        self._slow_call_time = 10000
+        self._slow_call_rate = 100.0
+        self._open_time = 30000
+        self._trial_calls = 3
+
+        self.__listener = listener
+        self.__circuits: Dict[str, _Circuit] = {}
+        self.__lock = Lock()
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        self._enabled = config.get_as_boolean_with_default("options.circuit_breaker", self._enabled)
+        self._per_route = config.get_as_boolean_with_default("options.breaker_per_route", self._per_route)
+        self._window = max(1, config.get_as_integer_with_default("options.breaker_window", self._window))
+        self._min_calls = config.get_as_integer_with_default("options.breaker_min_calls", self._min_calls)
+        self._failure_rate = config.get_as_float_with_default("options.breaker_failure_rate", self._failure_rate)
+        self._slow_call_time = config.get_as_integer_with_default("options.breaker_slow_call_time",
+                                                                  self._slow_call_time)
+        self._slow_call_rate = config.get_as_float_with_default("options.breaker_slow_call_rate",
+                                                                self._slow_call_rate)
+        self._open_time = config.get_as_integer_with_default("options.breaker_open_time", self._open_time)
+        self._trial_calls = max(1, config.get_as_integer_with_default("options.breaker_trial_calls",
+                                                                      self._trial_calls))
+        with self.__lock:
+            self.__circuits = {}
+
+    def is_enabled(self) -> bool:
+        """
+        Checks if the circuit breaker is enabled.
+
+        :return: true if calls are checked by the breaker.
+        """
+        return self._enabled
+
+    def get_key(self, uri: Optional[str], method: str, route: str) -> str:
+        """
+        Gets the key of the circuit for a call.
+
+        :param uri: the endpoint URI.
+        :param method: the HTTP method.
+        :param route: the request route.
+        :return: the circuit key.
+        """
+        uri = uri or ''
+        return uri + ' ' + method.upper() + ' ' + route if self._per_route else uri
+
+    def get_state(self, key: str) -> str:
+        """
+        Gets the current state of a circuit.
+
+        :param key: the circuit key.
+        :return: the circuit state: closed, open or half_open.
+        """
+        with self.__lock:
+            circuit = self.__circuits.get(key)
+            if circuit is None:
+                return self.CLOSED
+            if circuit.state == self.OPEN and circuit.opened_until <= time.perf_counter():
+                return self.HALF_OPEN
+            return circuit.state
+
+    def allow(self, key: str) -> bool:
+        """
+        Checks if a call can be made. Every allowed call shall be recorded by :func:`record`.
+
+        :param key: the circuit key.
+        :return: true if the call is allowed and false if it shall be rejected.
+        """
+        if not self._enabled:
+            return True
+
+        changed = None
+        with self.__lock:
+            circuit = self.__circuits.get(key)
+            if circuit is None or circuit.state == self.CLOSED:
+                return True
+
+            if circuit.state == self.OPEN:
+                if circuit.opened_until > time.perf_counter():
+                    return False
+                circuit.state = changed = self.HALF_OPEN
+                circuit.trial_calls = 0
+                circuit.trial_successes = 0
+
+            allowed = circuit.trial_calls < self._trial_calls
+            if allowed:
+                circuit.trial_calls += 1
+
+        if changed is not None:
+            self.__notify(key, changed)
+        return allowed
+
+    def record(self, key: str, duration: float, failed: bool):
+        """
+        Records the outcome of an allowed call.
+
+        :param key: the circuit key.
+        :param duration: the call time in milliseconds.
+        :param failed: true when the call failed.
+        """
+        if not self._enabled:
+            return
+
+        slow = duration >= self._slow_call_time
+        changed = None
+        with self.__lock:
+            circuit = self.__circuits.get(key)
+            if circuit is None:
+                if len(self.__circuits) >= self._max_circuits:
+                    self.__drop_idle_circuits()
+                circuit = self.__circuits[key] = _Circuit(self._window)
+
+            if circuit.state == self.HALF_OPEN:
+                if failed or slow:
+                    changed = self.__open(circuit)
+                else:
+                    circuit.trial_successes += 1
+                    if circuit.trial_successes >= self._trial_calls:
+                        circuit.state = changed = self.CLOSED
+                        circuit.outcomes.clear()
+                        circuit.failures = 0
+                        circuit.slow_calls = 0
+            elif circuit.state == self.CLOSED:
+                if len(circuit.outcomes) == circuit.outcomes.maxlen:
+                    (old_failed, old_slow) = circuit.outcomes[0]
+                    circuit.failures -= old_failed
+                    circuit.slow_calls -= old_slow
+                circuit.outcomes.append((failed, slow))
+                circuit.failures += failed
+                circuit.slow_calls += slow
+
+                calls = len(circuit.outcomes)
+                if calls >= self._min_calls and (circuit.failures * 100.0 / calls >= self._failure_rate
+                                                 or circuit.slow_calls * 100.0 / calls >= self._slow_call_rate):
+                    changed = self.__open(circuit)
+
+        if changed is not None:
+            self.__notify(key, changed)
+
+    def __open(self, circuit: _Circuit) -> str:
+        circuit.state = self.OPEN
+        circuit.opened_until = time.perf_counter() + self._open_time / 1000
+        return self.OPEN
+
+    def __drop_idle_circuits(self):
+        for key in [key for (key, circuit) in self.__circuits.items()
+                    if circuit.state == self.CLOSED and circuit.failures == 0 and circuit.slow_calls == 0]:
+            del self.__circuits[key]
+
+    def __notify(self, key: str, state: str):
+        if self.__listener is not None:
+            self.__listener(key, state)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.CircuitOpenException
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Circuit open exception type
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from typing import Optional
+
+from pip_services3_commons.errors import InvocationException
+
+
+class CircuitOpenException(InvocationException):
+    """
+    Error raised by REST clients without calling the remote service,
+    when the circuit breaker of the endpoint is open after the service failed or slowed down.
+    """
+
+    def __init__(self, correlation_id: Optional[str] = None, code: str = 'CIRCUIT_OPEN',
+                 message: str = 'Circuit breaker is open'):
+        """
+        Creates an error instance and assigns its values.
+
+        :param correlation_id: (optional) a unique transaction id to trace execution through call chain.
+
+        :param code: (optional) a unique error code. Default: "CIRCUIT_OPEN"
+
+        :param message: (optional) a human-readable description of the error.
+        """
+        super(CircuitOpenException, self).__init__(correlation_id, code, message)
+        self.status = 503
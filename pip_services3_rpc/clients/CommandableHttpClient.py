@@ -9,9 +9,20 @@
     :license: MIT, see LICENSE for more details.
 """
 from abc import ABC
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, List, Optional, Set
+
+from pip_services3_commons.commands import CommandSet
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import InvocationException, ApplicationException, BadRequestException, \
+    ConnectionException, ErrorDescriptionFactory, ApplicationExceptionFactory
+from pip_services3_commons.refer import IReferences
+from pip_services3_commons.run import Parameters
+from pip_services3_components.connect import ConnectionParams
 
 from .RestClient import RestClient
+from ..services.CommandableHttpService import CommandableHttpService
 
 
 class CommandableHttpClient(RestClient, ABC):
@@ -19,18 +30,48 @@ class CommandableHttpClient(RestClient, ABC):
     Abstract client that calls commandable HTTP service.
     Commandable services are generated automatically for ICommandable objects. Each command is exposed as POST operation that receives all parameters in body object.
 
+    When the client and the service run in the same process, *connection.protocol* can be set to "inproc".
+    Then the client finds :class:`CommandableHttpService <pip_services3_rpc.services.CommandableHttpService.CommandableHttpService>`
+    with the same base route in its references and executes commands directly, without HTTP and sockets.
+    Parameters and results are still converted through JSON codec and errors are raised the same way,
+    so callers see the same values as over HTTP.
+
     ### Configuration parameters ###
         - base_route:              base route for remote URI
-        - connection(s):
+        - connection(s):             one or several endpoints of the remote service
             - discovery_key:         (optional) a key to retrieve the connection from IDiscovery
-            - protocol:              connection protocol: http or https
+            - protocol:              connection protocol: http, https or inproc
             - host:                  host name or IP address
             - port:                  port number
             - uri:                   resource URI or connection string with all parameters in it
         - options:
             - retries:               number of retries (default: 3)
+            - retry_delay:           initial retry delay in milliseconds (default: 100)
+            - retry_max_delay:       maximum retry delay in milliseconds (default: 5 sec)
+            - retry_budget:          maximum number of accumulated retry tokens (default: 10)
+            - retry_budget_ratio:    number of retry tokens earned by every call (default: 0.2)
             - connect_timeout:       connection timeout in milliseconds (default: 10 sec)
-            - timeout:               invocation timeout in milliseconds (default: 10 sec)
+            - timeout:               read timeout in milliseconds for every attempt (default: 10 sec)
+            - total_timeout:         timeout in milliseconds for the whole call including retries (default: 0, no limit).
+                                     The time left is sent to the service in *X-Request-Timeout* header
+            - pool_size:             number of per-host connection pools kept by the session (default: 10)
+            - max_connections:       maximum number of keep-alive connections per host (default: 10)
+            - keep_alive_timeout:    idle time in milliseconds after which pooled connections are dropped (default: 5 sec)
+            - compression:           accepts compressed responses with gzip, deflate or brotli encoding
+                                     and decodes them transparently (default: true)
+            - json_codec:            the codec to encode requests and decode responses: "json" for the standard
+                                     json module (default) or "orjson" for C-accelerated orjson package
+            - balancing:             strategy to spread calls across several endpoints: round_robin (default),
+                                     least_requests or p2c, see :class:`LoadBalancer <pip_services3_rpc.clients.LoadBalancer.LoadBalancer>`
+            - eject_failures:        number of consecutive failures after which an endpoint is not used (default: 3)
+            - eject_timeout:         time in milliseconds a failing endpoint is not used (default: 10 sec)
+            - circuit_breaker:       true to stop calls to failing or slow endpoints for a while (default: false),
+                                     see :class:`CircuitBreaker <pip_services3_rpc.clients.CircuitBreaker.CircuitBreaker>` for breaker_* options
+            - hedging:               true to repeat slow idempotent commands on another endpoint and use
+                                     the first response (default: false), see :class:`HedgingPolicy <pip_services3_rpc.clients.HedgingPolicy.HedgingPolicy>` for hedge_* options
+            - idempotent_commands:   comma-separated names of commands that can be safely repeated and hedged
+            - single_flight:         true to let identical concurrent idempotent commands share one request
+                                     and its result or error (default: false)
 
     ### References ###
         - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
@@ -65,8 +106,122 @@ class CommandableHttpClient(RestClient, ABC):
         """
         super(CommandableHttpClient, self).__init__()
         self._base_route = base_route
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__executor_lock = Lock()
+        self.__inproc = False
+        self.__references: Optional[IReferences] = None
+        self.__command_set: Optional[CommandSet] = None
+        # The names of commands that can be hedged.
+        self._idempotent_commands: Set[str] = set()
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        super().configure(config)
+
+        commands = config.get_as_string_with_default("options.idempotent_commands", "")
+        self._idempotent_commands = {command.strip() for command in commands.split(',') if command.strip()}
+
+        connections = ConnectionParams.many_from_config(config)
+        self.__inproc = len(connections) > 0 and connections[0].get_protocol() == 'inproc'
+
+    def set_references(self, references: IReferences):
+        """
+        Sets references to dependent components.
+
+        :param references: references to locate the component dependencies.
+        """
+        super().set_references(references)
+        self.__references = references
+
+    def is_open(self) -> bool:
+        """
+        Checks if the component is opened.
+
+        :return: true if the component has been opened and false otherwise.
+        """
+        return self.__command_set is not None or super().is_open()
+
+    def open(self, correlation_id: Optional[str]):
+        """
+        Opens the component.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        """
+        if not self.__inproc:
+            super().open(correlation_id)
+            return
+
+        if self.is_open():
+            return
+
+        service = self.__find_service()
+        if service is None:
+            raise ConnectionException(correlation_id, 'NO_INPROC_SERVICE',
+                                      'Commandable HTTP service for inproc connection is not found in references') \
+                .with_details('base_route', self._base_route)
+
+        self.__command_set = service.get_command_set()
+        self._uri = 'inproc://' + (self._base_route or '')
+        self._logger.debug(correlation_id, "Connected in process to " + self._uri)
+
+    def close(self, correlation_id: Optional[str]):
+        """
+        Closes component and frees used resources.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        """
+        with self.__executor_lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
+        if self.__command_set is not None:
+            self.__command_set = None
+            self._logger.debug(correlation_id, "Disconnected from " + self._uri)
+            self._uri = None
+
+        super().close(correlation_id)
+
+    def __find_service(self) -> Optional[CommandableHttpService]:
+        if self.__references is None:
+            return None
+
+        route = (self._base_route or '').strip('/')
+        for component in self.__references.get_all():
+            if isinstance(component, CommandableHttpService) \
+                    and (component.get_base_route() or '').strip('/') == route:
+                return component
+        return None
+
+    def __execute_inproc_entry(self, correlation_id: Optional[str], command: dict) -> Any:
+        try:
+            return self.__execute_inproc(command.get('command'), correlation_id, command.get('args'))
+        except Exception as err:
+            return err
+
+    def __execute_inproc(self, name: str, correlation_id: Optional[str], params: Any) -> Any:
+        command = self.__command_set.find_command(name)
+        if command is None:
+            raise BadRequestException(correlation_id, 'CMD_NOT_FOUND', 'Requested command does not exist') \
+                .with_details('command', name)
+
+        # Values are passed through JSON, so commands and callers get the same values as over HTTP
+        args = Parameters.from_value(self._codec.decode(self._codec.encode(params)) if params else {})
+        try:
+            result = command.execute(correlation_id, args)
+        except ApplicationException:
+            raise
+        except Exception as ex:
+            raise ApplicationExceptionFactory.create(ErrorDescriptionFactory.create(ex))
 
-    def call_command(self, name: str, correlation_id: Optional[str], params: Any) -> Any:
+        return self._codec.decode(self._codec.encode(result)) if result is not None else None
+
+    def call_command(self, name: str, correlation_id: Optional[str], params: Any,
+                     timeout: Optional[int] = None) -> Any:
         """
         Calls a remote method via HTTP commadable protocol. The call is made via POST operation and all parameters are sent in body object. The complete route to remote method is defined as baseRoute + "/" + name.
 
@@ -76,6 +231,9 @@ class CommandableHttpClient(RestClient, ABC):
 
         :param params: command parameters.
 
+        :param timeout: (optional) the timeout in milliseconds for the whole call including retries,
+                        that overrides *options.total_timeout*.
+
         :return: result of the command.
         """
         timing = self._instrument(correlation_id, self._base_route + '.' + name)
@@ -85,9 +243,93 @@ class CommandableHttpClient(RestClient, ABC):
             #     route = '/'  + self._base_route + '/' + name
             # else:
             #     route = self._base_route + '/' + name
-            return self._call('POST', name, correlation_id, None, params)
+            if self.__command_set is not None:
+                return self.__execute_inproc(name, correlation_id, params)
+            return self._call('POST', name, correlation_id, None, params,
+                              idempotent=name in self._idempotent_commands, timeout=timeout)
+        except Exception as err:
+            timing.end_failure(err)
+            raise err
+        finally:
+            timing.end_timing()
+
+    def call_commands(self, correlation_id: Optional[str], commands: List[dict],
+                      parallel: Optional[bool] = None) -> List[Any]:
+        """
+        Calls several remote commands in one round trip via "batch" operation of commandable HTTP service.
+        The service has to be configured with *batch.enabled* option.
+
+        Results are returned in the order of commands. Commands that failed
+        are returned as :class:`ApplicationException <pip_services3_commons.errors.ApplicationException.ApplicationException>`
+        objects instead of their results, so failure of one command does not affect the others.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :param commands: a list of commands to call, each as *{"command": name, "args": params}*.
+
+        :param parallel: (optional) true to execute the commands concurrently, false to execute them one after another
+                         or None to use the default of the service.
+
+        :return: a list with results of the commands or raised exceptions.
+        """
+        params = None if parallel is None else {'parallel': 'true' if parallel else 'false'}
+        timing = self._instrument(correlation_id, self._base_route + '.batch')
+        try:
+            if self.__command_set is not None:
+                return [self.__execute_inproc_entry(correlation_id, command) for command in commands]
+            responses = self._call('POST', 'batch', correlation_id, params, commands)
+            return [self._to_batch_result(response) for response in responses or []]
         except Exception as err:
             timing.end_failure(err)
             raise err
         finally:
             timing.end_timing()
+
+    def call_commands_parallel(self, correlation_id: Optional[str], commands: List[dict],
+                               timeout: Optional[int] = None) -> List[Any]:
+        """
+        Calls several remote commands at once, each via its own POST operation.
+        The calls share pooled keep-alive connections of the client and every call is instrumented
+        as a separate :func:`call_command`, so the total time is close to the time of the slowest call.
+
+        Results are returned in the order of commands. Commands that failed
+        are returned as :class:`ApplicationException <pip_services3_commons.errors.ApplicationException.ApplicationException>`
+        objects instead of their results. Commands that did not complete before the shared deadline
+        are returned as InvocationException with "DEADLINE_EXCEEDED" code and are left to complete in background.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :param commands: a list of commands to call, each as *{"command": name, "args": params}*.
+
+        :param timeout: (optional) the shared deadline for all calls in milliseconds.
+
+        :return: a list with results of the commands or raised exceptions.
+        """
+        if len(commands) == 0:
+            return []
+
+        executor = self.__get_executor()
+        futures = [executor.submit(self.call_command, command.get('command'), correlation_id, command.get('args'))
+                   for command in commands]
+        wait(futures, timeout=timeout / 1000 if timeout is not None else None)
+
+        results = []
+        for (command, future) in zip(commands, futures):
+            if not future.done():
+                future.cancel()
+                results.append(InvocationException(correlation_id, 'DEADLINE_EXCEEDED',
+                                                   'Command ' + str(command.get('command'))
+                                                   + ' did not complete in ' + str(timeout) + ' ms')
+                               .with_details('command', command.get('command')))
+            elif future.exception() is not None:
+                results.append(future.exception())
+            else:
+                results.append(future.result())
+        return results
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        # Every thread holds at most one connection, so the pool is as large as the connection pool of a host
+        with self.__executor_lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self._max_connections)
+            return self.__executor
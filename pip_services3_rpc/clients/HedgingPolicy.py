@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.HedgingPolicy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Hedging policy implementation
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from collections import deque
+from threading import Lock
+from typing import Deque
+
+from pip_services3_commons.config import IConfigurable, ConfigParams
+
+
+class HedgingPolicy(IConfigurable):
+    """
+    Decides when a slow idempotent call is repeated in parallel (hedged), so the caller can use
+    the response that comes first and slow replicas do not define the tail latency.
+
+    A hedged request is sent when the call takes longer than the *hedge_percentile* of recently observed
+    call times. Until *hedge_min_samples* calls are observed the fixed *hedge_delay* is used.
+
+    The hedge budget limits the extra load: every call deposits *hedge_budget_ratio* tokens,
+    every hedged request withdraws one token. When the budget is exhausted calls are not hedged.
+
+    ### Configuration parameters ###
+        - options:
+            - hedging:               true to hedge slow idempotent calls (default: false)
+            - hedge_percentile:      percentile of observed call times after which a call is hedged (default: 95)
+            - hedge_delay:           delay in milliseconds used until enough calls are observed (default: 100)
+            - hedge_min_samples:     number of observed calls required to use the percentile (default: 20)
+            - hedge_budget:          maximum number of hedge tokens that can be accumulated (default: 10)
+            - hedge_budget_ratio:    number of tokens deposited by every call (default: 0.1)
+
+    Example:
+
+    .. code-block:: python
+
+        policy = HedgingPolicy()
+        policy.configure(ConfigParams.from_tuples("options.hedging", True))
+
+        if policy.can_hedge('GET'):
+            policy.deposit()
+            # ... wait policy.get_delay() seconds for the response
+            if policy.withdraw():
+                # ... send the hedged request
+    """
+
+    IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+    # Number of last call times used to calculate the percentile
+    _window = 100
+
+    def __init__(self):
+        """
+        Creates a new instance of the hedging policy.
+        """
+        self._enabled = False
+        self._percentile = 95.0
+        self._delay = 100
+        self._min_samples = 20
+        self._budget = 10.0
+        self._budget_ratio = 0.1
+
+        self.__tokens = self._budget
+        self.__samples: Deque[float] = deque(maxlen=self._window)
+        self.__percentile_delay = None
+        self.__lock = Lock()
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        self._enabled = config.get_as_boolean_with_default("options.hedging", self._enabled)
+        self._percentile = config.get_as_float_with_default("options.hedge_percentile", self._percentile)
+        self._delay = config.get_as_integer_with_default("options.hedge_delay", self._delay)
+        self._min_samples = config.get_as_integer_with_default("options.hedge_min_samples", self._min_samples)
+        self._budget = config.get_as_float_with_default("options.hedge_budget", self._budget)
+        self._budget_ratio = config.get_as_float_with_default("options.hedge_budget_ratio", self._budget_ratio)
+        self.__tokens = self._budget
+
+    def is_enabled(self) -> bool:
+        """
+        Checks if hedging is enabled.
+
+        :return: true if calls can be hedged.
+        """
+        return self._enabled
+
+    def can_hedge(self, method: str, idempotent: bool = False) -> bool:
+        """
+        Checks if the call can be hedged at all.
+
+        :param method: the HTTP method of the call.
+        :param idempotent: true when the call is known to be idempotent regardless of its method.
+        :return: true if the call can be hedged.
+        """
+        return self._enabled and (idempotent or method.upper() in self.IDEMPOTENT_METHODS)
+
+    def deposit(self):
+        """
+        Deposits tokens into the hedge budget. It is called once for every call that can be hedged.
+        """
+        with self.__lock:
+            self.__tokens = min(self._budget, self.__tokens + self._budget_ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Withdraws a token from the hedge budget to send a hedged request.
+
+        :return: true if the request can be sent and false when the budget is exhausted.
+        """
+        with self.__lock:
+            if self.__tokens < 1:
+                return False
+            self.__tokens -= 1
+            return True
+
+    def record(self, duration: float):
+        """
+        Records the time of a completed call.
+
+        :param duration: the call time in milliseconds.
+        """
+        with self.__lock:
+            self.__samples.append(duration)
+            # The percentile is recalculated periodically, since calls are recorded much more often
+            if self.__percentile_delay is None or len(self.__samples) % 10 == 0:
+                self.__percentile_delay = self.__calculate_percentile()
+
+    def get_delay(self) -> float:
+        """
+        Gets the time to wait for a response before a hedged request is sent.
+
+        :return: the delay in seconds.
+        """
+        delay = self.__percentile_delay
+        if delay is None or len(self.__samples) < self._min_samples:
+            delay = self._delay
+        return delay / 1000
+
+    def __calculate_percentile(self) -> float:
+        samples = sorted(self.__samples)
+        index = min(len(samples) - 1, int(len(samples) * self._percentile / 100))
+        return samples[index]
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.HttpClientCache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Client-side HTTP response cache
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Any, Mapping, Optional, Tuple
+
+from pip_services3_commons.config import IConfigurable, ConfigParams
+
+
+class _CacheEntry:
+
+    def __init__(self, status: int, content: bytes, etag: Optional[str], last_modified: Optional[str],
+                 expires: float):
+        self.status = status
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    def is_fresh(self) -> bool:
+        return self.expires > time.perf_counter()
+
+
+class HttpClientCache(IConfigurable):
+    """
+    Private cache of GET responses for REST clients that follows HTTP caching headers of the remote service.
+
+    Responses are kept as long as their *Cache-Control: max-age* or *Expires* header allows
+    and are returned without calling the service while they are fresh. Responses with *ETag* or *Last-Modified*
+    headers are kept after that and revalidated with *If-None-Match* and *If-Modified-Since* conditions,
+    so the service answers with 304 status and no body when they did not change.
+    Responses with *Cache-Control: no-store* are never kept and *no-cache* responses are revalidated on every call.
+
+    Responses are found by request route and query parameters except correlation_id.
+    The least recently used responses are evicted when the cache holds more than *cache_max_entries* responses
+    or more than *cache_max_size* bytes.
+
+    ### Configuration parameters ###
+        - options:
+            - cache:                 true to cache GET responses (default: false)
+            - cache_max_entries:     maximum number of kept responses (default: 1000)
+            - cache_max_size:        maximum total size of kept responses in bytes (default: 10 MB)
+
+    Example:
+
+    .. code-block:: python
+
+        cache = HttpClientCache()
+        cache.configure(ConfigParams.from_tuples("options.cache", True))
+
+        key = cache.get_key('/v1/countries', {})
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh():
+            content = entry.content
+        else:
+            headers = cache.get_conditions(entry)
+            # ... send the request with the headers
+    """
+
+    # Query parameters that differ for every call and do not change the response
+    _ignored_params = ('correlation_id',)
+
+    def __init__(self):
+        """
+        Creates a new instance of the cache.
+        """
+        self._enabled = False
+        self._max_entries = 1000
+        self._max_size = 10 * 1024 * 1024
+
+        self.__entries: 'OrderedDict[Tuple, _CacheEntry]' = OrderedDict()
+        self.__size = 0
+        self.__lock = Lock()
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        self._enabled = config.get_as_boolean_with_default("options.cache", self._enabled)
+        self._max_entries = config.get_as_integer_with_default("options.cache_max_entries", self._max_entries)
+        self._max_size = config.get_as_integer_with_default("options.cache_max_size", self._max_size)
+        self.clear()
+
+    def can_cache(self, method: str) -> bool:
+        """
+        Checks if responses of the call can be cached.
+
+        :param method: the HTTP method of the call.
+        :return: true if the cache is enabled and the call is a GET call.
+        """
+        return self._enabled and method.upper() == 'GET'
+
+    def get_key(self, route: str, params: Optional[Mapping[str, Any]]) -> Tuple:
+        """
+        Gets the key of cached responses for a request.
+
+        :param route: the request route.
+        :param params: the query parameters.
+        :return: the cache key.
+        """
+        query = tuple(sorted((name, str(value)) for (name, value) in (params or {}).items()
+                             if value is not None and name not in self._ignored_params))
+        return route, query
+
+    def get(self, key: Tuple) -> Optional[_CacheEntry]:
+        """
+        Gets a cached response. The response can be stale and shall be checked with *is_fresh()*.
+
+        :param key: the cache key.
+        :return: the cached response or None if it is not found.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def get_conditions(entry: Optional[_CacheEntry]) -> dict:
+        """
+        Gets headers of a conditional request that revalidates a stale response.
+
+        :param entry: the cached response.
+        :return: the conditional headers.
+        """
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, key: Tuple, status: int, headers: Mapping[str, str], content: bytes) -> bool:
+        """
+        Keeps a received response when its headers allow it. Responses that cannot be cached
+        remove earlier responses with the same key.
+
+        :param key: the cache key.
+        :param status: the response status code.
+        :param headers: the response headers.
+        :param content: the response body.
+        :return: true if the response is kept.
+        """
+        max_age = self.__get_max_age(headers) if status == 200 else None
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if max_age is None or (max_age <= 0 and etag is None and last_modified is None) \
+                or len(content) > self._max_size:
+            self.remove(key)
+            return False
+
+        entry = _CacheEntry(status, content, etag, last_modified, time.perf_counter() + max_age)
+        with self.__lock:
+            self.__remove(key)
+            self.__entries[key] = entry
+            self.__size += len(content)
+            while len(self.__entries) > self._max_entries or self.__size > self._max_size:
+                self.__remove(next(iter(self.__entries)))
+        return True
+
+    def revalidate(self, key: Tuple, headers: Mapping[str, str]) -> Optional[_CacheEntry]:
+        """
+        Refreshes a cached response after the service answered a conditional request with 304 status.
+
+        :param key: the cache key.
+        :param headers: the headers of 304 response.
+        :return: the refreshed response or None if it was removed from the cache.
+        """
+        max_age = self.__get_max_age(headers)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if max_age is None:
+                self.__remove(key)
+            else:
+                entry.expires = time.perf_counter() + max_age
+                entry.etag = headers.get('ETag', entry.etag)
+                entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+            return entry
+
+    def remove(self, key: Tuple):
+        """
+        Removes a cached response.
+
+        :param key: the cache key.
+        """
+        with self.__lock:
+            self.__remove(key)
+
+    def clear(self):
+        """
+        Removes all cached responses.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __remove(self, key: Tuple):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__size -= len(entry.content)
+
+    @staticmethod
+    def __get_max_age(headers: Mapping[str, str]) -> Optional[float]:
+        # Returns the freshness time in seconds or None when the response shall not be stored
+        directives = {}
+        for directive in headers.get('Cache-Control', '').split(','):
+            (name, _, value) = directive.strip().partition('=')
+            directives[name.strip().lower()] = value.strip().strip('"')
+
+        if 'no-store' in directives or headers.get('Vary', '').strip() == '*':
+            return None
+        if 'no-cache' in directives:
+            return 0
+
+        age = HttpClientCache.__parse_seconds(headers.get('Age')) or 0
+        max_age = HttpClientCache.__parse_seconds(directives.get('max-age'))
+        if max_age is not None:
+            return max_age - age
+
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                date = headers.get('Date')
+                now = parsedate_to_datetime(date).timestamp() if date else time.time()
+                return parsedate_to_datetime(expires).timestamp() - now - age
+            except (TypeError, ValueError):
+                # Invalid dates mean the response is already expired
+                return 0
+        return 0
+
+    @staticmethod
+    def __parse_seconds(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
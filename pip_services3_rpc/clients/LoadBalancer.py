@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.LoadBalancer
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Client-side load balancer implementation
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import random
+import time
+from threading import Lock
+from typing import List, Optional
+
+from pip_services3_commons.config import IConfigurable, ConfigParams
+from pip_services3_commons.errors import ConfigException
+
+
+class _Endpoint:
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.ejected_until = 0.0
+
+
+class LoadBalancer(IConfigurable):
+    """
+    Spreads calls of a REST client across all resolved endpoints of a remote service.
+
+    Supported balancing strategies:
+        - *round_robin*:       endpoints are used one after another
+        - *least_requests*:    the endpoint with the fewest outstanding calls is used
+        - *p2c*:               two random endpoints are compared and the one with lower observed latency
+                               multiplied by its number of outstanding calls is used (power of two choices)
+
+    Health of endpoints is tracked passively from the results of calls. An endpoint that failed
+    *eject_failures* times in a row is not used for *eject_timeout* milliseconds. When all endpoints are ejected,
+    calls are spread across all of them, so the client keeps probing the remote service.
+
+    ### Configuration parameters ###
+        - options:
+            - balancing:             balancing strategy: round_robin, least_requests or p2c (default: round_robin)
+            - eject_failures:        number of consecutive failures after which an endpoint is ejected (default: 3)
+            - eject_timeout:         time in milliseconds an ejected endpoint is not used (default: 10 sec)
+
+    Example:
+
+    .. code-block:: python
+
+        balancer = LoadBalancer()
+        balancer.configure(ConfigParams.from_tuples("options.balancing", "p2c"))
+        balancer.set_endpoints(["http://host1:8080", "http://host2:8080"])
+
+        uri = balancer.acquire()
+        start = time.perf_counter()
+        # ... call the endpoint
+        balancer.release(uri, (time.perf_counter() - start) * 1000, failed=False)
+    """
+
+    STRATEGIES = ('round_robin', 'least_requests', 'p2c')
+
+    # Weight of the last call in the moving average of latency
+    _latency_decay = 0.3
+
+    def __init__(self):
+        """
+        Creates a new instance of the load balancer.
+        """
+        self._strategy = 'round_robin'
+        self._eject_failures = 3
+        self._eject_timeout = 10000
+
+        self.__endpoints: List[_Endpoint] = []
+        self.__next = 0
+        self.__lock = Lock()
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        strategy = config.get_as_string_with_default("options.balancing", self._strategy).lower()
+        if strategy not in self.STRATEGIES:
+            raise ConfigException(None, 'UNKNOWN_BALANCING',
+                                  'Balancing strategy ' + strategy + ' is not supported') \
+                .with_details('balancing', strategy)
+        self._strategy = strategy
+        self._eject_failures = config.get_as_integer_with_default("options.eject_failures", self._eject_failures)
+        self._eject_timeout = config.get_as_integer_with_default("options.eject_timeout", self._eject_timeout)
+
+    def set_endpoints(self, uris: List[str]):
+        """
+        Sets URIs of the endpoints to balance calls across. Statistics of the endpoints are reset.
+
+        :param uris: a list of endpoint URIs.
+        """
+        with self.__lock:
+            self.__endpoints = [_Endpoint(uri) for uri in uris]
+            self.__next = 0
+
+    def get_endpoints(self) -> List[str]:
+        """
+        Gets URIs of all endpoints.
+
+        :return: a list of endpoint URIs.
+        """
+        return [endpoint.uri for endpoint in self.__endpoints]
+
+    def get_healthy_endpoints(self) -> List[str]:
+        """
+        Gets URIs of endpoints that are not ejected.
+
+        :return: a list of endpoint URIs.
+        """
+        now = time.perf_counter()
+        return [endpoint.uri for endpoint in self.__endpoints if endpoint.ejected_until <= now]
+
+    def acquire(self) -> Optional[str]:
+        """
+        Chooses an endpoint for the next call and counts the call as outstanding.
+        Every acquired endpoint shall be released by :func:`release` when the call ends.
+
+        :return: the URI of the chosen endpoint or None if there are no endpoints.
+        """
+        with self.__lock:
+            endpoints = self.__endpoints
+            if len(endpoints) == 0:
+                return None
+
+            if len(endpoints) > 1:
+                now = time.perf_counter()
+                healthy = [endpoint for endpoint in endpoints if endpoint.ejected_until <= now]
+                endpoints = healthy if len(healthy) > 0 else endpoints
+
+            if len(endpoints) == 1:
+                endpoint = endpoints[0]
+            elif self._strategy == 'least_requests':
+                endpoint = self.__choose_least_requests(endpoints)
+            elif self._strategy == 'p2c':
+                endpoint = self.__choose_p2c(endpoints)
+            else:
+                endpoint = endpoints[self.__next % len(endpoints)]
+                self.__next += 1
+
+            endpoint.outstanding += 1
+            return endpoint.uri
+
+    def release(self, uri: str, latency: Optional[float] = None, failed: bool = False):
+        """
+        Ends the call to the endpoint and updates its statistics and health.
+
+        :param uri: the URI returned by :func:`acquire`.
+        :param latency: (optional) the call time in milliseconds.
+        :param failed: true when the endpoint failed to process the call.
+        """
+        with self.__lock:
+            endpoint = self.__find(uri)
+            if endpoint is None:
+                return
+
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+            if failed:
+                endpoint.failures += 1
+                if endpoint.failures >= self._eject_failures:
+                    endpoint.failures = 0
+                    endpoint.ejected_until = time.perf_counter() + self._eject_timeout / 1000
+            else:
+                endpoint.failures = 0
+                if latency is not None:
+                    endpoint.latency = latency if endpoint.latency is None \
+                        else endpoint.latency + (latency - endpoint.latency) * self._latency_decay
+
+    def cancel(self, uri: str):
+        """
+        Releases the endpoint returned by :func:`acquire` when the call was not made to it.
+        Statistics of the endpoint are not changed.
+
+        :param uri: the URI returned by :func:`acquire`.
+        """
+        with self.__lock:
+            endpoint = self.__find(uri)
+            if endpoint is not None:
+                endpoint.outstanding = max(0, endpoint.outstanding - 1)
+
+    def __find(self, uri: str) -> Optional[_Endpoint]:
+        for endpoint in self.__endpoints:
+            if endpoint.uri == uri:
+                return endpoint
+        return None
+
+    def __choose_least_requests(self, endpoints: List[_Endpoint]) -> _Endpoint:
+        # Endpoints with the same number of calls are taken in turns
+        start = self.__next % len(endpoints)
+        self.__next += 1
+        best = None
+        for index in range(len(endpoints)):
+            endpoint = endpoints[(start + index) % len(endpoints)]
+            if best is None or endpoint.outstanding < best.outstanding:
+                best = endpoint
+        return best
+
+    @staticmethod
+    def __choose_p2c(endpoints: List[_Endpoint]) -> _Endpoint:
+        first, second = random.sample(endpoints, 2)
+        return first if LoadBalancer.__get_load(first) <= LoadBalancer.__get_load(second) else second
+
+    @staticmethod
+    def __get_load(endpoint: _Endpoint) -> float:
+        # Endpoints without measurements are preferred, so they get their latency measured
+        latency = endpoint.latency if endpoint.latency is not None else 0.0
+        return latency * (endpoint.outstanding + 1)
@@ -8,30 +8,67 @@
     :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
     :license: MIT, see LICENSE for more details.
 """
-from typing import Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from threading import Lock
+from typing import Optional, Any, Iterator, Tuple
 
 import requests
-from pip_services3_commons.config import ConfigParams, IConfigurable
-from pip_services3_commons.data import PagingParams
-from pip_services3_commons.errors import ErrorDescription, ApplicationExceptionFactory
-from pip_services3_commons.errors import UnknownException, InvocationException
-from pip_services3_commons.refer import IReferenceable, IReferences
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import InvocationException, UnknownException
 from pip_services3_commons.run import IOpenable
-from pip_services3_components.count import CompositeCounters
-from pip_services3_components.log import CompositeLogger
-from pip_services3_components.trace.CompositeTracer import CompositeTracer
 
-from ..connect.HttpConnectionResolver import HttpConnectionResolver
-from ..services.InstrumentTiming import InstrumentTiming
+from .BaseRestClient import BaseRestClient
+from .HedgingPolicy import HedgingPolicy
+from .HttpClientCache import HttpClientCache
+from ..services.SingleFlight import SingleFlight
 
 
-class RestClient(IOpenable, IConfigurable, IReferenceable):
+class _IdleExpiringPool:
+    # Remembers when every connection was returned to the pool and drops connections that stayed idle too long,
+    # since the server side closes idle keep-alive connections after its own timeout
+    keep_alive_timeout = 0
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn.released_time = time.perf_counter()
+        super()._put_conn(conn)
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        released_time = getattr(conn, 'released_time', None)
+        if self.keep_alive_timeout > 0 and released_time is not None \
+                and (time.perf_counter() - released_time) * 1000 > self.keep_alive_timeout:
+            # Closed connection is reopened by urllib3 when it is used
+            conn.close()
+        return conn
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+
+    def __init__(self, keep_alive_timeout: int, **kwargs):
+        self.__keep_alive_timeout = keep_alive_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attributes = {'keep_alive_timeout': self.__keep_alive_timeout}
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('HTTPConnectionPool', (_IdleExpiringPool, HTTPConnectionPool), attributes),
+            'https': type('HTTPSConnectionPool', (_IdleExpiringPool, HTTPSConnectionPool), attributes),
+        }
+
+
+class RestClient(BaseRestClient, IOpenable):
     """
     Abstract client that calls remove endpoints using HTTP/REST protocol.
 
     ### Configuration parameters ###
         - base_route:              base route for remote URI
-        - connection(s):
+        - connection(s):             one or several endpoints of the remote service
             - discovery_key:         (optional) a key to retrieve the connection from :class:`IDiscovery <pip_services3_components.connect.IDiscovery.IDiscovery>`
             - protocol:              connection protocol: http or https
             - host:                  host name or IP address
@@ -39,8 +76,35 @@ class RestClient(IOpenable, IConfigurable, IReferenceable):
             - uri:                   resource URI or connection string with all parameters in it
         - options:
             - retries:               number of retries (default: 3)
+            - retry_delay:           initial retry delay in milliseconds (default: 100)
+            - retry_max_delay:       maximum retry delay in milliseconds (default: 5 sec)
+            - retry_budget:          maximum number of accumulated retry tokens (default: 10)
+            - retry_budget_ratio:    number of retry tokens earned by every call (default: 0.2)
             - connect_timeout:       connection timeout in milliseconds (default: 10 sec)
-            - timeout:               invocation timeout in milliseconds (default: 10 sec)
+            - timeout:               read timeout in milliseconds for every attempt (default: 10 sec)
+            - total_timeout:         timeout in milliseconds for the whole call including retries (default: 0, no limit).
+                                     The time left is sent to the service in *X-Request-Timeout* header
+            - pool_size:             number of per-host connection pools kept by the session (default: 10)
+            - max_connections:       maximum number of keep-alive connections per host (default: 10)
+            - keep_alive_timeout:    idle time in milliseconds after which a pooled connection is dropped,
+                                     measured for every connection since it was returned to the pool (default: 5 sec)
+            - compression:           accepts compressed responses with gzip, deflate or brotli encoding
+                                     and decodes them transparently (default: true)
+            - json_codec:            the codec to encode requests and decode responses: "json" for the standard
+                                     json module (default) or "orjson" for C-accelerated orjson package
+            - balancing:             strategy to spread calls across several endpoints: round_robin (default),
+                                     least_requests or p2c, see :class:`LoadBalancer <pip_services3_rpc.clients.LoadBalancer.LoadBalancer>`
+            - eject_failures:        number of consecutive failures after which an endpoint is not used (default: 3)
+            - eject_timeout:         time in milliseconds a failing endpoint is not used (default: 10 sec)
+            - circuit_breaker:       true to stop calls to failing or slow endpoints for a while (default: false),
+                                     see :class:`CircuitBreaker <pip_services3_rpc.clients.CircuitBreaker.CircuitBreaker>` for breaker_* options
+            - hedging:               true to repeat slow GET, HEAD and idempotent calls on another endpoint and use
+                                     the first response (default: false), see :class:`HedgingPolicy <pip_services3_rpc.clients.HedgingPolicy.HedgingPolicy>` for hedge_* options
+            - cache:                 true to keep GET responses by their Cache-Control, ETag and Last-Modified headers
+                                     and revalidate them with conditional requests (default: false),
+                                     see :class:`HttpClientCache <pip_services3_rpc.clients.HttpClientCache.HttpClientCache>` for cache_* options
+            - single_flight:         true to let identical concurrent GET, HEAD and idempotent calls share
+                                     one request and its result or error (default: false)
 
     ### References ###
         - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
@@ -68,59 +132,22 @@ class RestClient(IOpenable, IConfigurable, IReferenceable):
         data = client.getData("123", "1")
         # ...
     """
-    __default_config = ConfigParams.from_tuples(
-        "connection.protocol", "http",
-        "connection.host", "0.0.0.0",
-        "connection.port", 3000,
-
-        "options.timeout", 10000,
-        "options.request_max_size", 1024 * 1024,
-        "options.connect_timeout", 10000,
-        "options.retries", 3,
-        "options.debug", True
-    )
-
     def __init__(self):
         """
         Creates a new instance of the client.
         """
-        # The HTTP client.
-        self._client: Any = None
-        # The remote service uri which is calculated on open.
-        self._uri: str = None
-        # The invocation timeout in milliseconds.
-        self._timeout = 1000
-        # The connection resolver.
-        self._connection_resolver: HttpConnectionResolver = HttpConnectionResolver()
-        # The logger.
-        self._logger: CompositeLogger = CompositeLogger()
-        # The performance counters.
-        self._counters: CompositeCounters = CompositeCounters()
-        # The tracer.
-        self._tracer: CompositeTracer = CompositeTracer()
-        # The configuration options.
-        self._options: ConfigParams = ConfigParams()
-        # The base route.
-        self._base_route: str = None
-        # The number of retries.
-        self._retries = 1
-        # The default headers to be added to every request.
-        self._headers: dict = {}
-        # The connection timeout in milliseconds.
-        self._connect_timeout = 1000
-
-        self._correlation_id_location: str = "query"
-
-    def set_references(self, references: IReferences):
-        """
-        Sets references to dependent components.
-
-        :param references: references to locate the component dependencies.
-        """
-        self._logger.set_references(references)
-        self._counters.set_references(references)
-        self._tracer.set_references(references)
-        self._connection_resolver.set_references(references)
+        super(RestClient, self).__init__()
+        # The HTTP client (pooled keep-alive session).
+        self._client: requests.Session = None
+        # The policy that decides when slow calls are hedged.
+        self._hedging_policy: HedgingPolicy = HedgingPolicy()
+        # The cache of GET responses.
+        self._cache: HttpClientCache = HttpClientCache()
+        # The coalescing of identical concurrent calls.
+        self._single_flight: SingleFlight = SingleFlight()
+        self.__single_flight_enabled = False
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__executor_lock = Lock()
 
     def configure(self, config: ConfigParams):
         """
@@ -128,61 +155,11 @@ class RestClient(IOpenable, IConfigurable, IReferenceable):
 
         :param config: configuration parameters to be set.
         """
-        config = config.set_defaults(self.__default_config)
-        self._connection_resolver.configure(config)
-
-        self._options.override(config.get_section("options"))
-        self._retries = config.get_as_integer_with_default("options.retries", self._retries)
-        self._connect_timeout = config.get_as_integer_with_default("options.connect_timeout", self._connect_timeout)
-        self._timeout = config.get_as_integer_with_default("options.timeout", self._timeout)
-
-        self._base_route = config.get_as_string_with_default("base_route", self._base_route)
-        self._correlation_id_location = config.get_as_string_with_default("options.correlation_id_place",
-                                                                          self._correlation_id_location)
-        self._correlation_id_location = config.get_as_string_with_default("options.correlation_id",
-                                                                          self._correlation_id_location)
-
-    def _instrument(self, correlation_id: Optional[str], name: str) -> InstrumentTiming:
-        """
-        Adds instrumentation to log calls and measure call time.
-        It returns a Timing object that is used to end the time measurement.
-
-        :param correlation_id: (optional) transaction id to trace execution through call chain.
-        :param name: a method name.
-        :return: InstrumentTiming object to end the time measurement.
-        """
-        self._logger.trace(correlation_id, "Calling %s method", name)
-        self._counters.increment_one(name + ".call_count")
-
-        counter_timing = self._counters.begin_timing(name + '.call_time')
-        trace_timing = self._tracer.begin_trace(correlation_id, name, None)
-        return InstrumentTiming(correlation_id, name, "call",
-                                self._logger, self._counters, counter_timing, trace_timing)
-
-    # def _instrument_error(self, correlation_id, name, err, result=None, callback=None):
-    #     """
-    #     Adds instrumentation to error handling.
-    #
-    #     :param correlation_id: (optional) transaction id to trace execution through call chain.
-    #     :param name: a method name.
-    #     :param err: an occured error
-    #     :param result: (optional) an execution result
-    #     :param callback: (optional) an execution callback
-    #     """
-    #     if err is not None:
-    #         TYPE_NAME = self.__class__.__name__ or 'unknown-target'
-    #         self.__logger.error(correlation_id, err, f"Failed to call {name} method of {TYPE_NAME}")
-    #         self.__counters.increment_one(f"{name}.call_errors")
-    #     if callback:
-    #         callback(err, result)
-
-    def is_open(self) -> bool:
-        """
-        Checks if the component is opened.
-
-        :return: true if the component has been opened and false otherwise.
-        """
-        return self._client is not None
+        super().configure(config)
+        self._hedging_policy.configure(config)
+        self._cache.configure(config)
+        self.__single_flight_enabled = config.get_as_boolean_with_default("options.single_flight",
+                                                                          self.__single_flight_enabled)
 
     def open(self, correlation_id: Optional[str]):
         """
@@ -193,11 +170,9 @@ class RestClient(IOpenable, IConfigurable, IReferenceable):
         if self.is_open():
             return
 
-        connection = self._connection_resolver.resolve(correlation_id)
-
-        self._uri = connection.get_as_string('uri')
+        self._resolve_endpoints(correlation_id)
 
-        self._client = requests
+        self._client = self._create_session()
 
         self._logger.debug(correlation_id, "Connected via REST to " + self._uri)
 
@@ -207,114 +182,141 @@ class RestClient(IOpenable, IConfigurable, IReferenceable):
 
         :param correlation_id: (optional) transaction id to trace execution through call chain.
         """
+        with self.__executor_lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
         if self._client is not None:
+            self._client.close()
             self._logger.debug(correlation_id, "Disconnected from " + self._uri)
 
         self._client = None
         self._uri = None
 
-    def _to_json(self, obj):
-        if obj is None:
-            return None
-
-        if isinstance(obj, set):
-            obj = list(obj)
-        if isinstance(obj, list):
-            result = []
-            for item in obj:
-                item = self._to_json(item)
-                result.append(item)
-            return result
-
-        if isinstance(obj, dict):
-            result = {}
-            for (k, v) in obj.items():
-                v = self._to_json(v)
-                result[k] = v
-            return result
-
-        if hasattr(obj, 'to_json'):
-            return obj.to_json()
-        if hasattr(obj, '__dict__'):
-            return self._to_json(obj.__dict__)
-        return obj
-
-    def fix_route(self, route) -> str:
-        if route is not None and len(route) > 0:
-            if route[0] != '/':
-                route = f'/{route}'
-            return route
-
-        return ''
-
-    def __create_request_route(self, route: str) -> str:
-        builder = ''
-        if self._uri is not None and len(self._uri) > 0:
-            builder = self._uri
-
-            builder += self.fix_route(self._base_route)
-
-        if route[0] != '/':
-            builder += '/'
-        builder += route
-
-        return builder
-
-    def add_correlation_id(self, params: Any = None, correlation_id: Optional[str] = None) -> Any:
-        """
-        Adds a correlation id (correlation_id) to invocation parameter map.
-
-        :param params: invocation parameters.
-        :param correlation_id: (optional) a correlation id to be added.
-
-        :returns: invocation parameters with added correlation id.
-
+    def _create_session(self) -> requests.Session:
         """
-        params = params or {}
-        if not (correlation_id is None):
-            params['correlation_id'] = correlation_id
-
-        return params
-
-    def _add_filter_params(self, params: Any = None, filters: Any = None) -> dict:
-        """
-        Adds filter parameters (with the same name as they defined)
-        to invocation parameter map.
-
-        :param params:  invocation parameters.
-        :param filters: (optional) filter parameters
-        :returns: invocation parameters with added filter parameters.
-        """
-        params = params or {}
-        if not (filters is None):
-            params.update(filters)
-
-        return params
-
-    def _add_paging_params(self, params: dict = None, paging: PagingParams = None) -> dict:
-        """
-        Adds paging parameters (skip, take, total) to invocation parameter map.
-
-
-        :param params: invocation parameters.
-        :param paging: (optional) paging parameters
-
-        :returns: invocation parameters with added paging parameters.
+        Creates a HTTP session that keeps connections to remote hosts alive
+        and reuses them between calls.
 
+        :return: a new pooled HTTP session.
         """
-        params = params or {}
-        if paging:
-            if paging.total:
-                params['total'] = paging.total
-            if paging.skip:
-                params['skip'] = paging.skip
-            if paging.take:
-                params['take'] = paging.take
-
-        return params
+        session = requests.Session()
+        adapter = _KeepAliveAdapter(self._keep_alive_timeout, pool_connections=self._pool_size,
+                                    pool_maxsize=self._max_connections)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @staticmethod
+    def __is_connect_error(error: Exception) -> bool:
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and len(error.args) > 0:
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+        return False
+
+    def __send_request(self, method: str, route: str, correlation_id: Optional[str], params: dict,
+                       headers: dict, data: Any, deadline: Optional[float] = None,
+                       stream: bool = False) -> requests.Response:
+        name = self._get_operation_name(method)
+        self._retry_policy.deposit()
+        attempt = 0
+
+        while True:
+            self._counters.increment_one(name + '.attempt_count')
+            trace_timing = self._tracer.begin_trace(correlation_id, name, route)
+
+            try:
+                timeout = self._get_attempt_timeout(correlation_id, deadline)
+            except Exception as ex:
+                trace_timing.end_failure(ex)
+                raise
+
+            uri = self._acquire_endpoint(correlation_id, method, route)
+            start_time = time.perf_counter()
+            try:
+                response = self._client.request(method, (uri or '') + route,
+                                                headers=self._add_deadline_header(headers, deadline),
+                                                data=data,
+                                                params=params,
+                                                timeout=timeout,
+                                                stream=stream)
+            except Exception as ex:
+                trace_timing.end_failure(ex)
+                transport_error = isinstance(ex, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                self._release_endpoint(uri, method, route, (time.perf_counter() - start_time) * 1000,
+                                       error=transport_error)
+                delay = self._retry_policy.get_delay(attempt)
+                if not self._retry_policy.can_retry(method, attempt, connect_error=self.__is_connect_error(ex),
+                                                    error=transport_error) \
+                        or self._is_past_deadline(deadline, delay):
+                    raise InvocationException(correlation_id, 'REST_ERROR',
+                                              'REST operation failed: ' + str(ex)).wrap(ex)
+            else:
+                trace_timing.end_trace()
+                self._release_endpoint(uri, method, route, (time.perf_counter() - start_time) * 1000,
+                                       status=response.status_code)
+                retry_after = response.headers.get('Retry-After')
+                delay = self._retry_policy.get_delay(attempt, retry_after)
+                if not self._retry_policy.can_retry(method, attempt, status=response.status_code,
+                                                    retry_after=retry_after) \
+                        or self._is_past_deadline(deadline, delay):
+                    return response
+                response.close()
+
+            self._counters.increment_one(name + '.retry_count')
+            self._logger.debug(correlation_id, "Retrying %s %s in %d ms after attempt %d",
+                               method, route, int(delay * 1000), attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
+    def __send_hedged_request(self, method: str, route: str, correlation_id: Optional[str], params: dict,
+                              headers: dict, data: Any, deadline: Optional[float]) -> requests.Response:
+        policy = self._hedging_policy
+        policy.deposit()
+        start_time = time.perf_counter()
+
+        executor = self.__get_executor()
+        futures = [executor.submit(self.__send_request, method, route, correlation_id, params, headers, data,
+                                   deadline)]
+        (done, _) = wait(futures, timeout=policy.get_delay())
+        if len(done) == 0 and policy.withdraw():
+            # The balancer counts the first request as outstanding, so the hedged one usually goes to another endpoint
+            self._counters.increment_one(self._get_operation_name(method) + '.hedge_count')
+            futures.append(executor.submit(self.__send_request, method, route, correlation_id, params,
+                                           headers, data, deadline))
+
+        error = None
+        pending = set(futures)
+        while len(pending) > 0:
+            (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+
+                policy.record((time.perf_counter() - start_time) * 1000)
+                for other in pending:
+                    other.add_done_callback(self.__discard_response)
+                return future.result()
+
+        raise error
+
+    @staticmethod
+    def __discard_response(future: Future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        # A hedged call takes up to two threads
+        with self.__executor_lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self._max_connections * 2)
+            return self.__executor
 
     def _call(self, method: str, route: str, correlation_id: Optional[str] = None, params: dict = None,
-              data: Any = None) -> Any:
+              data: Any = None, idempotent: bool = False, timeout: Optional[int] = None) -> Any:
         """
         Calls a remote method via HTTP/REST protocol.
 
@@ -328,64 +330,137 @@ class RestClient(IOpenable, IConfigurable, IReferenceable):
 
         :param data: (optional) body object.
 
+        :param idempotent: (optional) true when the call can be safely repeated, so it can be hedged
+                           like GET and HEAD calls.
+
+        :param timeout: (optional) the timeout in milliseconds for the whole call including retries,
+                        that overrides *options.total_timeout*.
+
         :return: result object
         """
-        method = method.upper()
-
-        if method not in ['GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH']:
-            raise UnknownException(correlation_id, 'UNSUPPORTED_METHOD',
-                                   'Method is not supported by REST client').with_details('verb', method)
+        deadline = self._get_deadline(timeout)
+        method, route, params, headers = self._prepare_request(method, route, correlation_id, params)
+
+        if self.__single_flight_enabled and data is None and (method in ('GET', 'HEAD') or idempotent):
+            key = self.__get_flight_key(method, route, params, headers)
+            remaining = deadline - time.perf_counter() if deadline is not None else None
+            ((status, content), shared) = self._single_flight.execute(
+                key, lambda: self.__fetch(method, route, correlation_id, params, headers, None, idempotent, deadline),
+                timeout=remaining)
+            if shared:
+                self._counters.increment_one(self._get_operation_name(method) + '.coalesced_count')
+        else:
+            (status, content) = self.__fetch(method, route, correlation_id, params, headers, data, idempotent,
+                                             deadline)
+
+        return self._parse_response(correlation_id, status, content)
+
+    def __fetch(self, method: str, route: str, correlation_id: Optional[str], params: dict, headers: dict,
+                data: Any, idempotent: bool, deadline: Optional[float]) -> Tuple[int, bytes]:
+        if self._cache.can_cache(method) and data is None:
+            return self.__fetch_cached(method, route, correlation_id, params, headers, idempotent, deadline)
+
+        data = self._encode_body(data, headers)
+        response = self.__send(method, route, correlation_id, params, headers, data, idempotent, deadline)
+        return response.status_code, response.content
+
+    def __send(self, method: str, route: str, correlation_id: Optional[str], params: dict, headers: dict,
+               data: Any, idempotent: bool, deadline: Optional[float]) -> requests.Response:
+        if self._hedging_policy.can_hedge(method, idempotent):
+            return self.__send_hedged_request(method, route, correlation_id, params, headers, data, deadline)
+        return self.__send_request(method, route, correlation_id, params, headers, data, deadline)
+
+    def __fetch_cached(self, method: str, route: str, correlation_id: Optional[str], params: dict, headers: dict,
+                       idempotent: bool, deadline: Optional[float]) -> Tuple[int, bytes]:
+        name = self._get_operation_name(method)
+        key = self._cache.get_key(route, params)
+        entry = self._cache.get(key)
+        if entry is not None and entry.is_fresh():
+            self._counters.increment_one(name + '.cache_hit_count')
+            return entry.status, entry.content
+
+        headers.update(self._cache.get_conditions(entry))
+        response = self.__send(method, route, correlation_id, params, headers, None, idempotent, deadline)
+
+        if response.status_code == 304 and entry is not None:
+            self._counters.increment_one(name + '.cache_revalidated_count')
+            self._cache.revalidate(key, response.headers)
+            return entry.status, entry.content
+
+        self._counters.increment_one(name + '.cache_miss_count')
+        self._cache.put(key, response.status_code, response.headers, response.content)
+        return response.status_code, response.content
+
+    @staticmethod
+    def __get_flight_key(method: str, route: str, params: dict, headers: dict) -> tuple:
+        # Correlation ids differ for every call, so they do not make calls different
+        query = tuple(sorted((name, str(value)) for (name, value) in params.items()
+                             if value is not None and name != 'correlation_id'))
+        header_values = tuple(sorted((name, value) for (name, value) in headers.items()
+                                     if name != 'correlation_id'))
+        return method, route, query, header_values
+
+    def _call_stream(self, method: str, route: str, correlation_id: Optional[str] = None, params: dict = None,
+                     data: Any = None, timeout: Optional[int] = None) -> Iterator[Any]:
+        """
+        Calls a remote method that streams its result as newline delimited JSON (NDJSON)
+        and returns a generator of received items. Items are decoded while the response is received,
+        so the whole result is never held in memory. Responses with regular JSON arrays are read as well.
 
-        route = self.__create_request_route(route)
-        params = self.add_correlation_id(correlation_id=correlation_id, params=params)
-        response = None
-        result = None
+        The request is sent when the first item is requested and the connection is released
+        when the generator is exhausted or closed.
 
-        if self._correlation_id_location == 'query' or self._correlation_id_location == 'both':
-            params = self.add_correlation_id(params, correlation_id)
+        :param method: HTTP method: "get", "head", "post", "put", "delete"
 
-        if self._correlation_id_location == 'headers' or self._correlation_id_location == 'both':
-            self._headers['correlation_id'] = correlation_id
+        :param route: a command route. Base route will be added to this route
 
-        try:
-            # Call the service
-            data = data if isinstance(data, str) else self._to_json(data)
-            response = requests.request(method, route,
-                                        headers=self._headers,
-                                        json=data,
-                                        params=params,
-                                        timeout=self._timeout)
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
 
-        except Exception as ex:
-            error = InvocationException(correlation_id, 'REST_ERROR', 'REST operation failed: ' + str(ex)).wrap(ex)
-            raise error
+        :param params: (optional) query parameters.
 
-        if response.status_code == 204:
-            return None
+        :param data: (optional) body object.
 
-        try:
-            # Retrieve JSON data
-            if response.content:
-                result = response.json()
-            else:
-                result = None
-        except:
-            # Data is not in JSON
-            if response.status_code < 400:
-                raise UnknownException(correlation_id, 'FORMAT_ERROR',
-                                       'Failed to deserialize JSON data: ' + response.text) \
-                    .with_details('response', response.text)
-            else:
-                raise UnknownException(correlation_id, 'UNKNOWN', 'Unknown error occured: ' + response.text) \
-                    .with_details('response', response.text)
+        :param timeout: (optional) the timeout in milliseconds to receive the response headers including retries,
+                        that overrides *options.total_timeout*. Reading of the streamed items is limited
+                        only by *options.timeout* between received chunks.
 
-        # Return result
-        if response.status_code < 400:
-            return result
+        :return: a generator of result items
+        """
+        deadline = self._get_deadline(timeout)
+        method, route, params, headers = self._prepare_request(method, route, correlation_id, params)
 
-        # Raise error
-        # Todo: We need to implement proper from_value method
-        error = ErrorDescription.from_json(result)
-        error.status = response.status_code
+        data = self._encode_body(data, headers)
+        response = self.__send_request(method, route, correlation_id, params, headers, data, deadline, stream=True)
 
-        raise ApplicationExceptionFactory.create(error)
+        try:
+            content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+            if response.status_code >= 300 or content_type != 'application/x-ndjson':
+                result = self._parse_response(correlation_id, response.status_code, response.content)
+                if isinstance(result, list):
+                    yield from result
+                elif result is not None:
+                    yield result
+                return
+
+            lines = response.iter_lines(chunk_size=16 * 1024)
+            while True:
+                try:
+                    line = next(lines, None)
+                except Exception as ex:
+                    raise InvocationException(correlation_id, 'REST_ERROR',
+                                              'REST operation failed: ' + str(ex)).wrap(ex)
+                if line is None:
+                    break
+                if not line:
+                    continue
+
+                try:
+                    item = self._codec.decode(line)
+                except ValueError:
+                    text = line.decode('utf-8', errors='replace')
+                    raise UnknownException(correlation_id, 'FORMAT_ERROR',
+                                           'Failed to deserialize JSON data: ' + text) \
+                        .with_details('response', text)
+                yield item
+        finally:
+            response.close()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.clients.RetryPolicy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Retry policy implementation
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Optional
+
+from pip_services3_commons.config import IConfigurable, ConfigParams
+
+
+class RetryPolicy(IConfigurable):
+    """
+    Decides when a failed HTTP call can be repeated and how long to wait before the next attempt.
+
+    Only idempotent methods are retried after transient failures (connection errors and 502, 503, 504 responses).
+    Calls with other methods are retried only when the request never reached the server: the connection
+    could not be established or the server rejected the call with 429 (Too Many Requests).
+    Delays grow exponentially up to a cap and are randomized with full jitter.
+    A server provided *Retry-After* header takes precedence over the computed delay. When the server asks
+    to wait longer than *retry_max_delay* the call is not retried and the response is returned to the caller.
+
+    The retry budget limits the total amount of retries: every call deposits *retry_budget_ratio* tokens,
+    every retry withdraws one token. When the budget is exhausted failed calls are not retried,
+    so retries cannot amplify an outage of the remote service.
+
+    ### Configuration parameters ###
+        - options:
+            - retries:               maximum number of retries for a single call (default: 3)
+            - retry_delay:           initial retry delay in milliseconds (default: 100)
+            - retry_max_delay:       maximum retry delay in milliseconds (default: 5 sec)
+            - retry_budget:          maximum number of retry tokens that can be accumulated (default: 10)
+            - retry_budget_ratio:    number of tokens deposited by every call (default: 0.2)
+
+    Example:
+
+    .. code-block:: python
+
+        policy = RetryPolicy()
+        policy.configure(ConfigParams.from_tuples("options.retries", 5))
+
+        if policy.can_retry('GET', attempt, status=503):
+            time.sleep(policy.get_delay(attempt))
+    """
+
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+    TRANSIENT_STATUSES = (429, 502, 503, 504)
+    REJECTED_STATUSES = (429,)
+
+    def __init__(self):
+        """
+        Creates a new instance of the retry policy.
+        """
+        self._retries = 3
+        self._delay = 100
+        self._max_delay = 5000
+        self._budget = 10.0
+        self._budget_ratio = 0.2
+
+        self.__tokens = self._budget
+        self.__lock = Lock()
+
+    def configure(self, config: ConfigParams):
+        """
+        Configures component by passing configuration parameters.
+
+        :param config: configuration parameters to be set.
+        """
+        self._retries = config.get_as_integer_with_default("options.retries", self._retries)
+        self._delay = config.get_as_integer_with_default("options.retry_delay", self._delay)
+        self._max_delay = config.get_as_integer_with_default("options.retry_max_delay", self._max_delay)
+        self._budget = config.get_as_float_with_default("options.retry_budget", self._budget)
+        self._budget_ratio = config.get_as_float_with_default("options.retry_budget_ratio", self._budget_ratio)
+        self.__tokens = self._budget
+
+    def get_retries(self) -> int:
+        """
+        Gets the maximum number of retries for a single call.
+
+        :return: the maximum number of retries.
+        """
+        return self._retries
+
+    def is_idempotent(self, method: str) -> bool:
+        """
+        Checks if the HTTP method can be safely repeated.
+
+        :param method: the HTTP method.
+        :return: true if the method is idempotent and false otherwise.
+        """
+        return method.upper() in self.IDEMPOTENT_METHODS
+
+    def is_transient_status(self, status: int) -> bool:
+        """
+        Checks if the HTTP status code signals a transient failure.
+
+        :param status: the HTTP status code.
+        :return: true if the call may succeed when repeated.
+        """
+        return status in self.TRANSIENT_STATUSES
+
+    def deposit(self):
+        """
+        Deposits tokens into the retry budget. It is called once for every new call.
+        """
+        with self.__lock:
+            self.__tokens = min(self._budget, self.__tokens + self._budget_ratio)
+
+    def can_retry(self, method: str, attempt: int, status: int = None, connect_error: bool = False,
+                  error: bool = False, retry_after: Optional[str] = None) -> bool:
+        """
+        Checks if the failed attempt can be repeated and withdraws a token from the retry budget if it can.
+
+        :param method: the HTTP method of the call.
+        :param attempt: the number of the failed attempt starting from 0.
+        :param status: (optional) the HTTP status code of the response.
+        :param connect_error: true when the connection to the remote service was not established.
+        :param error: true when the call failed with a transport error after the connection was established.
+        :param retry_after: (optional) the value of *Retry-After* response header.
+        :return: true if the call shall be repeated and false otherwise.
+        """
+        if attempt >= self._retries:
+            return False
+
+        if connect_error:
+            retriable = True
+        elif error:
+            retriable = self.is_idempotent(method)
+        elif status is not None:
+            retriable = self.is_transient_status(status) \
+                        and (self.is_idempotent(method) or status in self.REJECTED_STATUSES)
+        else:
+            retriable = False
+
+        if retriable:
+            delay = self.__parse_retry_after(retry_after)
+            retriable = delay is None or delay * 1000 <= self._max_delay
+
+        if not retriable:
+            return False
+
+        with self.__lock:
+            if self.__tokens < 1:
+                return False
+            self.__tokens -= 1
+            return True
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Calculates the delay before the next attempt using capped exponential backoff with full jitter.
+
+        :param attempt: the number of the failed attempt starting from 0.
+        :param retry_after: (optional) the value of *Retry-After* response header.
+        :return: the delay in seconds.
+        """
+        delay = self.__parse_retry_after(retry_after)
+        if delay is not None:
+            return delay
+
+        delay = min(self._max_delay, self._delay * (2 ** attempt))
+        return random.uniform(0, delay) / 1000
+
+    def __parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        if value is None or value == '':
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+            return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
@@ -9,8 +9,18 @@
     :license: MIT, see LICENSE for more details.
 """
 
-__all__ = [ 'DirectClient', 'RestClient', 'CommandableHttpClient' ]
+__all__ = [ 'DirectClient', 'BaseRestClient', 'RestClient', 'CommandableHttpClient', 'RetryPolicy', 'LoadBalancer',
+            'CircuitBreaker', 'CircuitOpenException', 'HedgingPolicy', 'HttpClientCache', 'AsyncRestClient', 'AsyncCommandableHttpClient' ]
 
+from .AsyncCommandableHttpClient import AsyncCommandableHttpClient
+from .AsyncRestClient import AsyncRestClient
+from .BaseRestClient import BaseRestClient
+from .CircuitBreaker import CircuitBreaker
+from .CircuitOpenException import CircuitOpenException
 from .CommandableHttpClient import CommandableHttpClient
 from .DirectClient import DirectClient
+from .HedgingPolicy import HedgingPolicy
+from .HttpClientCache import HttpClientCache
+from .LoadBalancer import LoadBalancer
 from .RestClient import RestClient
+from .RetryPolicy import RetryPolicy
@@ -186,6 +186,26 @@ class HttpConnectionResolver(IReferenceable, IConfigurable):
 
         return self.__compose_connection(connections, credential)
 
+    def resolve_endpoints(self, correlation_id: Optional[str]) -> List[ConfigParams]:
+        """
+        Resolves all component connections as separate endpoints, for example replicas of the same service.
+        If connections are configured to be retrieved from Discovery service it finds a IDiscovery and resolves them there.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+
+        :return: a list of resolved connections.
+        """
+        connections = self._connection_resolver.resolve_all(correlation_id) or []
+        if len(connections) == 0:
+            return [self.resolve(correlation_id)]
+
+        credential = self._credential_resolver.lookup(correlation_id)
+        result = []
+        for connection in connections:
+            self.__validate_connection(correlation_id, connection, credential)
+            result.append(self.__compose_connection([connection], credential))
+        return result
+
     def register(self, correlation_id: Optional[str]):
         """
         Registers the given connection in all referenced discovery services. This method can be used for dynamic service discovery.
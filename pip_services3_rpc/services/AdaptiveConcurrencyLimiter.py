@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.AdaptiveConcurrencyLimiter
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Concurrency limit tuned by measured latency
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import math
+from threading import Lock
+from typing import Optional
+
+from .AdmissionController import AdmissionController
+
+
+class AdaptiveConcurrencyLimiter(AdmissionController):
+    """
+    Admission controller that finds the in-flight limit of a route from its latency instead of using a fixed value.
+
+    The limiter compares a short-term average of request latency with a long-term one, that stands for
+    the latency without queueing. While the short-term latency stays within *tolerance* of the long-term one
+    the limit grows by about the square root of itself, and when requests get slower the limit is reduced
+    in proportion, down to a half at a time. Changes are smoothed over several requests.
+    The limit does not grow while the route uses less than half of it, so idle periods do not inflate it.
+
+    :class:`HttpEndpoint <pip_services3_rpc.services.HttpEndpoint.HttpEndpoint>` creates a limiter for every route
+    when *options.adaptive_concurrency* is enabled and records latency of successfully processed requests.
+
+    Example:
+
+    .. code-block:: python
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=20, max_limit=200)
+
+        if limiter.acquire():
+            in_flight = limiter.get_in_flight()
+            start = time.perf_counter()
+            try:
+                # ... process the request
+                limiter.record((time.perf_counter() - start) * 1000, in_flight)
+            finally:
+                limiter.release()
+    """
+
+    # Number of requests averaged in short-term and long-term latency
+    _short_window = 10
+    _long_window = 600
+
+    def __init__(self, initial_limit: int = 20, min_limit: int = 1, max_limit: int = 200,
+                 tolerance: float = 1.5, smoothing: float = 0.2,
+                 queue_size: int = 0, queue_timeout: int = 1000):
+        """
+        Creates a new instance of the limiter.
+
+        :param initial_limit: (optional) the in-flight limit before latency is measured (default: 20).
+        :param min_limit: (optional) the minimum in-flight limit (default: 1).
+        :param max_limit: (optional) the maximum in-flight limit (default: 200).
+        :param tolerance: (optional) the ratio of short-term to long-term latency tolerated
+                          before the limit is reduced (default: 1.5).
+        :param smoothing: (optional) the share of every limit change applied at once, from 0 to 1 (default: 0.2).
+        :param queue_size: (optional) the maximum number of requests waiting for processing (default: 0).
+        :param queue_timeout: (optional) the maximum time in milliseconds requests wait in the queue (default: 1 sec).
+        """
+        self.__min_limit = max(1, min_limit)
+        self.__max_limit = max(self.__min_limit, max_limit)
+        self.__tolerance = tolerance
+        self.__smoothing = smoothing
+        self.__limit = float(min(max(initial_limit, self.__min_limit), self.__max_limit))
+        self.__short_rtt: Optional[float] = None
+        self.__long_rtt: Optional[float] = None
+        self.__lock = Lock()
+        super(AdaptiveConcurrencyLimiter, self).__init__(int(self.__limit), queue_size, queue_timeout)
+
+    def get_rtt(self) -> Optional[float]:
+        """
+        Gets the short-term average latency.
+
+        :return: the latency in milliseconds or None if no requests were recorded.
+        """
+        return self.__short_rtt
+
+    def get_baseline_rtt(self) -> Optional[float]:
+        """
+        Gets the long-term average latency the short-term latency is compared with.
+
+        :return: the latency in milliseconds or None if no requests were recorded.
+        """
+        return self.__long_rtt
+
+    def record(self, rtt: float, in_flight: int) -> int:
+        """
+        Records latency of a processed request and adjusts the in-flight limit.
+
+        :param rtt: the time in milliseconds the request was processed, without waiting in the queue.
+        :param in_flight: the number of requests in flight when the request was admitted, including itself.
+        :return: the new in-flight limit.
+        """
+        with self.__lock:
+            if self.__short_rtt is None:
+                self.__short_rtt = self.__long_rtt = rtt
+            else:
+                self.__short_rtt += (rtt - self.__short_rtt) * 2 / (self._short_window + 1)
+                self.__long_rtt += (rtt - self.__long_rtt) * 2 / (self._long_window + 1)
+                # The baseline follows latency down faster, for instance after a slow dependency recovers
+                if self.__long_rtt > 2 * self.__short_rtt:
+                    self.__long_rtt *= 0.95
+
+            limit = self.__limit
+            gradient = max(0.5, min(1.0, self.__tolerance * self.__long_rtt / max(self.__short_rtt, 1e-6)))
+            new_limit = limit * gradient + math.sqrt(limit)
+            # Requests do not test a limit they do not reach, so it only can go down
+            if in_flight < limit / 2:
+                new_limit = min(new_limit, limit)
+            new_limit = limit * (1 - self.__smoothing) + new_limit * self.__smoothing
+            self.__limit = min(max(new_limit, self.__min_limit), self.__max_limit)
+
+            limit = int(self.__limit)
+            if limit != self.get_limit():
+                self.set_limit(limit)
+            return limit
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.AdmissionController
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Admission control of HTTP requests
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import time
+from threading import Condition
+
+
+class AdmissionController:
+    """
+    Limits the number of requests processed at the same time. Requests over the limit wait in a bounded queue
+    and are rejected when the queue is full or when they wait longer than the queue timeout,
+    so an overloaded service answers quickly instead of working on requests their callers have abandoned.
+
+    :class:`HttpEndpoint <pip_services3_rpc.services.HttpEndpoint.HttpEndpoint>` keeps one controller
+    for all requests and one for every route registered with its own limit.
+
+    Example:
+
+    .. code-block:: python
+
+        admission = AdmissionController(max_in_flight=50, queue_size=100, queue_timeout=1000)
+
+        if not admission.acquire():
+            # ... reject the request
+        try:
+            # ... process the request
+        finally:
+            admission.release()
+    """
+
+    # Interval in seconds to check for free slots while waiting on event loop
+    _poll_interval = 0.005
+
+    def __init__(self, max_in_flight: int, queue_size: int = 0, queue_timeout: int = 1000):
+        """
+        Creates a new instance of the controller.
+
+        :param max_in_flight: the maximum number of requests processed at the same time.
+        :param queue_size: (optional) the maximum number of requests waiting for processing (default: 0).
+        :param queue_timeout: (optional) the maximum time in milliseconds requests wait in the queue (default: 1 sec).
+        """
+        self.__max_in_flight = max_in_flight
+        self.__queue_size = queue_size
+        self.__queue_timeout = queue_timeout / 1000
+        self.__in_flight = 0
+        self.__waiting = 0
+        self.__condition = Condition()
+
+    def get_limit(self) -> int:
+        """
+        Gets the maximum number of requests processed at the same time.
+
+        :return: the in-flight limit.
+        """
+        return self.__max_in_flight
+
+    def set_limit(self, max_in_flight: int):
+        """
+        Changes the maximum number of requests processed at the same time.
+        Requests in flight over a lowered limit complete, but new requests are not admitted until they do.
+
+        :param max_in_flight: the new in-flight limit.
+        """
+        with self.__condition:
+            self.__max_in_flight = max_in_flight
+            self.__condition.notify_all()
+
+    def get_in_flight(self) -> int:
+        """
+        Gets the number of requests processed now.
+
+        :return: the number of admitted requests that were not released yet.
+        """
+        return self.__in_flight
+
+    def get_waiting(self) -> int:
+        """
+        Gets the number of requests waiting in the queue.
+
+        :return: the number of waiting requests.
+        """
+        return self.__waiting
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Admits a request for processing. Every admitted request shall be released by :func:`release`.
+        When the limit is reached the calling thread waits in the queue.
+
+        :param timeout: (optional) the maximum time in seconds to wait, that shortens the queue timeout.
+        :return: true if the request is admitted and false if it shall be rejected.
+        """
+        timeout = self.__get_timeout(timeout)
+        with self.__condition:
+            if self.__in_flight < self.__max_in_flight:
+                self.__in_flight += 1
+                return True
+            if self.__waiting >= self.__queue_size or timeout <= 0:
+                return False
+
+            self.__waiting += 1
+            try:
+                if not self.__condition.wait_for(lambda: self.__in_flight < self.__max_in_flight, timeout):
+                    return False
+                self.__in_flight += 1
+                return True
+            finally:
+                self.__waiting -= 1
+
+    async def acquire_async(self, timeout: float = None) -> bool:
+        """
+        Admits a request for processing without blocking the event loop.
+        Every admitted request shall be released by :func:`release`.
+
+        :param timeout: (optional) the maximum time in seconds to wait, that shortens the queue timeout.
+        :return: true if the request is admitted and false if it shall be rejected.
+        """
+        timeout = self.__get_timeout(timeout)
+        with self.__condition:
+            if self.__in_flight < self.__max_in_flight:
+                self.__in_flight += 1
+                return True
+            if self.__waiting >= self.__queue_size or timeout <= 0:
+                return False
+            self.__waiting += 1
+
+        try:
+            end_time = time.perf_counter() + timeout
+            while time.perf_counter() < end_time:
+                await asyncio.sleep(self._poll_interval)
+                with self.__condition:
+                    if self.__in_flight < self.__max_in_flight:
+                        self.__in_flight += 1
+                        return True
+            return False
+        finally:
+            with self.__condition:
+                self.__waiting -= 1
+
+    def release(self):
+        """
+        Releases an admitted request after it was processed and lets the next waiting request in.
+        """
+        with self.__condition:
+            self.__in_flight = max(0, self.__in_flight - 1)
+            self.__condition.notify()
+
+    def __get_timeout(self, timeout: float = None) -> float:
+        return self.__queue_timeout if timeout is None else min(timeout, self.__queue_timeout)
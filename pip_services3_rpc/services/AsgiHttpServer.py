@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.AsgiHttpServer
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Asynchronous ASGI web server that serves bottle applications
+    on an asyncio event loop.
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import contextvars
+import inspect
+import io
+import json
+import logging
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+import bottle
+from bottle import ServerAdapter
+from pip_services3_commons.errors import ConnectionException
+
+from .HttpResponseSender import HttpResponseSender
+
+try:
+    import uvicorn
+except ImportError:  # pragma: no cover
+    uvicorn = None
+
+
+# Marks contexts of requests served by ASGI servers
+_asgi_request = contextvars.ContextVar('asgi_request', default=False)
+_context_locals_lock = Lock()
+
+
+def _context_local_property(original: property) -> property:
+    var = contextvars.ContextVar('bottle_local')
+
+    def fget(self):
+        if not _asgi_request.get():
+            return original.fget(self)
+        try:
+            return var.get()
+        except LookupError:
+            raise RuntimeError("Request context not initialized.")
+
+    def fset(self, value):
+        if not _asgi_request.get():
+            original.fset(self, value)
+        else:
+            var.set(value)
+
+    def fdel(self):
+        if not _asgi_request.get():
+            original.fdel(self)
+        else:
+            var.set(None)
+
+    return property(fget, fset, fdel, 'Context-local property')
+
+
+def _enable_context_locals():
+    # Bottle keeps the current request and response in thread locals.
+    # Coroutine handlers share one thread, so requests served by ASGI servers keep the state
+    # in context variables that are isolated for every asyncio task.
+    # All other requests, like the ones served by threaded WSGI servers, still use the original thread locals.
+    with _context_locals_lock:
+        if getattr(bottle.LocalRequest, '_context_locals', False):
+            return
+
+        bottle.LocalRequest.environ = _context_local_property(bottle.LocalRequest.__dict__['environ'])
+        for name in ['_status_line', '_status_code', '_cookies', '_headers', 'body']:
+            setattr(bottle.LocalResponse, name, _context_local_property(bottle.LocalResponse.__dict__[name]))
+        bottle.LocalRequest._context_locals = True
+
+
+class AsgiHttpServer(ServerAdapter):
+    """
+    Server adapter that runs a bottle application on the uvicorn ASGI server.
+
+    Routes with coroutine handlers are executed directly on the event loop, so handlers
+    waiting on I/O do not occupy threads. Routes with regular handlers are executed
+    in a thread pool the same way as in a threaded WSGI server.
+
+    Request bodies larger than *request_max_size* bytes are rejected with 413 status before they are read.
+
+    For requests served by this adapter bottle's request and response are kept in context variables instead
+    of thread locals, so each coroutine handler sees its own request. Bottle applications served by other
+    servers in the same process keep using thread locals.
+
+    The adapter requires the optional *uvicorn* package (pip install pip_services3_rpc[asgi]).
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, threads: int = 10, **options):
+        self.__threads = threads
+        self.__backlog = options.pop('backlog', 2048)
+        self.__keepalive_timeout = options.pop('keepalive_timeout', 5)
+        self.__request_max_size = options.pop('request_max_size', bottle.BaseRequest.MEMFILE_MAX)
+        self.__finished = False
+        super(AsgiHttpServer, self).__init__(host, port, **options)
+        self.__app: Optional[bottle.Bottle] = None
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__server: Any = None
+
+    def run(self, handler: bottle.Bottle):
+        if uvicorn is None:
+            raise ImportError('ASGI server mode requires uvicorn package to be installed')
+
+        self.__finished = False
+        self.__app = handler
+        self.__executor = ThreadPoolExecutor(max_workers=self.__threads)
+
+        certfile = self.options.pop('certfile', None)
+        keyfile = self.options.pop('keyfile', None)
+        reuse_port = self.options.pop('reuse_port', False)
+
+        config = uvicorn.Config(self.__asgi, host=self.host, port=self.port,
+                                ssl_certfile=certfile if certfile and keyfile else None,
+                                ssl_keyfile=keyfile if certfile and keyfile else None,
+                                backlog=self.__backlog, timeout_keep_alive=self.__keepalive_timeout,
+                                interface='asgi3', lifespan='off', access_log=False, log_level='warning')
+        self.__server = uvicorn.Server(config)
+
+        _enable_context_locals()
+        try:
+            if reuse_port:
+                # Lets several worker processes listen on the same port, the kernel balances connections between them
+                sock = socket.create_server((self.host, self.port), reuse_port=True)
+                self.__server.run(sockets=[sock])
+            else:
+                self.__server.run()
+        except Exception as e:
+            logging.critical(e, exc_info=True)
+        finally:
+            self.__executor.shutdown(wait=False)
+            self.__finished = True
+
+    def wait_started(self, timeout: float = 5):
+        """
+        Waits until the server starts accepting connections.
+
+        :param timeout: maximum time to wait in seconds.
+        :raises: ConnectionException when the server failed to start or did not start in time.
+        """
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline and not self.__finished:
+            server = self.__server
+            if server is not None and server.started:
+                return
+            time.sleep(0.01)
+
+        raise ConnectionException(None, 'CANNOT_START', 'ASGI server failed to start') \
+            .with_details('host', self.host).with_details('port', self.port)
+
+    def shutdown(self):
+        if self.__server:
+            self.__server.should_exit = True
+            self.__server = None
+
+    async def __asgi(self, scope: dict, receive, send):
+        if scope['type'] != 'http':
+            return
+
+        _asgi_request.set(True)
+
+        body = await self.__receive_body(scope, receive)
+        if body is None:
+            await self.__send_too_large(send)
+            return
+
+        environ = self.__create_environ(scope, bytes(body))
+        route, args = self.__match(environ)
+
+        if route is not None and inspect.iscoroutinefunction(route.callback):
+            status, headers, content = await self.__handle_async(environ, route, args)
+            context = contextvars.copy_context()
+        else:
+            context = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            status, headers, content = await loop.run_in_executor(self.__executor, context.run,
+                                                                  self.__handle_sync, environ)
+
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin1'), str(value).encode('latin1')) for name, value in headers]
+        })
+        if isinstance(content, bytes):
+            await send({'type': 'http.response.body', 'body': content})
+        else:
+            await self.__send_stream(send, content, context)
+
+    async def __send_stream(self, send, content: Iterable[bytes], context: contextvars.Context):
+        # Streamed bodies are produced in the thread pool chunk by chunk within the request context
+        # and sent as soon as they are ready, so the server uses chunked transfer encoding
+        loop = asyncio.get_running_loop()
+        iterator = iter(content)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(self.__executor, context.run, next, iterator, None)
+                if chunk is None:
+                    break
+                if len(chunk) > 0:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(content, 'close'):
+                context.run(content.close)
+
+    async def __receive_body(self, scope: dict, receive) -> Optional[bytes]:
+        max_size = self.__request_max_size
+        for name, value in scope.get('headers', []):
+            if name == b'content-length' and max_size is not None and int(value) > max_size:
+                return None
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            if max_size is not None and len(body) > max_size:
+                return None
+            more_body = message.get('more_body', False)
+        return bytes(body)
+
+    @staticmethod
+    async def __send_too_large(send):
+        content = json.dumps({
+            'type': None, 'category': 'BadRequest', 'status': 413, 'code': 'REQUEST_TOO_LARGE',
+            'message': 'Request entity is too large', 'details': None, 'correlation_id': None,
+            'cause': None, 'stack_trace': None
+        }).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': 413,
+            'headers': [(b'content-type', b'application/json'), (b'connection', b'close')]
+        })
+        await send({'type': 'http.response.body', 'body': content})
+
+    def __create_environ(self, scope: dict, body: bytes) -> dict:
+        server = scope.get('server') or (self.host, self.port)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+            'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+            'SERVER_NAME': str(server[0]),
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+            'REMOTE_ADDR': client[0],
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin1')
+            value = value.decode('latin1')
+            if name == 'content-type':
+                environ['CONTENT_TYPE'] = value
+            elif name != 'content-length':
+                key = 'HTTP_' + name.upper().replace('-', '_')
+                environ[key] = environ[key] + ',' + value if key in environ else value
+
+        return environ
+
+    def __match(self, environ: dict) -> Tuple[Any, dict]:
+        try:
+            path = environ['PATH_INFO'].encode('latin1').decode('utf8')
+            return self.__app.router.match(dict(environ, PATH_INFO=path))
+        except (bottle.HTTPError, UnicodeError):
+            # Let the regular pipeline respond with the error
+            return None, {}
+
+    def __handle_sync(self, environ: dict) -> Tuple[str, List[tuple], Union[bytes, Iterable[bytes]]]:
+        result = {}
+
+        def start_response(status, headers, exc_info=None):
+            result['status'] = status
+            result['headers'] = headers
+
+        out = self.__app(environ, start_response)
+        if not isinstance(out, (list, tuple)):
+            # Generators returned by handlers are streamed
+            return result['status'], result['headers'], out
+        try:
+            content = b''.join(out)
+        finally:
+            if hasattr(out, 'close'):
+                out.close()
+
+        return result['status'], result['headers'], content
+
+    async def __handle_async(self, environ: dict, route: Any,
+                             args: dict) -> Tuple[str, List[tuple], Union[bytes, Iterable[bytes]]]:
+        app = self.__app
+        request = bottle.request
+        response = bottle.response
+
+        environ['bottle.app'] = app
+        environ['bottle.raw_path'] = environ['PATH_INFO']
+        environ['PATH_INFO'] = environ['PATH_INFO'].encode('latin1').decode('utf8')
+        request.bind(environ)
+        response.bind()
+
+        try:
+            try:
+                app.trigger_hook('before_request')
+                environ['route.handle'] = route
+                environ['bottle.route'] = route
+                environ['route.url_args'] = args
+                # Plugins wrap coroutine handlers like regular ones and pass the coroutine through
+                out = route.call(**args)
+                if inspect.isawaitable(out):
+                    out = await out
+                if isinstance(out, dict):
+                    out = self.__dumps_json(app, out)
+                    response.content_type = 'application/json'
+            finally:
+                app.trigger_hook('after_request')
+        except bottle.HTTPResponse as ex:
+            out = ex
+        except Exception as ex:
+            out = HttpResponseSender.send_error(ex)
+
+        # Bottle has no public method to convert handler results into response body
+        out = app._cast(out)
+        if not isinstance(out, (list, tuple)) and response.status_code not in (100, 101, 204, 304) \
+                and environ['REQUEST_METHOD'] != 'HEAD':
+            # Generators returned by handlers are streamed
+            return response.status_line, response.headerlist, out
+        try:
+            if response.status_code in (100, 101, 204, 304) or environ['REQUEST_METHOD'] == 'HEAD':
+                content = b''
+            else:
+                content = b''.join(out)
+        finally:
+            if hasattr(out, 'close'):
+                out.close()
+
+        return response.status_line, response.headerlist, content
+
+    @staticmethod
+    def __dumps_json(app: bottle.Bottle, value: dict) -> str:
+        # Serializes results the same way as the JSON plugin installed in the application
+        for plugin in app.plugins:
+            if isinstance(plugin, bottle.JSONPlugin) and plugin.json_dumps:
+                return plugin.json_dumps(value)
+        return bottle.json_dumps(value)
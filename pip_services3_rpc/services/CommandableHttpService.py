@@ -8,10 +8,16 @@
     :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
     :license: MIT, see LICENSE for more details.
 """
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Optional, Any, List
 
+import bottle
 from pip_services3_commons.commands import ICommandable, CommandSet, ICommand
 from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.convert import BooleanConverter
+from pip_services3_commons.errors import BadRequestException, ErrorDescriptionFactory
+from pip_services3_commons.refer import IReferences
 from pip_services3_commons.run import Parameters
 
 from .CommandableSwaggerDocument import CommandableSwaggerDocument
@@ -22,6 +28,12 @@ class CommandableHttpService(RestService):
     """
     Abstract service that receives remove calls via HTTP/REST protocol to operations automatically generated for commands defined in ICommandable components. Each command is exposed as POST operation that receives all parameters in body object. Commandable services require only 3 lines of code to implement a robust external HTTP-based remote interface.
 
+    When batches are enabled, the service also exposes POST "batch" operation that receives an array
+    of *{"command": name, "args": params}* entries and executes them in one call. It returns an array
+    with *{"result": result}* or *{"error": ErrorDescription}* entries in the same order.
+    Entries are executed one after another or, when *parallel* query parameter or *batch.parallel* option is true,
+    concurrently in a thread pool.
+
     ### Configuration parameters ###
         - base_route:              base route for remote URI
         - dependencies:
@@ -33,6 +45,11 @@ class CommandableHttpService(RestService):
             - host:                  host name or IP address
             - port:                  port number
             - uri:                   resource URI or connection string with all parameters in it
+        - batch:
+            - enabled:               true to expose "batch" operation (default: false)
+            - parallel:              true to execute batch entries concurrently by default (default: false)
+            - max_size:              maximum number of entries in a batch (default: 100)
+            - max_threads:           maximum number of threads that execute concurrent entries (default: 10)
 
     ### References ###
         - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
@@ -69,6 +86,12 @@ class CommandableHttpService(RestService):
         super(CommandableHttpService, self).__init__()
         self._command_set: CommandSet = None
         self._swagger_auto: bool = True
+        self._batch_enabled: bool = False
+        self._batch_parallel: bool = False
+        self._batch_max_size: int = 100
+        self._batch_max_threads: int = 10
+        self.__batch_executor: Optional[ThreadPoolExecutor] = None
+        self.__batch_lock = Lock()
 
         self._base_route = base_route
         self._dependency_resolver.put('controller', 'none')
@@ -82,6 +105,54 @@ class CommandableHttpService(RestService):
         super().configure(config)
 
         self._swagger_auto = config.get_as_boolean_with_default('swagger.auto', self._swagger_auto)
+        self._batch_enabled = config.get_as_boolean_with_default('batch.enabled', self._batch_enabled)
+        self._batch_parallel = config.get_as_boolean_with_default('batch.parallel', self._batch_parallel)
+        self._batch_max_size = config.get_as_integer_with_default('batch.max_size', self._batch_max_size)
+        self._batch_max_threads = config.get_as_integer_with_default('batch.max_threads', self._batch_max_threads)
+
+    def set_references(self, references: IReferences):
+        """
+        Sets references to dependent components.
+
+        :param references: references to locate the component dependencies.
+        """
+        super().set_references(references)
+        # The command set is taken from the new controller
+        self._command_set = None
+
+    def close(self, correlation_id: Optional[str]):
+        """
+        Closes component and frees used resources.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        """
+        super().close(correlation_id)
+
+        with self.__batch_lock:
+            if self.__batch_executor is not None:
+                self.__batch_executor.shutdown(wait=False)
+                self.__batch_executor = None
+
+    def get_command_set(self) -> CommandSet:
+        """
+        Gets the command set of the controller exposed by this service.
+
+        :return: the controller command set.
+        """
+        if self._command_set is None:
+            controller = self._dependency_resolver.get_one_required('controller')
+            if not isinstance(controller, ICommandable):
+                raise Exception("Controller has to implement ICommandable interface")
+            self._command_set = controller.get_command_set()
+        return self._command_set
+
+    def get_base_route(self) -> Optional[str]:
+        """
+        Gets the base route of the service.
+
+        :return: the service base route.
+        """
+        return self._base_route
 
     def __get_handler(self, command: ICommand) -> Callable:
         def handler():
@@ -97,15 +168,57 @@ class CommandableHttpService(RestService):
 
         return handler
 
+    def __get_batch_executor(self) -> ThreadPoolExecutor:
+        with self.__batch_lock:
+            if self.__batch_executor is None:
+                self.__batch_executor = ThreadPoolExecutor(max_workers=self._batch_max_threads)
+            return self.__batch_executor
+
+    def __execute_batch_entry(self, correlation_id: Optional[str], entry: Any) -> dict:
+        try:
+            if not isinstance(entry, dict) or not isinstance(entry.get('command'), str):
+                raise BadRequestException(correlation_id, 'INVALID_BATCH_ENTRY',
+                                          'Batch entry must contain command name')
+            name = entry['command']
+            timing = self._instrument(correlation_id, self._base_route + '.' + name)
+            try:
+                result = self._command_set.execute(correlation_id, name, Parameters.from_value(entry.get('args')))
+                return {'result': result}
+            except Exception as err:
+                timing.end_failure(err)
+                raise err
+            finally:
+                timing.end_timing()
+        except Exception as err:
+            return {'error': ErrorDescriptionFactory.create(err)}
+
+    def __execute_batch(self) -> List[dict]:
+        correlation_id = self._get_correlation_id()
+        entries = self._get_data()
+        if not isinstance(entries, list):
+            raise BadRequestException(correlation_id, 'INVALID_BATCH',
+                                      'Batch must be an array of commands')
+        if len(entries) > self._batch_max_size:
+            raise BadRequestException(correlation_id, 'BATCH_TOO_LARGE',
+                                      'Batch must contain at most ' + str(self._batch_max_size) + ' commands') \
+                .with_details('size', len(entries)).with_details('max_size', self._batch_max_size)
+
+        parallel = BooleanConverter.to_boolean_with_default(bottle.request.query.get('parallel'),
+                                                            self._batch_parallel)
+        if parallel and len(entries) > 1:
+            executor = self.__get_batch_executor()
+            futures = [executor.submit(self.__execute_batch_entry, correlation_id, entry) for entry in entries]
+            results = [future.result() for future in futures]
+        else:
+            results = [self.__execute_batch_entry(correlation_id, entry) for entry in entries]
+
+        return self.send_result(results)
+
     def register(self):
         """
         Registers all service routes in HTTP endpoint.
         """
-        controller = self._dependency_resolver.get_one_required('controller')
-        if not isinstance(controller, ICommandable):
-            raise Exception("Controller has to implement ICommandable interface")
-        self._command_set = controller.get_command_set()
-        commands = self._command_set.get_commands()
+        commands = self.get_command_set().get_commands()
         for command in commands:
             route = self.fix_route(command.get_name())
             # if route[0] != '/':
@@ -113,6 +226,9 @@ class CommandableHttpService(RestService):
 
             self.register_route('POST', route, None, self.__get_handler(command))
 
+        if self._batch_enabled:
+            self.register_route('POST', '/batch', None, self.__execute_batch)
+
         if self._swagger_auto:
             swagger_config = self._config.get_section('swagger')
 
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.HttpCompressor
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compression of HTTP responses negotiated with clients
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import functools
+import gzip
+import inspect
+import zlib
+from typing import Any, Callable, List, Optional
+
+import bottle
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+class HttpCompressor:
+    """
+    Bottle plugin that compresses response bodies with one of the encodings accepted by the client
+    in *Accept-Encoding* header: brotli (when the optional *brotli* package is installed), gzip or deflate.
+
+    Only bodies of allowed content types and at least *min_size* bytes long are compressed.
+    Responses that already have *Content-Encoding* or *Content-Range*, forbid transformations with
+    *Cache-Control: no-transform*, or are returned as files and streams are sent unchanged.
+
+    Example:
+
+    .. code-block:: python
+
+        app = bottle.Bottle()
+        app.install(HttpCompressor(min_size=1024, level=6))
+    """
+
+    name = 'compressor'
+    api = 2
+
+    DEFAULT_MIME_TYPES = ['application/json', 'application/javascript', 'application/xml', 'text/*']
+
+    def __init__(self, min_size: int = 1024, level: int = 6, mime_types: List[str] = None):
+        """
+        Creates a new instance of the compressor.
+
+        :param min_size: the minimum size of response body in bytes to be compressed.
+        :param level: the compression level from 1 (fastest) to 9 (smallest).
+        :param mime_types: the allowed content types, that may end with "/*" to allow all subtypes.
+        """
+        self.__min_size = min_size
+        self.__level = min(max(level, 1), 9)
+        self.__mime_types = [t.strip().lower() for t in (mime_types or self.DEFAULT_MIME_TYPES) if t.strip() != '']
+
+    @staticmethod
+    def get_supported_encodings() -> List[str]:
+        """
+        Gets encodings supported on this platform in the order of preference.
+
+        :return: a list of encoding names.
+        """
+        encodings = ['gzip', 'deflate']
+        if brotli is not None:
+            encodings.insert(0, 'br')
+        return encodings
+
+    def apply(self, callback: Callable, route: bottle.Route) -> Callable:
+        @functools.wraps(callback)
+        def wrapper(*args, **kwargs):
+            result = callback(*args, **kwargs)
+            if inspect.isawaitable(result):
+                # Coroutine handlers served on event loop are compressed when they complete
+                return self.__compress_later(result, route.app)
+            return self.compress(result, route.app)
+
+        return wrapper
+
+    async def __compress_later(self, result: Any, app: bottle.Bottle) -> Any:
+        return self.compress(await result, app)
+
+    def compress(self, body: Any, app: bottle.Bottle = None) -> Any:
+        """
+        Compresses the response body for the current request when it is allowed.
+
+        :param body: the response body returned by route handler.
+        :param app: (optional) the application to serialize dictionary results.
+        :return: the compressed body or the original body when it is not compressed.
+        """
+        response = bottle.response
+
+        if isinstance(body, dict):
+            body = self.__dumps_json(app, body)
+            response.content_type = 'application/json'
+
+        if not isinstance(body, (str, bytes)) or not self.__is_allowed_type(response.content_type):
+            return body
+
+        self.__add_vary(response)
+
+        if bottle.request.method == 'HEAD' or response.status_code < 200 \
+                or response.status_code in (204, 206, 304) \
+                or 'Content-Encoding' in response.headers or 'Content-Range' in response.headers \
+                or 'no-transform' in response.headers.get('Cache-Control', ''):
+            return body
+
+        if isinstance(body, str):
+            body = body.encode(response.charset or 'utf8')
+        if len(body) < self.__min_size:
+            return body
+
+        encoding = self.__choose_encoding(bottle.request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return body
+
+        response.headers['Content-Encoding'] = encoding
+        etag = response.headers.get('ETag')
+        if etag is not None and etag.endswith('"') and not etag.startswith('W/'):
+            # Strong validators have to differ for every representation of the resource
+            response.headers['ETag'] = etag[:-1] + '-' + encoding + '"'
+        return self.__encode(encoding, body)
+
+    def __is_allowed_type(self, content_type: Optional[str]) -> bool:
+        mime_type = (content_type or 'text/html').split(';', 1)[0].strip().lower()
+        for allowed in self.__mime_types:
+            if allowed == mime_type or (allowed.endswith('/*') and mime_type.startswith(allowed[:-1])):
+                return True
+        return False
+
+    @staticmethod
+    def __add_vary(response: bottle.BaseResponse):
+        vary = response.headers.get('Vary')
+        if vary is None or vary == '':
+            response.headers['Vary'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower() and vary.strip() != '*':
+            response.headers['Vary'] = vary + ', Accept-Encoding'
+
+    def __choose_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        if accept_encoding is None or accept_encoding == '':
+            return None
+
+        weights = {}
+        for item in accept_encoding.split(','):
+            parts = item.strip().lower().split(';')
+            weight = 1.0
+            for param in parts[1:]:
+                param = param.strip()
+                if param.startswith('q='):
+                    try:
+                        weight = float(param[2:])
+                    except ValueError:
+                        weight = 0.0
+            weights[parts[0].strip()] = weight
+
+        best = None
+        best_weight = 0.0
+        for encoding in self.get_supported_encodings():
+            weight = weights.get(encoding, weights.get('*', 0.0))
+            # Encodings with the same weight are chosen in the order of preference
+            if weight > best_weight:
+                best = encoding
+                best_weight = weight
+        return best
+
+    def __encode(self, encoding: str, body: bytes) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.__level)
+        if encoding == 'gzip':
+            return gzip.compress(body, compresslevel=self.__level, mtime=0)
+        return zlib.compress(body, self.__level)
+
+    @staticmethod
+    def __dumps_json(app: Optional[bottle.Bottle], value: dict) -> str:
+        # Serializes results the same way as the JSON plugin installed in the application
+        for plugin in app.plugins if app is not None else []:
+            if isinstance(plugin, bottle.JSONPlugin) and plugin.json_dumps:
+                return plugin.json_dumps(value)
+        return bottle.json_dumps(value)
@@ -8,25 +8,37 @@
     :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
     :license: MIT, see LICENSE for more details.
 """
-import json
+import asyncio
+import inspect
 import re
+import threading
 import time
 from threading import Thread
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple, Dict
 
 import bottle
 from beaker.middleware import SessionMiddleware
 from bottle import request, response
 from pip_services3_commons.config import IConfigurable, ConfigParams
-from pip_services3_commons.errors import ConnectionException, ConfigException
-from pip_services3_commons.refer import IReferenceable, IReferences
+from pip_services3_commons.errors import ConnectionException, ConfigException, InvocationException
+from pip_services3_commons.refer import IReferenceable, IReferences, Descriptor
 from pip_services3_commons.run import IOpenable
 from pip_services3_commons.validate import Schema
-from pip_services3_components.count import CompositeCounters
+from pip_services3_components.count import CompositeCounters, CachedCounters
 from pip_services3_components.log import CompositeLogger
 
 from . import IRegisterable
+from .AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+from .AdmissionController import AdmissionController
+from .AsgiHttpServer import AsgiHttpServer
+from .HttpCompressor import HttpCompressor
+from .HttpRequestBody import HttpRequestBody
+from .HttpRequestDeadline import HttpRequestDeadline
+from .HttpResponseCache import HttpResponseCache
 from .HttpResponseSender import HttpResponseSender
+from .JsonCodec import JsonCodec
+from .PreforkServer import PreforkServer
+from .SchemaValidator import SchemaValidator
 from .SSLCherryPyServer import SSLCherryPyServer
 from ..connect.HttpConnectionResolver import HttpConnectionResolver
 
@@ -53,8 +65,63 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
             - "credential.ssl_crt_file" - the SSL certificate in PEM
             - "credential.ssl_ca_file" - the certificate authorities (root cerfiticates) in PEM
 
+        - options:
+            - "options.server_mode" - the server to run: "wsgi" for threaded cheroot server (default)
+              or "asgi" for asyncio uvicorn server that executes coroutine handlers on the event loop
+            - "options.workers" - the number of worker processes that share the port (default: 1).
+              When it is greater than 1 the endpoint forks workers and supervises them (requires fork and SO_REUSEPORT)
+            - "options.threads" - the number of threads that process requests (default: 10)
+            - "options.max_threads" - the maximum number of threads the pool can grow to,
+              when all threads are busy and requests wait in the queue (default: same as threads).
+              The pool is resized by a background check, so growing is best-effort and applies only to wsgi mode
+            - "options.backlog" - the maximum number of pending connections in the listen queue
+              (default: 5 in wsgi mode and 2048 in asgi mode)
+            - "options.keepalive_timeout" - the timeout in milliseconds to keep idle connections open (default: 10 sec)
+            - "options.shutdown_timeout" - the timeout in milliseconds to finish requests on shutdown (default: 5 sec)
+            - "options.accepted_queue_size" - the maximum number of accepted connections waiting for a thread,
+              -1 for unlimited (default: -1)
+            - "options.accepted_queue_timeout" - the timeout in milliseconds to put accepted connection
+              into the full queue (default: 10 sec)
+            - "options.compression_enabled" - compresses responses with encodings accepted by clients (default: false)
+            - "options.compression_min_size" - the minimum size of response body in bytes to be compressed (default: 1024)
+            - "options.compression_level" - the compression level from 1 (fastest) to 9 (smallest) (default: 6)
+            - "options.compression_types" - a comma-separated list of compressed content types
+              (default: application/json,application/javascript,application/xml,text/*)
+            - "options.json_codec" - the codec to encode and decode JSON: "json" for the standard json module (default)
+              or "orjson" for C-accelerated orjson package
+            - "options.max_in_flight" - the maximum number of requests processed at the same time, 0 for unlimited (default: 0).
+              Routes can have their own limits set in :func:`register_route`
+            - "options.admission_queue_size" - the maximum number of requests waiting for processing
+              when the limit is reached (default: 100)
+            - "options.admission_queue_timeout" - the maximum time in milliseconds requests wait in the queue,
+              shortened by the request deadline (default: 1 sec)
+            - "options.admission_retry_after" - the time in seconds sent in *Retry-After* header
+              of rejected requests (default: 1)
+            - "options.adaptive_concurrency" - tunes in-flight limits of every route by measured latency
+              with :class:`AdaptiveConcurrencyLimiter <pip_services3_rpc.services.AdaptiveConcurrencyLimiter.AdaptiveConcurrencyLimiter>`
+              (default: false). Route limits set in :func:`register_route` become the maximum limits
+            - "options.adaptive_initial_limit" - the in-flight limit of routes before latency is measured (default: 20)
+            - "options.adaptive_min_limit" - the minimum in-flight limit of routes (default: 1)
+            - "options.adaptive_max_limit" - the maximum in-flight limit of routes (default: 200)
+            - "options.adaptive_tolerance" - the ratio of recent to baseline latency tolerated
+              before limits are reduced (default: 1.5)
+
+        Requests with *X-Request-Timeout* header sent by REST clients are rejected with 504 status when no time
+        is left to process them and counted by *http_endpoint.deadline_exceeded_count* counter. Otherwise the deadline is available to handlers and nested REST clients
+        through :class:`HttpRequestDeadline <pip_services3_rpc.services.HttpRequestDeadline.HttpRequestDeadline>`.
+
+        Requests over the in-flight limits that do not fit into the queue or wait longer than the queue timeout
+        are rejected before processing with 503 status and *Retry-After* header. Rejected requests are counted
+        by *http_endpoint.shed_count* counter and the time admitted requests waited is reported
+        by *http_endpoint.queue_wait_time* counter. In maintenance mode requests are rejected the same way
+        without calling handlers. Adaptive limits of routes are reported by *http_endpoint.<method>.<route>.concurrency_limit*
+        and *http_endpoint.<method>.<route>.rtt* counters, where the route has dots instead of slashes.
 
     ### References ###
+        In wsgi mode the endpoint reports *http_endpoint.thread_count*, *http_endpoint.busy_threads*
+        and *http_endpoint.queue_length* counters about occupancy of the thread pool.
+        In prefork mode every worker reports its own pool and the values are combined by the parent process.
+
         A logger, counters, and a connection resolver can be referenced by passing the following references to the object's :func:`set_references` method:
             - `*:logger:*:*:1.0`           (optional) :class:`ILogger <pip_services3_components.log.ILogger.ILogger>` components to pass log messages
             - `*:counters:*:*:1.0`         (optional) :class:`ICounters <pip_services3_components.count.ICounters.ICounters>` components to pass collected measurements
@@ -84,10 +151,31 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
                                                "options.maintenance_enabled", False,
                                                "options.request_max_size", 1024 * 1024,
                                                "options.file_max_size", 200 * 1024 * 1024,
+                                               "options.server_mode", "wsgi",
+                                               "options.workers", 1,
+                                               "options.threads", 10,
+                                               "options.keepalive_timeout", 10000,
+                                               "options.shutdown_timeout", 5000,
+                                               "options.accepted_queue_size", -1,
+                                               "options.accepted_queue_timeout", 10000,
+                                               "options.compression_enabled", False,
+                                               "options.compression_min_size", 1024,
+                                               "options.compression_level", 6,
+                                               "options.json_codec", "json",
+                                               "options.max_in_flight", 0,
+                                               "options.admission_queue_size", 100,
+                                               "options.admission_queue_timeout", 1000,
+                                               "options.admission_retry_after", 1,
+                                               "options.adaptive_concurrency", False,
+                                               "options.adaptive_initial_limit", 20,
+                                               "options.adaptive_min_limit", 1,
+                                               "options.adaptive_max_limit", 200,
+                                               "options.adaptive_tolerance", 1.5,
                                                "connection.connect_timeout", 60000,
                                                "connection.debug", True)
 
     _debug = False
+    _pool_stats_interval = 1
 
     def __init__(self):
         """
@@ -98,7 +186,34 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
         self.__maintenance_enabled: bool = False
         self.__file_max_size = 200 * 1024 * 1024
         self.__protocol_upgrade_enabled: bool = False
+        self.__server_mode: str = 'wsgi'
+        self.__workers: int = 1
+        self.__threads: int = 10
+        self.__max_threads: int = -1
+        self.__backlog: Optional[int] = None
+        self.__keepalive_timeout: int = 10000
+        self.__shutdown_timeout: int = 5000
+        self.__accepted_queue_size: int = -1
+        self.__accepted_queue_timeout: int = 10000
+        self.__compression_enabled: bool = False
+        self.__compression_min_size: int = 1024
+        self.__compression_level: int = 6
+        self.__compression_types: List[str] = HttpCompressor.DEFAULT_MIME_TYPES
+        self.__codec: JsonCodec = JsonCodec()
+        self.__admission: Optional[AdmissionController] = None
+        self.__admission_queue_size: int = 100
+        self.__admission_queue_timeout: int = 1000
+        self.__admission_retry_after: int = 1
+        self.__adaptive_concurrency: bool = False
+        self.__adaptive_initial_limit: int = 20
+        self.__adaptive_min_limit: int = 1
+        self.__adaptive_max_limit: int = 200
+        self.__adaptive_tolerance: float = 1.5
+        self.__references: IReferences = None
         self.__uri: str = None
+        self.__event_loops = threading.local()
+        self.__created_loops: List[asyncio.AbstractEventLoop] = []
+        self.__loops_lock = threading.Lock()
 
         self.__connection_resolver: HttpConnectionResolver = HttpConnectionResolver()
         self.__logger: CompositeLogger = CompositeLogger()
@@ -106,6 +221,10 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
         self.__registrations: List[IRegisterable] = []
         self.__allowed_headers: List[str] = ["correlation_id"]
         self.__allowed_origins: List[str] = []
+        # Interceptors are kept in a tree of route segments, every node holds ordered actions and child nodes
+        self.__interceptors: Tuple[List[Tuple[int, Callable]], Dict[str, tuple]] = ([], {})
+        self.__interceptors_count = 0
+        self.__interceptor_patterns: List[Tuple[int, re.Pattern, Callable]] = []
 
     def configure(self, config: ConfigParams):
         """
@@ -129,6 +248,39 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
         self.__protocol_upgrade_enabled = config.get_as_boolean_with_default('options.protocol_upgrade_enabled',
                                                                              self.__protocol_upgrade_enabled)
         self._debug = config.get_as_boolean_with_default('options.debug', self._debug)
+        self.__server_mode = config.get_as_string_with_default('options.server_mode', self.__server_mode).lower()
+        self.__workers = config.get_as_integer_with_default('options.workers', self.__workers)
+        self.__threads = config.get_as_integer_with_default('options.threads', self.__threads)
+        self.__max_threads = config.get_as_integer_with_default('options.max_threads', self.__threads)
+        self.__backlog = config.get_as_nullable_integer('options.backlog') or self.__backlog
+        self.__keepalive_timeout = config.get_as_integer_with_default('options.keepalive_timeout',
+                                                                      self.__keepalive_timeout)
+        self.__shutdown_timeout = config.get_as_integer_with_default('options.shutdown_timeout',
+                                                                     self.__shutdown_timeout)
+        self.__accepted_queue_size = config.get_as_integer_with_default('options.accepted_queue_size',
+                                                                        self.__accepted_queue_size)
+        self.__accepted_queue_timeout = config.get_as_integer_with_default('options.accepted_queue_timeout',
+                                                                           self.__accepted_queue_timeout)
+        self.__compression_enabled = config.get_as_boolean_with_default('options.compression_enabled',
+                                                                        self.__compression_enabled)
+        self.__compression_min_size = config.get_as_integer_with_default('options.compression_min_size',
+                                                                         self.__compression_min_size)
+        self.__compression_level = config.get_as_integer_with_default('options.compression_level',
+                                                                      self.__compression_level)
+        compression_types = config.get_as_nullable_string('options.compression_types')
+        if compression_types is not None:
+            self.__compression_types = [t.strip() for t in compression_types.split(',') if t.strip() != '']
+        self.__codec = JsonCodec.create(config.get_as_string('options.json_codec'))
+        self.__admission_queue_size = config.get_as_integer('options.admission_queue_size')
+        self.__admission_queue_timeout = config.get_as_integer('options.admission_queue_timeout')
+        self.__admission_retry_after = config.get_as_integer('options.admission_retry_after')
+        self.__adaptive_concurrency = config.get_as_boolean('options.adaptive_concurrency')
+        self.__adaptive_initial_limit = config.get_as_integer('options.adaptive_initial_limit')
+        self.__adaptive_min_limit = config.get_as_integer('options.adaptive_min_limit')
+        self.__adaptive_max_limit = config.get_as_integer('options.adaptive_max_limit')
+        self.__adaptive_tolerance = config.get_as_float('options.adaptive_tolerance')
+        max_in_flight = config.get_as_integer('options.max_in_flight')
+        self.__admission = self.__create_admission(max_in_flight) if max_in_flight > 0 else None
 
         headers = config.get_as_string_with_default("cors_headers", "").split(",")
         for header in headers:
@@ -153,6 +305,7 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
 
         :param references: an IReferences object, containing references to a logger, counters, and a connection resolver.
         """
+        self.__references = references
         self.__logger.set_references(references)
         self.__counters.set_references(references)
         self.__connection_resolver.set_references(references)
@@ -193,6 +346,7 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
 
         self.__service.config['catchall'] = True
         self.__service.config['autojson'] = True
+        self.__codec.install(self.__service)
 
         # Enable CORS requests
         self.__service.add_hook('after_request', self.__enable_cors)
@@ -201,6 +355,16 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
         self.__service.add_hook('after_request', self.__no_cache)
         self.__service.add_hook('before_request', self.__add_compatibility)
 
+        # Interceptors are registered again with the new application
+        self.__interceptors = ([], {})
+        self.__interceptors_count = 0
+        self.__interceptor_patterns = []
+        self.__service.add_hook('before_request', self.__intercept)
+
+        if self.__compression_enabled:
+            self.__service.install(HttpCompressor(self.__compression_min_size, self.__compression_level,
+                                                  self.__compression_types))
+
         # Register routes
         # self.__perform_registrations()
 
@@ -211,25 +375,76 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
 
         host = connection.get_as_string('host')
         port = connection.get_as_integer('port')
+        prefork = self.__workers > 1
+        if prefork and not PreforkServer.is_supported():
+            self.__logger.warn(correlation_id, "Prefork mode is not supported on this platform, "
+                                               "starting REST service in a single process")
+            prefork = False
+
         # Starting service
         try:
-            self.__server = SSLCherryPyServer(host=host, port=port, certfile=certfile, keyfile=keyfile)
+            if prefork:
+                # Workers get a copy of the application, so routes are registered before they are forked
+                self.__perform_registrations()
+                self.__server = PreforkServer(host=host, port=port, workers=self.__workers,
+                                              create_server=lambda: self.__create_server(host, port, certfile,
+                                                                                         keyfile, True),
+                                              counters=self.__get_cached_counters(), logger=self.__logger)
+                # Processes are forked by the opening thread before server threads are started
+                self.__server.start(self.__service)
+            else:
+                self.__server = self.__create_server(host, port, certfile, keyfile, False)
 
             # Start server in thread
             Thread(target=start_server, daemon=True).start()
             # Time for start server
             time.sleep(0.01)
+            if isinstance(self.__server, AsgiHttpServer):
+                self.__server.wait_started()
 
             # Give 2 sec for initialization
             self.__connection_resolver.register(correlation_id)
             self.__logger.debug(correlation_id, f"Opened REST service at {self.__uri}", )
-            self.__perform_registrations()
+            if not prefork:
+                self.__perform_registrations()
         except Exception as ex:
+            if self.__server is not None:
+                self.__server.shutdown()
             self.__server = None
 
             raise ConnectionException(correlation_id, 'CANNOT_CONNECT', 'Opening REST service failed') \
                 .wrap(ex).with_details('url', self.__uri)
 
+    def __create_server(self, host: str, port: int, certfile: Optional[str], keyfile: Optional[str],
+                        reuse_port: bool) -> bottle.ServerAdapter:
+        options = {}
+        if self.__backlog is not None:
+            options['backlog'] = self.__backlog
+
+        if self.__server_mode == 'asgi':
+            return AsgiHttpServer(host=host, port=port, certfile=certfile, keyfile=keyfile, reuse_port=reuse_port,
+                                  threads=self.__threads, keepalive_timeout=self.__keepalive_timeout / 1000,
+                                  request_max_size=bottle.BaseRequest.MEMFILE_MAX, **options)
+        return SSLCherryPyServer(host=host, port=port, certfile=certfile, keyfile=keyfile, reuse_port=reuse_port,
+                                 threads=self.__threads, max_threads=max(self.__threads, self.__max_threads),
+                                 keepalive_timeout=self.__keepalive_timeout / 1000,
+                                 shutdown_timeout=self.__shutdown_timeout / 1000,
+                                 accepted_queue_size=self.__accepted_queue_size,
+                                 accepted_queue_timeout=self.__accepted_queue_timeout / 1000,
+                                 on_stats=self.__report_thread_pool, stats_interval=self._pool_stats_interval,
+                                 **options)
+
+    def __report_thread_pool(self, stats: dict):
+        self.__counters.last('http_endpoint.thread_count', stats['threads'])
+        self.__counters.last('http_endpoint.busy_threads', stats['threads'] - stats['idle'])
+        self.__counters.last('http_endpoint.queue_length', stats['queue'])
+
+    def __get_cached_counters(self) -> List[CachedCounters]:
+        if self.__references is None:
+            return []
+        counters = self.__references.get_optional(Descriptor(None, 'counters', None, None, None))
+        return [c for c in counters if isinstance(c, CachedCounters)]
+
     def close(self, correlation_id: Optional[str]):
         """
         Closes this endpoint and the REST server (service) that was opened earlier.
@@ -240,6 +455,7 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
             if not (self.__server is None):
                 self.__server.shutdown()
                 self.__service.close()
+                self.__close_event_loops()
                 self.__logger.debug(
                     correlation_id, f"Closed REST service at {self.__uri}")
 
@@ -277,7 +493,8 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
 
         return ''
 
-    def register_route(self, method: str, route: str, schema: Schema, handler: Callable):
+    def register_route(self, method: str, route: str, schema: Schema, handler: Callable,
+                       cache: HttpResponseCache = None, max_in_flight: int = None):
         """
         Registers an action in this objects REST server (service) by the given method and route.
 
@@ -287,7 +504,13 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
 
         :param schema: the schema to use for parameter validation.
 
-        :param handler: the action to perform at the given route.
+        :param handler: the action to perform at the given route. It can be a regular function or a coroutine function.
+
+        :param cache: (optional) the cache to keep responses of a GET route.
+
+        :param max_in_flight: (optional) the maximum number of requests to the route processed at the same time.
+                              Requests over the limit wait in a queue like requests over the endpoint limit.
+                              With adaptive concurrency it is the maximum the adaptive limit can reach.
         """
         method = method.upper()
         # if method == 'DELETE':
@@ -295,32 +518,189 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
 
         route = self.__fix_route(route)
 
-        def wrapper(*args, **kwargs):
-            try:
-                if isinstance(schema, Schema):
-                    params = self.__get_data() or {}
-                    params.update(kwargs)
-                    correlation_id = None if not params else params.get('correlation_id')
-                    schema.validate_and_throw_exception(correlation_id, params, False)
-
-                return handler(*args, **kwargs)
-            except Exception as ex:
-                # hack the redirect response in bottle
-                if isinstance(ex, bottle.HTTPResponse):
-                    handler(*args, **kwargs)
-                return HttpResponseSender.send_error(ex)
+        if cache is not None:
+            if method != 'GET':
+                raise ConfigException(None, 'CACHE_NOT_SUPPORTED', 'Responses can be cached only for GET routes') \
+                    .with_details('method', method).with_details('route', route)
+            handler = cache.wrap(handler)
+
+        route_admission = self.__create_route_admission(max_in_flight)
+        counter_prefix = 'http_endpoint.' + method.lower() + route.replace('/', '.')
+
+        # Schemas are compiled once, so requests do not walk them reflectively
+        validator = SchemaValidator(schema) if isinstance(schema, Schema) else None
+
+        def validate(kwargs):
+            if validator is not None:
+                params = self.__get_data() or {}
+                params.update(kwargs)
+                correlation_id = None if not params else params.get('correlation_id')
+                validator.validate_and_throw_exception(correlation_id, params, False)
+
+        if inspect.iscoroutinefunction(handler):
+            async def async_wrapper(*args, **kwargs):
+                token = None
+                admitted = []
+                try:
+                    self.__check_maintenance()
+                    deadline = self.__check_deadline()
+                    token = HttpRequestDeadline.set_current(deadline)
+                    admissions = self.__get_admissions(route_admission)
+                    if len(admissions) > 0:
+                        start = time.perf_counter()
+                        for admission in admissions:
+                            if not await admission.acquire_async(self.__get_queue_timeout(deadline)):
+                                self.__shed()
+                            admitted.append(admission)
+                        self.__report_admission(start)
+                    validate(kwargs)
+                    sample = self.__start_sample(route_admission)
+                    result = await handler(*args, **kwargs)
+                    self.__record_sample(route_admission, counter_prefix, sample)
+                    return result
+                except Exception as ex:
+                    return HttpResponseSender.send_error(ex)
+                finally:
+                    for admission in admitted:
+                        admission.release()
+                    if token is not None:
+                        HttpRequestDeadline.reset_current(token)
+
+            if self.__server_mode == 'asgi':
+                self.__service.route(route, method, async_wrapper)
+                return
+
+            def wrapper(*args, **kwargs):
+                return self.__run_coroutine(async_wrapper(*args, **kwargs))
+        else:
+            def wrapper(*args, **kwargs):
+                token = None
+                admitted = []
+                try:
+                    self.__check_maintenance()
+                    deadline = self.__check_deadline()
+                    token = HttpRequestDeadline.set_current(deadline)
+                    admissions = self.__get_admissions(route_admission)
+                    if len(admissions) > 0:
+                        start = time.perf_counter()
+                        for admission in admissions:
+                            if not admission.acquire(self.__get_queue_timeout(deadline)):
+                                self.__shed()
+                            admitted.append(admission)
+                        self.__report_admission(start)
+                    validate(kwargs)
+                    sample = self.__start_sample(route_admission)
+                    result = handler(*args, **kwargs)
+                    self.__record_sample(route_admission, counter_prefix, sample)
+                    return result
+                except Exception as ex:
+                    # hack the redirect response in bottle
+                    if isinstance(ex, bottle.HTTPResponse):
+                        handler(*args, **kwargs)
+                    return HttpResponseSender.send_error(ex)
+                finally:
+                    for admission in admitted:
+                        admission.release()
+                    if token is not None:
+                        HttpRequestDeadline.reset_current(token)
 
         self.__service.route(route, method, wrapper)
 
+    def __create_admission(self, max_in_flight: int) -> AdmissionController:
+        return AdmissionController(max_in_flight, self.__admission_queue_size, self.__admission_queue_timeout)
+
+    def __create_route_admission(self, max_in_flight: Optional[int]) -> Optional[AdmissionController]:
+        if not self.__adaptive_concurrency:
+            return self.__create_admission(max_in_flight) if max_in_flight else None
+
+        max_limit = min(max_in_flight, self.__adaptive_max_limit) if max_in_flight else self.__adaptive_max_limit
+        return AdaptiveConcurrencyLimiter(initial_limit=self.__adaptive_initial_limit,
+                                          min_limit=self.__adaptive_min_limit, max_limit=max_limit,
+                                          tolerance=self.__adaptive_tolerance,
+                                          queue_size=self.__admission_queue_size,
+                                          queue_timeout=self.__admission_queue_timeout)
+
+    @staticmethod
+    def __start_sample(route_admission: Optional[AdmissionController]) -> Optional[Tuple[float, int]]:
+        if not isinstance(route_admission, AdaptiveConcurrencyLimiter):
+            return None
+        return time.perf_counter(), route_admission.get_in_flight()
+
+    def __record_sample(self, route_admission: Optional[AdmissionController], counter_prefix: str,
+                        sample: Optional[Tuple[float, int]]):
+        # Server errors are not measured, they are often faster and would raise the limit
+        if sample is None or response.status_code >= 500:
+            return
+        (start, in_flight) = sample
+        limit = route_admission.record((time.perf_counter() - start) * 1000, in_flight)
+        self.__counters.last(counter_prefix + '.concurrency_limit', limit)
+        self.__counters.last(counter_prefix + '.rtt', route_admission.get_rtt())
+
+    def __get_admissions(self, route_admission: Optional[AdmissionController]) -> List[AdmissionController]:
+        # The endpoint limit is taken first, so requests waiting for a busy route do not hold its slots long
+        return [admission for admission in (self.__admission, route_admission) if admission is not None]
+
+    @staticmethod
+    def __get_queue_timeout(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else deadline - time.perf_counter()
+
+    def __report_admission(self, start: float):
+        self.__counters.stats('http_endpoint.queue_wait_time', (time.perf_counter() - start) * 1000)
+        if self.__admission is not None:
+            self.__counters.last('http_endpoint.in_flight', self.__admission.get_in_flight())
+
+    def __shed(self):
+        # Rejecting quickly lets clients retry elsewhere instead of waiting for a request that times out
+        self.__counters.increment_one('http_endpoint.shed_count')
+        response.headers['Retry-After'] = str(self.__admission_retry_after)
+        raise InvocationException(self.get_correlation_id(), 'SERVICE_OVERLOADED',
+                                  'Service is overloaded, retry later').with_status(503)
+
+    def __check_maintenance(self):
+        if self.__maintenance_enabled:
+            response.headers['Retry-After'] = '3600'
+            raise InvocationException(self.get_correlation_id(), 'SERVICE_UNAVAILABLE',
+                                      'Service is under maintenance').with_status(503)
+
+    def __check_deadline(self) -> Optional[float]:
+        # Callers that already gave up do not wait for the result, so the request is not processed
+        deadline = HttpRequestDeadline.from_request()
+        if deadline is not None and deadline <= time.perf_counter():
+            self.__counters.increment_one('http_endpoint.deadline_exceeded_count')
+            raise InvocationException(self.get_correlation_id(), 'DEADLINE_EXCEEDED',
+                                      'Request deadline passed before it was processed').with_status(504)
+        return deadline
+
+    def __run_coroutine(self, coroutine):
+        # Threaded servers run coroutine handlers on an event loop owned by the worker thread
+        loop = getattr(self.__event_loops, 'loop', None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self.__event_loops.loop = loop
+            with self.__loops_lock:
+                self.__created_loops.append(loop)
+        return loop.run_until_complete(coroutine)
+
+    def __close_event_loops(self):
+        with self.__loops_lock:
+            loops = self.__created_loops
+            self.__created_loops = []
+
+        for loop in loops:
+            try:
+                loop.close()
+            except RuntimeError:
+                # The loop is still used by a thread that did not finish on shutdown
+                pass
+
     def __get_data(self) -> Optional[dict]:
         result = {}
-        if request.json or request.query:
+        body = HttpRequestBody.get_json()
+        if body or request.query:
             for k, v in request.query.dict.items():
                 result[k] = ''.join(v)
-            if request.json is not None and request.json != 'null':
-                json_body = request.json if not isinstance(request.json, str) else json.loads(
-                    request.json)
-                result.update({'body': json_body})
+            if body is not None:
+                result.update({'body': body})
             return result
         else:
             return None
@@ -336,15 +716,17 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
         """
         :return: maintenance error code
         """
-        # Make this more sophisticated
+        # Routes reject requests before calling handlers, the hook covers responses bottle sends by itself
         if self.__maintenance_enabled:
-            response.headers['Retry-After'] = 3600
+            response.headers['Retry-After'] = '3600'
             response.status = 503
 
     def __no_cache(self):
         """
-        Prevents IE from caching REST requests
+        Prevents IE from caching REST requests. Routes that set their own Cache-Control header keep it.
         """
+        if 'Cache-Control' in response.headers:
+            return
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
         response.headers['Pragma'] = 'no-cache'
         response.headers['Expires'] = 0
@@ -356,8 +738,9 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
                 param = request.query[name]
                 if param:
                     return param
-            if request.body:
-                param = request.json[name]
+            body = HttpRequestBody.get_json()
+            if isinstance(body, dict):
+                param = body.get(name)
                 if param:
                     return param
             if request.params:
@@ -404,7 +787,16 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
             authorize()
             return next_action(*args, **kwargs)
 
-        if authorize:
+        async def async_action_with_authorize(*args, **kwargs):
+            bottle.request.params['kwargs'] = kwargs
+
+            authorize()
+            return await next_action(*args, **kwargs)
+
+        if authorize and inspect.iscoroutinefunction(action):
+            next_action = action
+            action = async_action_with_authorize
+        elif authorize:
             next_action = action
             action = action_with_authorize
 
@@ -413,17 +805,54 @@ class HttpEndpoint(IOpenable, IConfigurable, IReferenceable):
     def register_interceptor(self, route: str, action: Callable):
         """
         Registers a middleware action for the given route.
+        The action is called for requests to the route and all nested routes,
+        in the order in which interceptors were registered.
+        Routes with regular expression characters are matched against the whole request URL.
 
         :param route: the route to register in this object's REST server (service).
         :param action: the middleware action to perform at the given route.
         """
         route = self.__fix_route(route)
+        order = self.__interceptors_count
+        self.__interceptors_count += 1
 
-        def intercept_handler():
-            match = re.match('.*' + route, request.url) is not None
-            if route is not None and route != '' and not match:
-                pass
-            else:
-                return action()
+        if re.search(r'[.^$*+?{}\[\]\\|()]', route) is not None:
+            self.__interceptor_patterns.append((order, re.compile('.*' + route), action))
+            return
+
+        node = self.__interceptors
+        for segment in route.split('/'):
+            if segment != '':
+                node = node[1].setdefault(segment, ([], {}))
+        node[0].append((order, action))
+
+    def __intercept(self):
+        if self.__interceptors_count == 0:
+            return
 
-        self.__service.add_hook('before_request', intercept_handler)
+        # Finds interceptors of the route and all its parent routes walking the tree once per request
+        node = self.__interceptors
+        actions = node[0]
+        merged = False
+        for segment in request.path.split('/'):
+            if segment == '':
+                continue
+            node = node[1].get(segment)
+            if node is None:
+                break
+            if len(node[0]) > 0:
+                merged = len(actions) > 0
+                actions = actions + node[0] if merged else node[0]
+
+        if len(self.__interceptor_patterns) > 0:
+            url = request.url
+            matches = [(order, action) for (order, pattern, action) in self.__interceptor_patterns
+                       if pattern.match(url) is not None]
+            if len(matches) > 0:
+                merged = merged or len(actions) > 0
+                actions = actions + matches
+
+        if merged:
+            actions = sorted(actions, key=lambda item: item[0])
+        for (_, action) in actions:
+            action()
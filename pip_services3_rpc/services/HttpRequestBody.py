@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.HttpRequestBody
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Parsed body of HTTP requests
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from typing import Any, Callable, Optional
+
+import bottle
+
+from .JsonCodec import JsonCodec
+
+
+class HttpRequestBody:
+    """
+    Helper class that parses JSON body of HTTP requests once and keeps the result in the request environment,
+    so the endpoint, services and operations that need the body within the same request share it.
+
+    Clients that send JSON strings as bodies get them decoded into objects as well.
+    The parsed body is also returned by bottle's *request.json* without parsing it again.
+
+    Example:
+
+    .. code-block:: python
+
+        data = HttpRequestBody.get_json()
+        name = data.get('name') if isinstance(data, dict) else None
+    """
+
+    _environ_key = 'pip_services.request.body'
+
+    _decoder: Optional[Callable[[Any], Any]] = None
+
+    @staticmethod
+    def set_decoder(decoder: Optional[Callable[[Any], Any]]):
+        """
+        Sets the function used to decode JSON request bodies. It receives body bytes or JSON strings.
+
+        :param decoder: a JSON decoding function or None to use the codec of the endpoint.
+        """
+        HttpRequestBody._decoder = decoder
+
+    @staticmethod
+    def get_json(req: bottle.BaseRequest = None) -> Any:
+        """
+        Gets the parsed JSON body of the request.
+        The body is parsed on the first call and later calls return the same object.
+
+        :param req: (optional) an HTTP request. The current request is used when it is not set.
+        :return: the parsed body or None if the request has no JSON body.
+        """
+        req = req if req is not None else bottle.request
+        environ = req.environ
+        if HttpRequestBody._environ_key in environ:
+            return environ[HttpRequestBody._environ_key]
+
+        decode = HttpRequestBody._decoder or JsonCodec.from_request(req).decode
+        if 'bottle.request.json' in environ:
+            data = environ['bottle.request.json']
+        else:
+            data = None
+            content_type = environ.get('CONTENT_TYPE', '').lower().split(';')[0]
+            if content_type == 'application/json':
+                body = req._get_body_string()
+                if body:
+                    data = decode(body)
+            # The same value is returned by bottle's request.json
+            environ['bottle.request.json'] = data
+
+        if isinstance(data, str):
+            # Some clients send bodies as JSON encoded JSON strings
+            data = decode(data)
+
+        environ[HttpRequestBody._environ_key] = data
+        return data
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.HttpRequestDeadline
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Deadline of HTTP requests propagated between services
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+import bottle
+
+
+class HttpRequestDeadline:
+    """
+    Helper class that carries the time budget of a call across service hops.
+
+    REST clients send the time left before their deadline in milliseconds in *X-Request-Timeout* header.
+    :class:`HttpEndpoint <pip_services3_rpc.services.HttpEndpoint.HttpEndpoint>` reads it, rejects requests
+    that arrive without any time left and keeps the deadline as the current one while the handler runs.
+    REST clients called by the handler limit their calls by the current deadline, so nested calls
+    get the reduced budget instead of their full timeouts.
+
+    Deadlines are :func:`time.perf_counter` values, so they are never compared between processes.
+
+    Example:
+
+    .. code-block:: python
+
+        def __get_report(self):
+            remaining = HttpRequestDeadline.get_remaining_time()
+            if remaining is not None and remaining < 100:
+                return self.send_result(self.__get_cached_report())
+            return self.send_result(self.__build_report())
+    """
+
+    HEADER = 'X-Request-Timeout'
+
+    _environ_key = 'pip_services.request.deadline'
+
+    __current: ContextVar[Optional[float]] = ContextVar('pip_services3_rpc.request_deadline', default=None)
+
+    @staticmethod
+    def from_request(req: bottle.BaseRequest = None) -> Optional[float]:
+        """
+        Gets the deadline of the request from its *X-Request-Timeout* header.
+        The deadline is calculated on the first call and later calls return the same value.
+
+        :param req: (optional) an HTTP request. The current request is used when it is not set.
+        :return: the deadline or None if the request has no valid timeout.
+        """
+        req = req if req is not None else bottle.request
+        environ = req.environ
+        if HttpRequestDeadline._environ_key in environ:
+            return environ[HttpRequestDeadline._environ_key]
+
+        deadline = None
+        value = environ.get('HTTP_X_REQUEST_TIMEOUT')
+        if value:
+            try:
+                deadline = time.perf_counter() + int(value) / 1000
+            except ValueError:
+                # Malformed timeouts are ignored like missing ones
+                pass
+
+        environ[HttpRequestDeadline._environ_key] = deadline
+        return deadline
+
+    @staticmethod
+    def get_current() -> Optional[float]:
+        """
+        Gets the deadline of the request processed in the current context.
+
+        :return: the deadline or None if the time is not limited.
+        """
+        return HttpRequestDeadline.__current.get()
+
+    @staticmethod
+    def set_current(deadline: Optional[float]) -> Token:
+        """
+        Sets the deadline of the request processed in the current context.
+
+        :param deadline: the deadline or None if the time is not limited.
+        :return: a token to restore the previous deadline with :func:`reset_current`.
+        """
+        return HttpRequestDeadline.__current.set(deadline)
+
+    @staticmethod
+    def reset_current(token: Token):
+        """
+        Restores the deadline that was current before :func:`set_current`.
+
+        :param token: the token returned by :func:`set_current`.
+        """
+        HttpRequestDeadline.__current.reset(token)
+
+    @staticmethod
+    def get_remaining_time(deadline: Optional[float] = None) -> Optional[int]:
+        """
+        Gets the time left before the deadline.
+
+        :param deadline: (optional) a deadline. The current deadline is used when it is not set.
+        :return: the time left in milliseconds, 0 when the deadline has passed, or None if the time is not limited.
+        """
+        deadline = deadline if deadline is not None else HttpRequestDeadline.get_current()
+        if deadline is None:
+            return None
+        return max(0, int((deadline - time.perf_counter()) * 1000))
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 
 
-import json
 import re
 
 import bottle
 
+from .HttpRequestBody import HttpRequestBody
+
 
 class HttpRequestDetector:
     """
@@ -82,10 +83,9 @@ class HttpRequestDetector:
         if req.get_header('x-forwarded-for'):
             ip = req.get_header('x-forwarded-for').split(',')[0]
 
-        json_data = req.json
-
-        if not isinstance(json_data, dict) and json_data is not None:
-            json_data = json.loads(str(json_data))
+        json_data = HttpRequestBody.get_json(req)
+        if not isinstance(json_data, dict):
+            json_data = None
 
         if ip is None and json_data and 'connection' in json_data.keys():
             try:
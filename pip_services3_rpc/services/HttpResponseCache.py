@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.HttpResponseCache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Response cache for GET routes
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import hashlib
+import inspect
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple
+
+import bottle
+
+
+class _CacheEntry:
+
+    def __init__(self, path: str, body: bytes, content_type: str, expires: float):
+        self.path = path
+        self.body = body
+        self.content_type = content_type
+        self.expires = expires
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class HttpResponseCache:
+    """
+    Keeps responses of a GET route, so read-heavy routes do not compute and serialize
+    the same result on every request. The cache is opt-in and passed to
+    :func:`RestService.register_route <pip_services3_rpc.services.RestService.RestService.register_route>`
+    for every route that uses it.
+
+    Responses are kept for *ttl* milliseconds. The least recently used responses are evicted when the cache
+    holds more than *max_entries* responses or more than *max_size* bytes. Only responses with 200 status
+    and text or bytes bodies are kept; errors, empty results and streams are never cached.
+
+    Responses are found by request path, query parameters sorted by name (except *ignored_params*,
+    like correlation_id that differs for every call) and values of *vary_headers*.
+    Every response gets a strong ETag, and requests with a matching *If-None-Match* header are answered
+    with 304 status and no body. The *cache_control* value is sent in Cache-Control header instead of
+    the no-cache headers HttpEndpoint adds to other responses.
+
+    Cached responses are invalidated by :func:`invalidate` when the data behind them changes.
+
+    Example:
+
+    .. code-block:: python
+
+        class MyRestService(RestService):
+
+            def __init__(self):
+                super().__init__()
+                self.__items_cache = HttpResponseCache(ttl=30000, vary_headers=['Accept-Language'])
+
+            def __get_items(self):
+                return self.send_result(self._controller.get_items(self._get_correlation_id()))
+
+            def __create_item(self):
+                item = self._controller.create_item(self._get_correlation_id(), self._get_data())
+                self.__items_cache.invalidate()
+                return self.send_created_result(item)
+
+            def register(self):
+                self.register_route('get', '/items', None, self.__get_items, cache=self.__items_cache)
+                self.register_route('post', '/items', None, self.__create_item)
+    """
+
+    def __init__(self, ttl: int = 60000, max_entries: int = 1000, max_size: int = 10 * 1024 * 1024,
+                 vary_headers: List[str] = None, ignored_params: List[str] = None,
+                 cache_control: str = 'no-cache'):
+        """
+        Creates a new instance of the cache.
+
+        :param ttl: (optional) the time in milliseconds responses are kept (default: 60 sec).
+        :param max_entries: (optional) the maximum number of kept responses (default: 1000).
+        :param max_size: (optional) the maximum total size of kept response bodies in bytes (default: 10 MB).
+        :param vary_headers: (optional) names of request headers that select different responses.
+        :param ignored_params: (optional) names of query parameters that do not change responses
+                               (default: correlation_id).
+        :param cache_control: (optional) the value of Cache-Control header of cached responses. The default
+                              "no-cache" lets clients keep responses but revalidate them with If-None-Match.
+        """
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__max_size = max_size
+        self.__vary_headers = [header.title() for header in vary_headers or []]
+        self.__ignored_params = set(ignored_params if ignored_params is not None else ['correlation_id'])
+        self.__cache_control = cache_control
+
+        self.__entries: 'OrderedDict[Tuple, _CacheEntry]' = OrderedDict()
+        self.__size = 0
+        self.__lock = Lock()
+
+    def wrap(self, handler: Callable) -> Callable:
+        """
+        Wraps a route handler to answer requests from the cache and keep responses of the handler.
+
+        :param handler: the route handler. It can be a regular function or a coroutine function.
+        :return: the wrapped handler.
+        """
+        if inspect.iscoroutinefunction(handler):
+            async def async_wrapper(*args, **kwargs):
+                key = self.__get_key()
+                entry = self.__get(key)
+                if entry is None:
+                    result = await handler(*args, **kwargs)
+                    entry = self.__put(key, result)
+                    if entry is None:
+                        return result
+                return self.__send(entry)
+
+            return async_wrapper
+
+        def wrapper(*args, **kwargs):
+            key = self.__get_key()
+            entry = self.__get(key)
+            if entry is None:
+                result = handler(*args, **kwargs)
+                entry = self.__put(key, result)
+                if entry is None:
+                    return result
+            return self.__send(entry)
+
+        return wrapper
+
+    def invalidate(self, path: str = None):
+        """
+        Removes cached responses.
+
+        :param path: (optional) a request path, like "/v1/items". Responses of this path and all nested paths
+                     are removed. When it is not set all responses are removed.
+        """
+        with self.__lock:
+            if path is None:
+                self.__entries.clear()
+                self.__size = 0
+                return
+
+            path = path.rstrip('/')
+            for (key, entry) in list(self.__entries.items()):
+                if entry.path == path or entry.path.startswith(path + '/'):
+                    self.__remove(key)
+
+    def get_size(self) -> int:
+        """
+        Gets the total size of cached response bodies.
+
+        :return: the size in bytes.
+        """
+        return self.__size
+
+    def __get_key(self) -> Tuple:
+        request = bottle.request
+        query = tuple(sorted((name, value) for (name, value) in request.query.allitems()
+                             if name not in self.__ignored_params))
+        headers = tuple(request.headers.get(header) for header in self.__vary_headers)
+        return request.path.rstrip('/'), query, headers
+
+    def __get(self, key: Tuple) -> Optional[_CacheEntry]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.perf_counter():
+                self.__remove(key)
+                return None
+            self.__entries.move_to_end(key)
+            return entry
+
+    def __put(self, key: Tuple, result: Any) -> Optional[_CacheEntry]:
+        response = bottle.response
+        if response.status_code != 200 or not isinstance(result, (str, bytes)):
+            return None
+
+        body = result.encode(response.charset or 'utf8') if isinstance(result, str) else result
+        if len(body) > self.__max_size:
+            return None
+
+        entry = _CacheEntry(key[0], body, response.content_type, time.perf_counter() + self.__ttl / 1000)
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = entry
+            self.__size += len(body)
+            while len(self.__entries) > self.__max_entries or self.__size > self.__max_size:
+                self.__remove(next(iter(self.__entries)))
+        return entry
+
+    def __remove(self, key: Tuple):
+        entry = self.__entries.pop(key)
+        self.__size -= len(entry.body)
+
+    def __send(self, entry: _CacheEntry) -> bytes:
+        response = bottle.response
+        response.headers['ETag'] = entry.etag
+        response.headers['Cache-Control'] = self.__cache_control
+        if len(self.__vary_headers) > 0:
+            response.headers['Vary'] = ', '.join(self.__vary_headers)
+        response.content_type = entry.content_type
+
+        if self.__matches(bottle.request.headers.get('If-None-Match'), entry.etag):
+            response.status = 304
+            return b''
+
+        response.status = 200
+        return entry.body
+
+    @staticmethod
+    def __matches(header: Optional[str], etag: str) -> bool:
+        if not header:
+            return False
+        for tag in header.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            # Compressed representations have the encoding appended to their tags
+            if tag == '*' or tag == etag or (tag.startswith(etag[:-1] + '-') and tag.endswith('"')):
+                return True
+        return False
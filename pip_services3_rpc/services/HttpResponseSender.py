@@ -9,18 +9,23 @@
     :license: MIT, see LICENSE for more details.
 """
 import traceback
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
 import bottle
-from pip_services3_commons.convert.JsonConverter import JsonConverter
 from pip_services3_commons.errors import ErrorDescriptionFactory
 
+from .JsonCodec import JsonCodec
+
 
 class HttpResponseSender:
     """
     Helper class that handles HTTP-based responses.
+    Results are encoded with :class:`JsonCodec <pip_services3_rpc.services.JsonCodec.JsonCodec>` of the endpoint.
     """
 
+    # Approximate number of characters sent in every chunk of streamed responses
+    stream_chunk_size = 16 * 1024
+
     @staticmethod
     def send_result(result: Any) -> Optional[str]:
         """
@@ -41,7 +46,7 @@ class HttpResponseSender:
             return
         else:
             bottle.response.status = 200
-            return JsonConverter.to_json(result)
+            return JsonCodec.from_request().encode(result)
 
     @staticmethod
     def send_empty_result(result: Any = None) -> Optional[str]:
@@ -56,7 +61,7 @@ class HttpResponseSender:
         bottle.response.headers['Content-Type'] = 'application/json'
         if result is None:
             bottle.response.status = 204
-            return JsonConverter.to_json(result)
+            return JsonCodec.from_request().encode(result)
         else:
             bottle.response.status = 404
             return
@@ -82,7 +87,7 @@ class HttpResponseSender:
             return
         else:
             bottle.response.status = 201
-            return JsonConverter.to_json(result)
+            return JsonCodec.from_request().encode(result)
 
     @staticmethod
     def send_deleted_result(result: Any = None) -> Optional[str]:
@@ -105,7 +110,56 @@ class HttpResponseSender:
             return
 
         bottle.response.status = 200
-        return JsonConverter.to_json(result) if result else None
+        return JsonCodec.from_request().encode(result) if result else None
+
+    @staticmethod
+    def send_stream(items: Iterable[Any]) -> Iterator[str]:
+        """
+        Sends items one by one as newline delimited JSON (NDJSON) with 200 status code.
+        The response is written in chunks while the items are iterated, so large result sets
+        are never held in memory as a whole. Servers send it with chunked transfer encoding.
+
+        The first item is read before the response starts, so errors raised by a lazy data source
+        at that point can still be sent as ErrorDescription. Errors raised later abort the response.
+
+        :param items: an iterable or a generator of items to send.
+        :returns: a generator of response chunks to be returned by route handler.
+        """
+        codec = JsonCodec.from_request()
+        iterator = iter(items)
+        try:
+            first = [next(iterator)]
+        except StopIteration:
+            first = []
+
+        bottle.response.status = 200
+        bottle.response.headers['Content-Type'] = 'application/x-ndjson'
+        return HttpResponseSender.__write_stream(codec, first, iterator)
+
+    @staticmethod
+    def __write_stream(codec: JsonCodec, first: List[Any], iterator: Iterator[Any]) -> Iterator[str]:
+        chunk_size = HttpResponseSender.stream_chunk_size
+        lines = []
+        size = 0
+        try:
+            for items in (first, iterator):
+                for item in items:
+                    line = codec.encode(item)
+                    line = 'null' if line is None else line
+                    lines.append(line)
+                    size += len(line) + 1
+                    if size >= chunk_size:
+                        lines.append('')
+                        yield '\n'.join(lines)
+                        lines = []
+                        size = 0
+            if len(lines) > 0:
+                lines.append('')
+                yield '\n'.join(lines)
+        finally:
+            # Lets data sources like database cursors release resources when clients disconnect
+            if hasattr(iterator, 'close'):
+                iterator.close()
 
     @staticmethod
     def send_error(error: Any) -> str:
@@ -130,4 +184,4 @@ class HttpResponseSender:
         error = ErrorDescriptionFactory.create(error)
         error.stack_trace = traceback.format_exc()
         bottle.response.status = error.status
-        return JsonConverter.to_json(error)
+        return JsonCodec.from_request().encode(error)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.JsonCodec
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    JSON codec for HTTP requests and responses
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+from datetime import datetime
+from typing import Any, Optional, Union
+
+import bottle
+from pip_services3_commons.errors import ConfigException
+
+
+class JsonCodec:
+    """
+    Encodes values into JSON and decodes them back using the standard *json* module.
+
+    Values are converted the same way as :class:`JsonConverter <pip_services3_commons.convert.JsonConverter.JsonConverter>`
+    does it, but in a single pass of the encoder: sets are written as arrays, datetimes in ISO format,
+    objects with *to_json()* method as its result and other objects as their attributes.
+
+    Codecs are selected by name in *options.json_codec* configuration parameter of
+    :class:`HttpEndpoint <pip_services3_rpc.services.HttpEndpoint.HttpEndpoint>` and REST clients:
+    "json" for this codec (default) or "orjson" for :class:`OrjsonCodec <pip_services3_rpc.services.OrjsonCodec.OrjsonCodec>`.
+    """
+
+    name = 'json'
+
+    # The key of the codec in configuration of bottle applications
+    _config_key = 'pip_services.json_codec'
+
+    @staticmethod
+    def create(name: Optional[str] = None, correlation_id: Optional[str] = None) -> 'JsonCodec':
+        """
+        Creates a codec by its name.
+
+        :param name: the codec name: "json" (default) or "orjson".
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :return: a new codec.
+        """
+        name = (name or JsonCodec.name).lower()
+        if name == JsonCodec.name:
+            return JsonCodec()
+        if name == 'orjson':
+            from .OrjsonCodec import OrjsonCodec
+            if not OrjsonCodec.is_supported():
+                raise ConfigException(correlation_id, 'NO_ORJSON',
+                                      'orjson JSON codec requires orjson package to be installed')
+            return OrjsonCodec()
+        raise ConfigException(correlation_id, 'UNKNOWN_JSON_CODEC',
+                              'JSON codec ' + name + ' is not supported').with_details('codec', name)
+
+    @staticmethod
+    def from_request(req: bottle.BaseRequest = None) -> 'JsonCodec':
+        """
+        Gets the codec of the application that serves the request.
+
+        :param req: (optional) an HTTP request. The current request is used when it is not set.
+        :return: the application codec or the default codec.
+        """
+        req = req if req is not None else bottle.request
+        app = req.environ.get('bottle.app')
+        codec = app.config.get(JsonCodec._config_key) if app is not None else None
+        return codec if codec is not None else _default_codec
+
+    def install(self, app: bottle.Bottle):
+        """
+        Makes the codec used for requests and responses of the application.
+
+        :param app: a bottle application.
+        """
+        app.config[JsonCodec._config_key] = self
+        # Dictionaries returned by route handlers are encoded by the JSON plugin
+        for plugin in app.plugins:
+            if isinstance(plugin, bottle.JSONPlugin):
+                plugin.json_dumps = self.encode
+
+    def encode(self, value: Any) -> Optional[str]:
+        """
+        Encodes a value into JSON string.
+
+        :param value: a value to encode.
+        :return: JSON string or None when the value is None.
+        """
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return json.dumps(value, default=self._to_serializable)
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """
+        Decodes a JSON string.
+
+        :param data: a JSON string or UTF-8 bytes.
+        :return: the decoded value.
+        """
+        return json.loads(data)
+
+    @staticmethod
+    def _to_serializable(obj: Any) -> Any:
+        """
+        Converts a value that is not supported by the encoder into a supported one.
+        Nested values are converted by the encoder when it writes them.
+
+        :param obj: a value to convert.
+        :return: the converted value.
+        """
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        if hasattr(obj, 'to_json'):
+            return obj.to_json()
+        if hasattr(obj, '__dict__'):
+            return {k: v for (k, v) in obj.__dict__.items() if not (k.startswith('__') and k.endswith('__'))}
+        raise TypeError('Object of type %s is not JSON serializable' % type(obj).__name__)
+
+
+_default_codec = JsonCodec()
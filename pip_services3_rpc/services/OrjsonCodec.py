@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.OrjsonCodec
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    JSON codec implemented with orjson
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from .JsonCodec import JsonCodec
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec that encodes and decodes values with C-accelerated *orjson* package.
+    Values are converted the same way as by :class:`JsonCodec <pip_services3_rpc.services.JsonCodec.JsonCodec>`.
+    The output is compact and integers have to fit into 64 bits.
+
+    The codec requires the optional *orjson* package (pip install pip_services3_rpc[fast]).
+    """
+
+    name = 'orjson'
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Checks if orjson package is installed.
+
+        :return: true if the codec can be used.
+        """
+        return orjson is not None
+
+    def __init__(self):
+        # Datetimes and dataclasses are converted by the codec, so they are written as by the standard codec
+        self.__options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME \
+                         | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def encode(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return orjson.dumps(value, default=self._to_serializable, option=self.__options).decode('utf-8')
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.PreforkServer
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Multi-process web server that runs several worker processes
+    sharing the same port.
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import os
+import signal
+import socket
+import time
+from multiprocessing import Pipe
+from multiprocessing.connection import wait, Connection
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bottle import ServerAdapter
+from pip_services3_components.count import CachedCounters, Counter, CounterType
+from pip_services3_components.log import ILogger
+
+
+class PreforkServer(ServerAdapter):
+    """
+    Server adapter that runs several worker processes, each running its own server on the same port
+    with SO_REUSEPORT, so the kernel spreads incoming connections between processes and all CPU cores can be used.
+
+    :func:`start` forks a supervisor process from the calling thread. It shall be called by the thread
+    that opens the endpoint before server threads are started. The supervisor is single-threaded:
+    it forks the workers, restarts them when they crash and stops them on shutdown.
+    The process that started the server does not serve requests.
+
+    Workers periodically send measurements of the referenced
+    :class:`CachedCounters <pip_services3_components.count.CachedCounters.CachedCounters>` to the starting process.
+    It replays the changes into its own counters, so they are combined and saved the usual way.
+    Workers do not save counters themselves.
+
+    Prefork mode is supported only on platforms with *os.fork* and *SO_REUSEPORT*.
+    Routes have to be registered before the server is started, since workers get a copy of the application.
+    """
+
+    _restart_delay = 1.0
+    _shutdown_timeout = 5.0
+    _sync_interval = 1.0
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, workers: int = 2,
+                 create_server: Callable[[], ServerAdapter] = None, counters: List[CachedCounters] = None,
+                 logger: ILogger = None, **options):
+        super(PreforkServer, self).__init__(host, port, **options)
+        self.__workers = workers
+        self.__create_server = create_server
+        self.__counters = counters or []
+        self.__logger = logger
+        self.__supervisor_pid: Optional[int] = None
+        self.__reader: Optional[Connection] = None
+        self.__worker_pids: List[int] = []
+        self.__snapshots: Dict[Tuple[int, int, str], Counter] = {}
+        self.__lock = Lock()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Checks if the current platform supports prefork mode.
+
+        :return: true if worker processes can be forked and share the port.
+        """
+        return hasattr(os, 'fork') and hasattr(socket, 'SO_REUSEPORT')
+
+    def get_worker_pids(self) -> List[int]:
+        """
+        Gets process ids of running workers.
+
+        :return: a list with worker process ids.
+        """
+        with self.__lock:
+            return list(self.__worker_pids)
+
+    def start(self, handler):
+        """
+        Forks the supervisor process that starts the workers.
+
+        :param handler: the WSGI application to be served by workers.
+        """
+        if self.__supervisor_pid is not None:
+            return
+
+        reader, writer = Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:
+            reader.close()
+            self.__supervise(handler, writer)
+        else:
+            writer.close()
+            self.__supervisor_pid = pid
+            self.__reader = reader
+
+    def run(self, handler):
+        self.start(handler)
+
+        reader = self.__reader
+        while True:
+            try:
+                message = reader.recv()
+            except (EOFError, OSError):
+                break
+            self.__handle_message(message)
+
+        reader.close()
+
+    def shutdown(self):
+        pid = self.__supervisor_pid
+        if pid is None:
+            return
+        self.__supervisor_pid = None
+
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            return
+
+        deadline = time.perf_counter() + self._shutdown_timeout + 1
+        while time.perf_counter() < deadline:
+            if self.__reap(pid):
+                return
+            time.sleep(0.05)
+
+        try:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except OSError:
+            pass
+
+    def __handle_message(self, message: tuple):
+        kind = message[0]
+        if kind == 'workers':
+            with self.__lock:
+                self.__worker_pids = message[1]
+        elif kind == 'counters':
+            _, pid, index, items = message
+            self.__replay_counters(pid, index, items)
+        elif kind == 'exited':
+            for key in [key for key in self.__snapshots.keys() if key[0] == message[1]]:
+                del self.__snapshots[key]
+        elif kind == 'log' and self.__logger is not None:
+            _, level, text = message
+            if level == 'warn':
+                self.__logger.warn(None, text)
+            else:
+                self.__logger.debug(None, text)
+
+    def __replay_counters(self, pid: int, index: int, items: List[Counter]):
+        # Workers send cumulative values, so only the changes since the previous snapshot are applied
+        counters = self.__counters[index]
+        for current in items:
+            key = (pid, index, current.name)
+            previous = self.__snapshots.get(key)
+            self.__snapshots[key] = current
+            if previous is not None and previous.type != current.type:
+                previous = None
+
+            if current.type == CounterType.Increment:
+                delta = (current.count or 0) - (previous.count or 0 if previous else 0)
+                if delta != 0:
+                    counters.increment(current.name, delta)
+            elif current.type == CounterType.LastValue:
+                if current.last is not None and (previous is None or previous.last != current.last):
+                    counters.last(current.name, current.last)
+            elif current.type == CounterType.Timestamp:
+                if current.time is not None and (previous is None or previous.time != current.time):
+                    counters.timestamp(current.name, current.time)
+            else:
+                record = counters.end_timing if current.type == CounterType.Interval else counters.stats
+                for value in self.__get_new_samples(previous, current):
+                    record(current.name, value)
+
+    @staticmethod
+    def __get_new_samples(previous: Optional[Counter], current: Counter) -> List[float]:
+        # Produces samples that change count, average, min and max of the combined counter
+        # the same way as the samples measured by the worker
+        previous_count = previous.count or 0 if previous else 0
+        previous_sum = (previous.average or 0) * previous_count if previous else 0
+        count = (current.count or 0) - previous_count
+        if count <= 0:
+            return []
+        total = (current.average or 0) * (current.count or 0) - previous_sum
+        if count == 1:
+            return [total]
+
+        samples = []
+        if current.min is not None and (previous is None or previous.min is None or current.min < previous.min):
+            samples.append(current.min)
+        if current.max is not None and (previous is None or previous.max is None or current.max > previous.max):
+            samples.append(current.max)
+        rest = count - len(samples)
+        if rest > 0:
+            samples += [(total - sum(samples)) / rest] * rest
+        return samples
+
+    def __supervise(self, handler, parent: Connection):
+        # This code is executed only in the forked supervisor process and never returns
+        exit_code = 1
+        try:
+            stopping = []
+            signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(True))
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+            parent_pid = os.getppid()
+            processes: Dict[int, Tuple[Connection, float]] = {}
+
+            for _ in range(self.__workers):
+                self.__start_worker(handler, processes, parent)
+            parent.send(('workers', list(processes.keys())))
+
+            while len(stopping) == 0 and os.getppid() == parent_pid:
+                readers = {reader: pid for (pid, (reader, _)) in processes.items()}
+                for reader in wait(list(readers.keys()), timeout=0.5):
+                    self.__relay_counters(readers[reader], reader, parent)
+
+                if len(stopping) == 0 and self.__restart_exited_workers(handler, processes, parent):
+                    parent.send(('workers', list(processes.keys())))
+
+            self.__stop_workers(processes, parent)
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    def __start_worker(self, handler, processes: Dict[int, Tuple[Connection, float]], parent: Connection):
+        reader, writer = Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:
+            reader.close()
+            parent.close()
+            for (other_reader, _) in processes.values():
+                other_reader.close()
+            self.__run_worker(handler, writer)
+        else:
+            writer.close()
+            processes[pid] = (reader, time.perf_counter())
+            parent.send(('log', 'debug', "Started HTTP worker process %d" % pid))
+
+    def __run_worker(self, handler, writer: Connection):
+        # This code is executed only in the forked worker process and never returns
+        exit_code = 1
+        try:
+            supervisor_pid = os.getppid()
+            server = self.__create_server()
+            stopping = []
+            stopped = Event()
+            send_lock = Lock()
+
+            def stop(signum=None, frame=None):
+                stopping.append(True)
+                Thread(target=server.shutdown, daemon=True).start()
+
+            def send_counters():
+                with send_lock:
+                    for (index, counters) in enumerate(self.__counters):
+                        writer.send((index, counters.get_all()))
+
+            def sync():
+                while not stopped.wait(self._sync_interval):
+                    if os.getppid() != supervisor_pid:
+                        stop()
+                    send_counters()
+
+            signal.signal(signal.SIGTERM, stop)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+            # Measurements made before the fork belong to the parent process,
+            # and the worker's own measurements are saved by the parent process
+            for counters in self.__counters:
+                counters.clear_all()
+                counters.set_interval(float('inf'))
+
+            sync_thread = Thread(target=sync, daemon=True)
+            sync_thread.start()
+
+            server.run(handler)
+
+            stopped.set()
+            sync_thread.join()
+            send_counters()
+            exit_code = 0 if len(stopping) > 0 else 1
+        finally:
+            os._exit(exit_code)
+
+    def __restart_exited_workers(self, handler, processes: Dict[int, Tuple[Connection, float]],
+                                 parent: Connection) -> bool:
+        restarted = False
+        for pid in list(processes.keys()):
+            if not self.__reap(pid):
+                continue
+
+            started_time = processes[pid][1]
+            self.__remove_worker(pid, processes, parent)
+            parent.send(('log', 'warn', "HTTP worker process %d exited unexpectedly, restarting it" % pid))
+
+            # Slow down restarts of workers that crash right after start
+            if time.perf_counter() - started_time < self._restart_delay:
+                time.sleep(self._restart_delay)
+            self.__start_worker(handler, processes, parent)
+            restarted = True
+        return restarted
+
+    def __stop_workers(self, processes: Dict[int, Tuple[Connection, float]], parent: Connection):
+        for pid in list(processes.keys()):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+        deadline = time.perf_counter() + self._shutdown_timeout
+        while len(processes) > 0 and time.perf_counter() < deadline:
+            for pid in list(processes.keys()):
+                if self.__reap(pid):
+                    self.__remove_worker(pid, processes, parent)
+            time.sleep(0.05)
+
+        for pid in list(processes.keys()):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+            self.__remove_worker(pid, processes, parent)
+
+    @staticmethod
+    def __reap(pid: int) -> bool:
+        try:
+            result, _ = os.waitpid(pid, os.WNOHANG)
+            return result != 0
+        except ChildProcessError:
+            return True
+
+    def __remove_worker(self, pid: int, processes: Dict[int, Tuple[Connection, float]], parent: Connection):
+        reader, _ = processes.pop(pid, (None, None))
+        if reader is not None:
+            while reader.poll():
+                if not self.__relay_counters(pid, reader, parent):
+                    break
+            reader.close()
+        parent.send(('exited', pid))
+
+    @staticmethod
+    def __relay_counters(pid: int, reader: Connection, parent: Connection) -> bool:
+        try:
+            index, items = reader.recv()
+        except (EOFError, OSError):
+            return False
+
+        parent.send(('counters', pid, index, items))
+        return True
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 
-import json
 from abc import ABC
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Iterable, Iterator
 
 import bottle
 from pip_services3_commons.config import ConfigParams
@@ -20,6 +19,7 @@ from pip_services3_commons.refer.IReferenceable import IReferenceable
 from pip_services3_components.count.CompositeCounters import CompositeCounters
 from pip_services3_components.log.CompositeLogger import CompositeLogger
 
+from .HttpRequestBody import HttpRequestBody
 from .HttpResponseSender import HttpResponseSender
 
 
@@ -70,17 +70,18 @@ class RestOperations(IConfigurable, IReferenceable, ABC):
         return PagingParams(skip, take, total)
 
     def _get_data(self) -> Optional[str]:
-        data = bottle.request.json
-        if isinstance(data, str):
-            return json.loads(bottle.request.json)
-        elif bottle.request.json:
-            return bottle.request.json
+        data = HttpRequestBody.get_json()
+        if data:
+            return data
         else:
             return None
 
     def _send_result(self, result: Any = None) -> Optional[str]:
         return HttpResponseSender.send_result(result)
 
+    def _send_stream(self, items: Iterable[Any]) -> Iterator[str]:
+        return HttpResponseSender.send_stream(items)
+
     def _send_empty_result(self, result: Any = None) -> Optional[str]:
         return HttpResponseSender.send_empty_result(result)
 
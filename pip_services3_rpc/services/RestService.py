@@ -9,9 +9,8 @@
     :license: MIT, see LICENSE for more details.
 """
 
-import json
 from abc import abstractmethod
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Iterable, Iterator
 
 import bottle
 from pip_services3_commons.config import IConfigurable, ConfigParams
@@ -24,6 +23,8 @@ from pip_services3_components.log import CompositeLogger
 from pip_services3_components.trace.CompositeTracer import CompositeTracer
 
 from .HttpEndpoint import HttpEndpoint
+from .HttpRequestBody import HttpRequestBody
+from .HttpResponseCache import HttpResponseCache
 from .HttpResponseSender import HttpResponseSender
 from .IRegisterable import IRegisterable
 from .ISwaggerService import ISwaggerService
@@ -255,6 +256,19 @@ class RestService(IOpenable, IConfigurable, IReferenceable, IUnreferenceable, IR
 
         return HttpResponseSender.send_result(result)
 
+    def send_stream(self, items: Iterable[Any]) -> Iterator[str]:
+        """
+        Sends items one by one as newline delimited JSON (NDJSON) with chunked transfer encoding,
+        so large result sets are not held in memory. The result shall be returned by route handler.
+
+        Clients read such responses with :func:`RestClient._call_stream <pip_services3_rpc.clients.RestClient.RestClient._call_stream>`.
+
+        :param items: an iterable or a generator of items to send.
+
+        :return: a generator of response chunks.
+        """
+        return HttpResponseSender.send_stream(items)
+
     def send_created_result(self, result: Any) -> Optional[str]:
         """
         Creates a callback function that sends newly created object as JSON. That callack function call be called directly or passed as a parameter to business logic components.
@@ -298,7 +312,8 @@ class RestService(IOpenable, IConfigurable, IReferenceable, IUnreferenceable, IR
 
         return ''
 
-    def register_route(self, method: str, route: str, schema: Optional[Schema], handler: Callable):
+    def register_route(self, method: str, route: str, schema: Optional[Schema], handler: Callable,
+                       cache: HttpResponseCache = None, max_in_flight: int = None):
         """
         Registers an action in this objects REST server (service) by the given method and route.
 
@@ -309,6 +324,12 @@ class RestService(IOpenable, IConfigurable, IReferenceable, IUnreferenceable, IR
         :param schema: the schema to use for parameter validation.
 
         :param handler: the action to perform at the given route.
+
+        :param cache: (optional) the cache to keep responses of a GET route,
+                      see :class:`HttpResponseCache <pip_services3_rpc.services.HttpResponseCache.HttpResponseCache>`.
+
+        :param max_in_flight: (optional) the maximum number of requests to the route processed at the same time,
+                              or the maximum adaptive limit when *options.adaptive_concurrency* is enabled.
         """
         if self._endpoint is None:
             return
@@ -321,7 +342,7 @@ class RestService(IOpenable, IConfigurable, IReferenceable, IUnreferenceable, IR
         #     if route[0] != '/':
         #         base_route = base_route + '/'
         #     route = base_route + route
-        self._endpoint.register_route(method, route, schema, handler)
+        self._endpoint.register_route(method, route, schema, handler, cache, max_in_flight)
 
     @abstractmethod
     def register(self):
@@ -333,11 +354,9 @@ class RestService(IOpenable, IConfigurable, IReferenceable, IUnreferenceable, IR
         """
 
     def _get_data(self) -> dict:
-        data = bottle.request.json
-        if isinstance(data, str):
-            return json.loads(bottle.request.json)
-        elif bottle.request.json:
-            return bottle.request.json
+        data = HttpRequestBody.get_json()
+        if data:
+            return data
         else:
             return {}
 
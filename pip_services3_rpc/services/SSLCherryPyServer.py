@@ -10,19 +10,60 @@
     :license: MIT, see LICENSE for more details.
 """
 
+import socket
 import ssl
 import logging
+import time
+from threading import Event, Thread
+from typing import Optional
 
 from bottle import ServerAdapter
 from cheroot import wsgi
 from cheroot.ssl.builtin import BuiltinSSLAdapter
 
 
+class _ReusePortServer(wsgi.Server):
+
+    @staticmethod
+    def prepare_socket(bind_addr, family, type, proto, nodelay, ssl_adapter):
+        sock = wsgi.Server.prepare_socket(bind_addr, family, type, proto, nodelay, ssl_adapter)
+        # Lets several worker processes listen on the same port, the kernel balances connections between them
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        return sock
+
+
 class SSLCherryPyServer(ServerAdapter):
+    """
+    Server adapter that runs a bottle application on the threaded cheroot server.
+
+    Cheroot does not resize its thread pool by itself. When *max_threads* is greater than *threads*
+    the adapter checks the pool every *balance_interval* seconds on a daemon thread: it adds threads
+    while all of them are busy and connections wait in the queue, and removes idle threads back
+    to *threads*. Growing the pool is best-effort, a burst shorter than the interval is served
+    by the configured threads.
+
+    When *on_stats* callback is set it is called every *stats_interval* seconds with a map
+    that contains the number of threads, idle threads and queued connections.
+    """
+
     server = None
 
     def run(self, handler):
-        self.server = wsgi.Server((self.host, self.port), handler)
+        reuse_port = self.options.pop('reuse_port', False)
+        self.__on_stats = self.options.pop('on_stats', None)
+        self.__stats_interval = self.options.pop('stats_interval', 1)
+        self.__balance_interval = self.options.pop('balance_interval', 0.1)
+        self.__stopped = Event()
+
+        server_type = _ReusePortServer if reuse_port else wsgi.Server
+        self.server = server_type((self.host, self.port), handler,
+                                  numthreads=self.options.pop('threads', 10),
+                                  max=self.options.pop('max_threads', -1),
+                                  request_queue_size=self.options.pop('backlog', 5),
+                                  timeout=self.options.pop('keepalive_timeout', 10),
+                                  shutdown_timeout=self.options.pop('shutdown_timeout', 5),
+                                  accepted_queue_size=self.options.pop('accepted_queue_size', -1),
+                                  accepted_queue_timeout=self.options.pop('accepted_queue_timeout', 10))
 
         certfile = self.options.pop('certfile', None)
         keyfile = self.options.pop('keyfile', None)
@@ -35,6 +76,8 @@ class SSLCherryPyServer(ServerAdapter):
             self.server.ssl_adapter.context.options |= ssl.OP_NO_TLSv1
             self.server.ssl_adapter.context.options |= ssl.OP_NO_TLSv1_1
 
+        Thread(target=self.__supervise, args=(self.server,), daemon=True).start()
+
         try:
             self.server.start()
         except Exception as e:
@@ -42,8 +85,64 @@ class SSLCherryPyServer(ServerAdapter):
 
             if self.server:
                 self.server.stop()
+        finally:
+            self.__stopped.set()
+
+    def get_thread_stats(self) -> Optional[dict]:
+        """
+        Gets the current occupancy of the worker thread pool.
+
+        :return: a map with total number of threads, idle threads and queued connections
+                 or None if the server is not running.
+        """
+        server = self.server
+        if server is None or not server.ready:
+            return None
+
+        # Cheroot exposes the pool state through its statistics map
+        stats = server.stats
+        return {
+            'threads': stats['Threads'](stats),
+            'idle': stats['Threads Idle'](stats),
+            'queue': stats['Queue'](stats)
+        }
+
+    def balance_threads(self):
+        """
+        Grows the worker thread pool when all threads are busy and connections wait in the queue,
+        and shrinks it back when threads stay idle. The pool size is kept between
+        the configured number of threads and maximum number of threads.
+        """
+        server = self.server
+        if server is None or not server.ready:
+            return
+
+        pool = server.requests
+        if pool.max <= pool.min:
+            return
+
+        if pool.qsize > 0 and pool.idle == 0:
+            pool.grow(pool.qsize)
+        elif pool.idle > 1 and pool.qsize == 0:
+            pool.shrink(pool.idle // 2)
 
     def shutdown(self):
         if self.server:
             self.server.stop()
             self.server = None
+
+    def __supervise(self, server):
+        last_stats_time = time.perf_counter()
+        while not self.__stopped.wait(self.__balance_interval):
+            if self.server is not server:
+                return
+
+            try:
+                self.balance_threads()
+                if self.__on_stats is not None and time.perf_counter() - last_stats_time >= self.__stats_interval:
+                    last_stats_time = time.perf_counter()
+                    stats = self.get_thread_stats()
+                    if stats is not None:
+                        self.__on_stats(stats)
+            except Exception as e:
+                logging.error(e, exc_info=True)
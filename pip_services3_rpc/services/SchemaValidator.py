@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.SchemaValidator
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Validator compiled from validation schemas
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from typing import Any, Callable, Dict, List, Optional
+
+from pip_services3_commons.convert import TypeCode, TypeConverter, StringConverter
+from pip_services3_commons.reflect import ObjectReader, TypeMatcher
+from pip_services3_commons.validate import Schema, ObjectSchema, PropertySchema, ArraySchema, MapSchema, \
+    ValidationResult, ValidationResultType, ValidationException
+
+# Validates a value at the given path and adds found problems into the results
+_Validation = Callable[[str, Any, List[ValidationResult]], None]
+
+# Actual type codes accepted for expected type codes besides the same type code
+_NUMERIC_TYPES = {TypeCode.Integer, TypeCode.Long, TypeCode.Float, TypeCode.Double}
+
+# Type codes depend only on value types, so they are resolved once for every type
+_type_codes: Dict[type, TypeCode] = {}
+
+
+def _to_type_code(value: Any) -> TypeCode:
+    value_type = type(value)
+    code = _type_codes.get(value_type)
+    if code is None:
+        if isinstance(value, type):
+            # Types are converted into their own type codes
+            return TypeConverter.to_type_code(value)
+        code = TypeConverter.to_type_code(value)
+        _type_codes[value_type] = code
+    return code
+
+
+class SchemaValidator:
+    """
+    Validator compiled once from a :class:`Schema <pip_services3_commons.validate.Schema.Schema>`
+    into plain functions: property checks of object schemas are flattened, expected types are resolved
+    in advance and only present properties are searched in validated objects.
+
+    It produces the same validation results as the schema itself.
+    Schemas with custom validation code are called as they are.
+    The schema shall not be changed after the validator is created.
+
+    Example:
+
+    .. code-block:: python
+
+        validator = SchemaValidator(ObjectSchema().with_required_property("name", TypeCode.String))
+        validator.validate_and_throw_exception("123", {"name": 1})      # Raises ValidationException
+    """
+
+    def __init__(self, schema: Schema):
+        """
+        Creates a new validator and compiles the schema.
+
+        :param schema: a schema to validate values against.
+        """
+        self.__compiled: Dict[int, _Validation] = {}
+        self.__validation = self.__compile(schema)
+
+    def validate(self, value: Any) -> List[ValidationResult]:
+        """
+        Validates the given value and returns validation results.
+
+        :param value: a value to be validated.
+        :return: a list with validation results.
+        """
+        results = []
+        self.__validation("", value, results)
+        return results
+
+    def validate_and_throw_exception(self, correlation_id: Optional[str], value: Any, strict: bool = False):
+        """
+        Validates the given value and throws a :class:`ValidationException <pip_services3_commons.validate.ValidationException.ValidationException>` if errors were found.
+
+        :param correlation_id: (optional) transaction id to trace execution through call chain.
+        :param value: a value to be validated.
+        :param strict: true to treat warnings as errors.
+        """
+        results = self.validate(value)
+        if len(results) > 0:
+            ValidationException.throw_exception_if_needed(correlation_id, results, strict)
+
+    def __compile(self, schema: Schema) -> _Validation:
+        key = id(schema)
+        if key in self.__compiled:
+            return self.__compiled[key]
+
+        # Nested schemas may refer back to the compiled one
+        holder = []
+        self.__compiled[key] = lambda path, value, results: holder[0](path, value, results)
+
+        method = type(schema)._perform_validation
+        if method is ObjectSchema._perform_validation:
+            validation = self.__compile_object(schema)
+        elif method is PropertySchema._perform_validation:
+            validation = self.__compile_property(schema)
+        elif method is ArraySchema._perform_validation:
+            validation = self.__compile_array(schema)
+        elif method is MapSchema._perform_validation:
+            validation = self.__compile_map(schema)
+        elif method is Schema._perform_validation:
+            validation = self.__compile_schema(schema) or (lambda path, value, results: None)
+        else:
+            validation = schema._perform_validation
+
+        holder.append(validation)
+        self.__compiled[key] = validation
+        return validation
+
+    @staticmethod
+    def __compile_schema(schema: Schema) -> Optional[_Validation]:
+        required = schema.is_required()
+        rules = list(schema.get_rules() or [])
+        if not required and len(rules) == 0:
+            return None
+
+        def validate(path: str, value: Any, results: List[ValidationResult]):
+            if value is None:
+                if required:
+                    results.append(ValidationResult(path, ValidationResultType.Error, "VALUE_IS_NULL",
+                                                    (path or "args") + " must not be null", "NOT NULL", None))
+            else:
+                for rule in rules:
+                    rule.validate(path, schema, value, results)
+
+        return validate
+
+    def __compile_type(self, typ: Any) -> Optional[_Validation]:
+        if typ is None:
+            return None
+        if isinstance(typ, Schema):
+            return self.__compile(typ)
+
+        expected_name = TypeConverter.to_string(typ) if isinstance(typ, TypeCode) else str(typ)
+        if isinstance(typ, TypeCode) and typ != TypeCode.DateTime:
+            accepted = {typ} | (_NUMERIC_TYPES if typ in _NUMERIC_TYPES else set())
+            match = lambda value_type, value: value_type in accepted
+        elif isinstance(typ, type):
+            match = lambda value_type, value: issubclass(type(value), typ)
+        else:
+            match = lambda value_type, value: TypeMatcher.match_type(typ, value_type, value)
+
+        def validate(path: str, value: Any, results: List[ValidationResult]):
+            if value is None:
+                return
+            value_type = _to_type_code(value)
+            if not match(value_type, value):
+                results.append(ValidationResult(path, ValidationResultType.Error, "TYPE_MISMATCH",
+                                                (path or "args") + " type must be " + expected_name
+                                                + " but found " + TypeConverter.to_string(value_type),
+                                                typ, value_type))
+
+        return validate
+
+    def __compile_property(self, schema: PropertySchema) -> _Validation:
+        name = schema.get_name()
+        validate_value = self.__compile_schema(schema)
+        validate_type = self.__compile_type(schema.get_type())
+
+        def validate(path: str, value: Any, results: List[ValidationResult]):
+            path = name if path is None or len(path) == 0 else path + "." + name
+            if validate_value is not None:
+                validate_value(path, value, results)
+            if validate_type is not None:
+                validate_type(path, value, results)
+
+        return validate
+
+    def __compile_object(self, schema: ObjectSchema) -> _Validation:
+        validate_value = self.__compile_schema(schema)
+        allow_undefined = schema.is_undefined_allowed
+
+        # Checks of regular properties are flattened into the object validation
+        properties = []
+        for property_schema in schema.get_properties() or []:
+            name = property_schema.get_name()
+            if type(property_schema)._perform_validation is PropertySchema._perform_validation:
+                typ = property_schema.get_type()
+                validate_property_value = self.__compile_schema(property_schema)
+                # Missing optional properties can be skipped unless their type is a schema that checks nulls
+                skip_missing = validate_property_value is None and not isinstance(typ, Schema)
+                properties.append((name, None, validate_property_value, self.__compile_type(typ), skip_missing))
+            else:
+                properties.append((name, self.__compile(property_schema), None, None, False))
+
+        def validate(path: str, value: Any, results: List[ValidationResult]):
+            if value is None:
+                if validate_value is not None:
+                    validate_value(path, value, results)
+                return
+
+            values = ObjectReader.get_properties(value)
+            if not all(isinstance(key, str) for key in values.keys()):
+                # Keys of other types are matched by the schema in its own way
+                schema._perform_validation(path, value, results)
+                return
+
+            if validate_value is not None:
+                validate_value(path, value, results)
+
+            for (name, validate_property, validate_property_value, validate_type, skip_missing) in properties:
+                property_value = values.pop(name, None)
+                if validate_property is not None:
+                    validate_property(path, property_value, results)
+                    continue
+                if property_value is None and skip_missing:
+                    continue
+
+                property_path = name if path is None or len(path) == 0 else path + "." + name
+                if validate_property_value is not None:
+                    validate_property_value(property_path, property_value, results)
+                if validate_type is not None:
+                    validate_type(property_path, property_value, results)
+
+            if not allow_undefined:
+                name = path or "args"
+                for key in values.keys():
+                    property_path = key if path is None or len(path) == 0 else path + "." + key
+                    results.append(ValidationResult(property_path, ValidationResultType.Warning,
+                                                    "UNEXPECTED_PROPERTY",
+                                                    name + " contains unexpected property " + str(key), None, key))
+
+        return validate
+
+    def __compile_array(self, schema: ArraySchema) -> _Validation:
+        validate_value = self.__compile_schema(schema)
+        validate_element = self.__compile_type(schema.get_value_type())
+
+        def validate(path: str, value: Any, results: List[ValidationResult]):
+            if validate_value is not None:
+                validate_value(path, value, results)
+            if value is None:
+                return
+
+            if isinstance(value, (set, list, tuple)):
+                if validate_element is not None:
+                    for (index, element) in enumerate(value):
+                        element_path = str(index) if path is None or len(path) == 0 else path + "." + str(index)
+                        validate_element(element_path, element, results)
+            else:
+                results.append(ValidationResult(path, ValidationResultType.Error, "VALUE_ISNOT_ARRAY",
+                                                (path or "args") + " type must be List or Array",
+                                                TypeCode.Array, _to_type_code(value)))
+
+        return validate
+
+    def __compile_map(self, schema: MapSchema) -> _Validation:
+        validate_value = self.__compile_schema(schema)
+        validate_key = self.__compile_type(schema.get_key_type())
+        validate_element = self.__compile_type(schema.get_value_type())
+
+        def validate(path: str, value: Any, results: List[ValidationResult]):
+            if validate_value is not None:
+                validate_value(path, value, results)
+            if value is None:
+                return
+
+            if isinstance(value, dict):
+                for (key, element) in value.items():
+                    element_path = StringConverter.to_string(key) if path is None or len(path) == 0 \
+                        else path + "." + key
+                    if validate_key is not None:
+                        validate_key(element_path, key, results)
+                    if validate_element is not None:
+                        validate_element(element_path, element, results)
+            else:
+                results.append(ValidationResult(path, ValidationResultType.Error, "VALUE_ISNOT_MAP",
+                                                (path or "args") + " type must be Map", TypeCode.Map, None))
+
+        return validate
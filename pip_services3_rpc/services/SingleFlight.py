@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+    pip_services3_rpc.services.SingleFlight
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Coalescing of identical concurrent calls
+
+    :copyright: Conceptual Vision Consulting LLC 2018-2019, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import inspect
+from concurrent.futures import Future, TimeoutError
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import bottle
+from pip_services3_commons.errors import InvocationException
+
+
+class _Response:
+
+    def __init__(self, result: Any, shared: bool):
+        self.result = result
+        self.shared = shared
+        self.status = bottle.response.status_line
+        self.headers = list(bottle.response.headerlist) if shared else []
+
+
+class SingleFlight:
+    """
+    Lets identical calls that run at the same time share one execution: the first call executes
+    and the calls that come while it is in flight wait for it and receive the same result or error.
+    It flattens bursts of identical requests, for instance after a cache expires.
+
+    REST clients use it for GET calls when *options.single_flight* is enabled. Services can wrap
+    handlers of idempotent GET routes with :func:`wrap`, so concurrent requests with the same path,
+    query parameters (except correlation_id) and selected headers are processed once.
+
+    Example:
+
+    .. code-block:: python
+
+        class MyRestService(RestService):
+
+            def __init__(self):
+                super().__init__()
+                self.__flight = SingleFlight()
+
+            def __get_report(self):
+                return self.send_result(self._controller.build_report(self._get_correlation_id()))
+
+            def register(self):
+                self.register_route('get', '/report', None, self.__flight.wrap(self.__get_report))
+    """
+
+    # Query parameters that differ for every call and do not change the result
+    _ignored_params = ('correlation_id',)
+
+    def __init__(self):
+        """
+        Creates a new instance of the single flight.
+        """
+        self.__calls: Dict[Hashable, Future] = {}
+        self.__lock = Lock()
+
+    def execute(self, key: Hashable, func: Callable[[], Any], timeout: float = None) -> Tuple[Any, bool]:
+        """
+        Executes the function unless a call with the same key is in flight, otherwise waits for its result.
+
+        :param key: the key of identical calls.
+        :param func: the function to execute.
+        :param timeout: (optional) the time in seconds to wait for the call in flight.
+        :return: the result of the function and true if it was shared with another call.
+        :raises: the error raised by the function or InvocationException with "DEADLINE_EXCEEDED" code
+                 when the call in flight did not complete in time.
+        """
+        (future, leader) = self.__join(key)
+        if not leader:
+            try:
+                return future.result(timeout=timeout), True
+            except TimeoutError:
+                raise InvocationException(None, 'DEADLINE_EXCEEDED', 'Shared call did not complete in time')
+
+        try:
+            result = func()
+        except BaseException as ex:
+            self.__complete(key, future, error=ex)
+            raise
+        self.__complete(key, future, result=result)
+        return result, False
+
+    async def execute_async(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executes the coroutine function unless a call with the same key is in flight, otherwise waits for its result.
+        Calls in flight are shared between threads and event loops.
+
+        :param key: the key of identical calls.
+        :param func: the coroutine function to execute.
+        :return: the result of the function and true if it was shared with another call.
+        :raises: the error raised by the function.
+        """
+        (future, leader) = self.__join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+
+        try:
+            result = await func()
+        except BaseException as ex:
+            self.__complete(key, future, error=ex)
+            raise
+        self.__complete(key, future, result=result)
+        return result, False
+
+    def wrap(self, handler: Callable, vary_headers: List[str] = None) -> Callable:
+        """
+        Wraps a route handler, so concurrent identical requests are processed by one handler call.
+        Waiting requests get the same status, headers and body. Handlers that return generators
+        cannot share their results and are called for every request.
+
+        :param handler: the route handler. It can be a regular function or a coroutine function.
+        :param vary_headers: (optional) names of request headers that select different results.
+        :return: the wrapped handler.
+        """
+        vary_headers = [header.title() for header in vary_headers or []]
+
+        def capture(result: Any) -> _Response:
+            return _Response(result, isinstance(result, (str, bytes, dict, list)) or result is None)
+
+        if inspect.iscoroutinefunction(handler):
+            async def async_wrapper(*args, **kwargs):
+                async def call():
+                    return capture(await handler(*args, **kwargs))
+
+                (response, shared) = await self.execute_async(self.__get_request_key(vary_headers), call)
+                if shared and not response.shared:
+                    return await handler(*args, **kwargs)
+                return self.__send(response, shared)
+
+            return async_wrapper
+
+        def wrapper(*args, **kwargs):
+            (response, shared) = self.execute(self.__get_request_key(vary_headers),
+                                              lambda: capture(handler(*args, **kwargs)))
+            if shared and not response.shared:
+                return handler(*args, **kwargs)
+            return self.__send(response, shared)
+
+        return wrapper
+
+    def __join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self.__lock:
+            future = self.__calls.get(key)
+            if future is not None:
+                return future, False
+            future = self.__calls[key] = Future()
+            return future, True
+
+    def __complete(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        # The key is released first, so calls that come later start a new execution
+        with self.__lock:
+            self.__calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def __get_request_key(self, vary_headers: List[str]) -> Tuple:
+        request = bottle.request
+        query = tuple(sorted((name, value) for (name, value) in request.query.allitems()
+                             if name not in self._ignored_params))
+        headers = tuple(request.headers.get(header) for header in vary_headers)
+        return request.method, request.path, query, headers
+
+    @staticmethod
+    def __send(response: _Response, shared: bool) -> Any:
+        if shared:
+            bottle.response.status = response.status
+            names = set()
+            for (name, value) in response.headers:
+                if name in names:
+                    bottle.response.add_header(name, value)
+                else:
+                    bottle.response.set_header(name, value)
+                    names.add(name)
+        return response.result
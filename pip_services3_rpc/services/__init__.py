@@ -12,22 +12,37 @@
 __all__ = ['CommandableHttpService', 'RestService', 'RestOperations', 'RestQueryParams', 'CommandableSwaggerDocument',
            'SSLCherryPyServer', 'StatusRestService', 'IRegisterable', 'HttpResponseSender', 'HttpEndpoint',
            'HeartbeatRestService', 'HeartBeatOperations', 'AboutOperations', 'HttpRequestDetector', 'StatusOperations',
-           'InstrumentTiming', 'ISwaggerService']
+           'InstrumentTiming', 'ISwaggerService', 'AsgiHttpServer',
+           'PreforkServer', 'HttpCompressor', 'SchemaValidator',
+           'HttpRequestBody', 'HttpRequestDeadline', 'HttpResponseCache', 'SingleFlight', 'AdmissionController',
+           'AdaptiveConcurrencyLimiter', 'JsonCodec', 'OrjsonCodec']
 
 from .AboutOperations import AboutOperations
+from .AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+from .AdmissionController import AdmissionController
+from .AsgiHttpServer import AsgiHttpServer
 from .CommandableHttpService import CommandableHttpService
 from .CommandableSwaggerDocument import CommandableSwaggerDocument
 from .HeartBeatOperations import HeartBeatOperations
 from .HeartbeatRestService import HeartbeatRestService
+from .HttpCompressor import HttpCompressor
 from .HttpEndpoint import HttpEndpoint
+from .HttpRequestBody import HttpRequestBody
+from .HttpRequestDeadline import HttpRequestDeadline
 from .HttpRequestDetector import HttpRequestDetector
+from .HttpResponseCache import HttpResponseCache
 from .HttpResponseSender import HttpResponseSender
 from .IRegisterable import IRegisterable
 from .ISwaggerService import ISwaggerService
 from .InstrumentTiming import InstrumentTiming
+from .JsonCodec import JsonCodec
+from .OrjsonCodec import OrjsonCodec
+from .PreforkServer import PreforkServer
 from .RestOperations import RestOperations
 from .RestQueryParams import RestQueryParams
 from .RestService import RestService
 from .SSLCherryPyServer import SSLCherryPyServer
+from .SchemaValidator import SchemaValidator
+from .SingleFlight import SingleFlight
 from .StatusOperations import StatusOperations
 from .StatusRestService import StatusRestService
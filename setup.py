@@ -45,6 +45,12 @@ setup(
         'pip-services3-commons >= 3.3.14, < 4.0',
         'pip-services3-components >= 3.5.9, < 4.0'
     ],
+    extras_require={
+        'async': ['aiohttp >= 3.8.0, < 4.0'],
+        'asgi': ['uvicorn >= 0.15.0, < 1.0'],
+        'brotli': ['brotli >= 1.0.9, < 2.0'],
+        'fast': ['orjson >= 3.6.0, < 4.0']
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
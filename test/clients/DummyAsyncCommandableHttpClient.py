@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+    test.rest.DummyAsyncCommandableHttpClient
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Dummy asynchronous commandable HTTP client
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from typing import Optional
+
+from pip_services3_commons.data import DataPage, FilterParams, PagingParams
+
+from pip_services3_rpc.clients import AsyncCommandableHttpClient
+from .. import Dummy
+
+
+class DummyAsyncCommandableHttpClient(AsyncCommandableHttpClient):
+
+    def __init__(self):
+        super(DummyAsyncCommandableHttpClient, self).__init__('dummy')
+
+    async def get_page_by_filter(self, correlation_id: Optional[str], filter: FilterParams,
+                                 paging: PagingParams) -> DataPage:
+        result = await self.call_command(
+            'get_dummies',
+            correlation_id,
+            {
+                'filter': filter,
+                'paging': paging
+            }
+        )
+        return DataPage(
+            data=[Dummy.from_json(item) for item in result['data']],
+            total=result['total']
+        )
+
+    async def get_one_by_id(self, correlation_id: Optional[str], dummy_id: str) -> Dummy:
+        response = await self.call_command(
+            'get_dummy_by_id',
+            correlation_id,
+            {
+                'dummy_id': dummy_id
+            }
+        )
+        if response:
+            return Dummy.from_json(response)
+
+    async def create(self, correlation_id: Optional[str], item: Dummy) -> Dummy:
+        response = await self.call_command(
+            'create_dummy',
+            correlation_id,
+            {
+                'dummy': item
+            }
+        )
+        if response:
+            return Dummy.from_json(response)
+
+    async def delete_by_id(self, correlation_id: Optional[str], dummy_id: str) -> Dummy:
+        response = await self.call_command(
+            'delete_dummy',
+            correlation_id,
+            {
+                'dummy_id': dummy_id
+            }
+        )
+        if response:
+            return Dummy.from_json(response)
+
+    async def check_correlation_id(self, correlation_id: Optional[str]) -> str:
+        result = await self.call_command(
+            'check_correlation_id',
+            correlation_id,
+            {}
+        )
+        return None if not result else result.get('correlation_id')
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.clients.test_CircuitBreaker
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+
+import pytest
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ApplicationException
+
+from pip_services3_rpc.clients import CircuitBreaker, CircuitOpenException, RestClient
+from pip_services3_rpc.services import RestService
+
+KEY = 'http://localhost:3026'
+
+
+def create_breaker(changes: list, *tuples) -> CircuitBreaker:
+    breaker = CircuitBreaker(lambda key, state: changes.append(state))
+    breaker.configure(ConfigParams.from_tuples(
+        'options.circuit_breaker', True,
+        'options.breaker_min_calls', 4,
+        'options.breaker_window', 10,
+        'options.breaker_open_time', 100,
+        'options.breaker_trial_calls', 2,
+        *tuples
+    ))
+    return breaker
+
+
+class FailingRestService(RestService):
+
+    def __init__(self):
+        super(FailingRestService, self).__init__()
+        self._base_route = 'failing'
+        self.calls = 0
+
+    def __fail(self):
+        self.calls += 1
+        raise Exception('Service is degraded')
+
+    def __ok(self):
+        self.calls += 1
+        return self.send_result({'ok': True})
+
+    def register(self):
+        self.register_route('get', '/fail', None, self.__fail)
+        self.register_route('get', '/ok', None, self.__ok)
+
+
+class FailingRestClient(RestClient):
+
+    def __init__(self):
+        super(FailingRestClient, self).__init__()
+        self._base_route = 'failing'
+
+    def call(self, route: str):
+        return self._call('get', route, None)
+
+
+class TestCircuitBreaker:
+
+    def test_failure_rate(self):
+        changes = []
+        breaker = create_breaker(changes)
+
+        for failed in [False, True, False]:
+            assert breaker.allow(KEY)
+            breaker.record(KEY, 1, failed)
+        assert breaker.get_state(KEY) == CircuitBreaker.CLOSED
+
+        breaker.record(KEY, 1, True)
+        assert breaker.get_state(KEY) == CircuitBreaker.OPEN
+        assert not breaker.allow(KEY)
+        assert changes == [CircuitBreaker.OPEN]
+
+        # Trial calls are limited in half-open state and close the circuit when they succeed
+        time.sleep(0.15)
+        assert breaker.allow(KEY)
+        assert breaker.allow(KEY)
+        assert not breaker.allow(KEY)
+        breaker.record(KEY, 1, False)
+        breaker.record(KEY, 1, False)
+        assert breaker.get_state(KEY) == CircuitBreaker.CLOSED
+        assert changes == [CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN, CircuitBreaker.CLOSED]
+
+    def test_failed_trial(self):
+        changes = []
+        breaker = create_breaker(changes, 'options.breaker_failure_rate', 100)
+        for _ in range(4):
+            breaker.record(KEY, 1, True)
+        assert breaker.get_state(KEY) == CircuitBreaker.OPEN
+
+        time.sleep(0.15)
+        assert breaker.allow(KEY)
+        breaker.record(KEY, 1, True)
+        assert breaker.get_state(KEY) == CircuitBreaker.OPEN
+        assert not breaker.allow(KEY)
+
+    def test_slow_calls(self):
+        breaker = create_breaker([], 'options.breaker_slow_call_time', 50, 'options.breaker_slow_call_rate', 50)
+        for duration in [10, 60, 10, 60]:
+            breaker.record(KEY, duration, False)
+        assert breaker.get_state(KEY) == CircuitBreaker.OPEN
+
+    def test_keys(self):
+        breaker = create_breaker([])
+        assert breaker.get_key(KEY, 'get', '/fail') == KEY
+
+        breaker = create_breaker([], 'options.breaker_per_route', True)
+        assert breaker.get_key(KEY, 'get', '/fail') == KEY + ' GET /fail'
+
+    def test_disabled(self):
+        breaker = CircuitBreaker()
+        for _ in range(100):
+            breaker.record(KEY, 1, True)
+        assert breaker.allow(KEY)
+
+    def test_rest_client(self):
+        service = FailingRestService()
+        service.configure(ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3026
+        ))
+        service.open(None)
+
+        client = FailingRestClient()
+        client.configure(ConfigParams.from_tuples(
+            'connection.uri', KEY,
+            'options.retries', 0,
+            'options.circuit_breaker', True,
+            'options.breaker_min_calls', 4,
+            'options.breaker_open_time', 200,
+            'options.breaker_trial_calls', 1
+        ))
+        client.open(None)
+        try:
+            for _ in range(4):
+                with pytest.raises(ApplicationException) as err:
+                    client.call('/fail')
+                assert not isinstance(err.value, CircuitOpenException)
+
+            # Calls fail fast without reaching the service
+            with pytest.raises(CircuitOpenException):
+                client.call('/ok')
+            assert service.calls == 4
+
+            time.sleep(0.25)
+            assert client.call('/ok') == {'ok': True}
+            assert client.call('/ok') == {'ok': True}
+        finally:
+            client.close(None)
+            service.close(None)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.rest.test_DummyAsyncCommandableHttpClient
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+
+import pytest
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.data import FilterParams, PagingParams
+from pip_services3_commons.errors import BadRequestException, InvocationException
+from pip_services3_commons.refer import Descriptor, References
+
+from .DummyAsyncCommandableHttpClient import DummyAsyncCommandableHttpClient
+from ..Dummy import Dummy
+from ..DummyController import DummyController
+from ..SubDummy import SubDummy
+from ..services.DummyCommandableHttpService import DummyCommandableHttpService
+
+pytest.importorskip('aiohttp')
+
+DUMMY1 = Dummy(None, 'Key 1', 'Content 1', [SubDummy('SubKey 1', 'SubContent 1')])
+DUMMY2 = Dummy(None, 'Key 2', 'Content 2', [SubDummy('SubKey 2', 'SubContent 2')])
+
+rest_config = ConfigParams.from_tuples(
+    "connection.protocol", "http",
+    'connection.host', 'localhost',
+    'connection.port', 3007,
+    'batch.enabled', True
+)
+
+
+class TestDummyAsyncCommandableHttpClient:
+    service: DummyCommandableHttpService
+
+    @classmethod
+    def setup_class(cls):
+        controller = DummyController()
+
+        cls.service = DummyCommandableHttpService()
+        cls.service.configure(rest_config)
+
+        references = References.from_tuples(
+            Descriptor("pip-services-dummies", "controller", "default", "default", "1.0"), controller,
+            Descriptor("pip-services-dummies", "service", "http", "default", "1.0"), cls.service
+        )
+
+        cls.service.set_references(references)
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+
+    def test_crud_operations(self):
+        async def run():
+            client = DummyAsyncCommandableHttpClient()
+            client.configure(rest_config)
+            client.set_references(References())
+            await client.open(None)
+
+            try:
+                dummy1, dummy2 = await asyncio.gather(client.create(None, DUMMY1), client.create(None, DUMMY2))
+                assert dummy1.id is not None
+                assert DUMMY1.key == dummy1.key
+                assert DUMMY2.content == dummy2.content
+
+                dummies = await client.get_page_by_filter(None, FilterParams(), PagingParams(0, 5, False))
+                assert len(dummies.data) >= 2
+
+                await client.delete_by_id(None, dummy1.id)
+                dummy = await client.get_one_by_id(None, dummy1.id)
+                assert dummy is None
+
+                result = await client.check_correlation_id('test_cor_id')
+                assert 'test_cor_id' == result
+            finally:
+                await client.close(None)
+
+        asyncio.run(run())
+
+    def test_error_response(self):
+        async def run():
+            client = DummyAsyncCommandableHttpClient()
+            client.configure(rest_config)
+            client.set_references(References())
+            await client.open(None)
+
+            try:
+                # Invalid parameters are rejected by the service with 400 status
+                with pytest.raises(BadRequestException) as err:
+                    await client.call_command('create_dummy', '123', {})
+                assert err.value.status == 400
+                assert err.value.correlation_id == '123'
+            finally:
+                await client.close(None)
+
+        asyncio.run(run())
+
+    def test_call_commands(self):
+        async def run():
+            client = DummyAsyncCommandableHttpClient()
+            client.configure(rest_config)
+            client.set_references(References())
+            await client.open(None)
+
+            try:
+                results = await client.call_commands('123', [
+                    {'command': 'get_dummy_by_id', 'args': {'dummy_id': 'unknown'}},
+                    {'command': 'unknown'},
+                    {'command': 'check_correlation_id'}
+                ], True)
+
+                assert results[0] is None
+                assert isinstance(results[1], BadRequestException)
+                assert results[2] == {'correlation_id': '123'}
+            finally:
+                await client.close(None)
+
+        asyncio.run(run())
+
+    def test_call_commands_parallel(self):
+        async def run():
+            client = DummyAsyncCommandableHttpClient()
+            client.configure(rest_config)
+            client.set_references(References())
+            await client.open(None)
+
+            commands = [
+                {'command': 'get_dummy_by_id', 'args': {'dummy_id': 'unknown'}},
+                {'command': 'create_dummy', 'args': {}},
+                {'command': 'check_correlation_id'}
+            ]
+            try:
+                results = await client.call_commands_parallel('123', commands, 5000)
+                assert results[0] is None
+                assert isinstance(results[1], BadRequestException)
+                assert results[2] == {'correlation_id': '123'}
+
+                results = await client.call_commands_parallel('123', commands, 0)
+                assert all(isinstance(result, InvocationException) for result in results)
+            finally:
+                await client.close(None)
+
+        asyncio.run(run())
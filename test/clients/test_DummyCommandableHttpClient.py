@@ -10,17 +10,20 @@
 import time
 
 from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import BadRequestException, InvocationException
 from pip_services3_commons.refer import Descriptor, References
 
 from .DummyClientFixture import DummyClientFixture
 from .DummyCommandableHttpClient import DummyCommandableHttpClient
+from ..Dummy import Dummy
 from ..DummyController import DummyController
 from ..services.DummyCommandableHttpService import DummyCommandableHttpService
 
 rest_config = ConfigParams.from_tuples(
     "connection.protocol", "http",
     'connection.host', 'localhost',
-    'connection.port', 3001
+    'connection.port', 3001,
+    'batch.enabled', True
 )
 
 
@@ -65,3 +68,38 @@ class TestDummyCommandableHttpClient:
 
     def test_crud_operations(self):
         self.fixture.test_crud_operations()
+
+    def test_call_commands(self):
+        dummy = Dummy(None, 'Key 1', 'Content 1', [])
+        for parallel in [None, True]:
+            results = self.client.call_commands('123', [
+                {'command': 'create_dummy', 'args': {'dummy': dummy.to_json()}},
+                {'command': 'create_dummy', 'args': {}},
+                {'command': 'check_correlation_id'}
+            ], parallel)
+
+            assert len(results) == 3
+            assert results[0]['key'] == dummy.key
+            assert isinstance(results[1], BadRequestException)
+            assert results[1].correlation_id == '123'
+            assert results[2] == {'correlation_id': '123'}
+
+    def test_call_commands_parallel(self):
+        dummy = Dummy(None, 'Key 1', 'Content 1', [])
+        commands = [
+            {'command': 'create_dummy', 'args': {'dummy': dummy.to_json()}},
+            {'command': 'create_dummy', 'args': {}},
+            {'command': 'check_correlation_id'}
+        ]
+
+        results = self.client.call_commands_parallel('123', commands, 5000)
+        assert len(results) == 3
+        assert results[0]['key'] == dummy.key
+        assert isinstance(results[1], BadRequestException)
+        assert results[2] == {'correlation_id': '123'}
+
+        # Calls that are not completed at the deadline are reported as failed
+        results = self.client.call_commands_parallel('123', commands, 0)
+        assert len(results) == 3
+        assert all(isinstance(result, InvocationException) for result in results)
+        assert results[0].code == 'DEADLINE_EXCEEDED'
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.rest.test_DummyInprocCommandableHttpClient
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import pytest
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import BadRequestException, ConnectionException
+from pip_services3_commons.refer import Descriptor, References
+
+from .DummyClientFixture import DummyClientFixture
+from .DummyCommandableHttpClient import DummyCommandableHttpClient
+from ..Dummy import Dummy
+from ..DummyController import DummyController
+from ..services.DummyCommandableHttpService import DummyCommandableHttpService
+
+inproc_config = ConfigParams.from_tuples(
+    'connection.protocol', 'inproc'
+)
+
+
+class TestDummyInprocCommandableHttpClient:
+    service: DummyCommandableHttpService
+    client: DummyCommandableHttpClient
+
+    def setup_method(self):
+        controller = DummyController()
+
+        # The service is not opened, calls do not go through HTTP
+        self.service = DummyCommandableHttpService()
+        self.client = DummyCommandableHttpClient()
+        self.client.configure(inproc_config)
+
+        references = References.from_tuples(
+            Descriptor("pip-services-dummies", "controller", "default", "default", "1.0"), controller,
+            Descriptor("pip-services-dummies", "service", "http", "default", "1.0"), self.service,
+            Descriptor("pip-services-dummies", "client", "http", "default", "1.0"), self.client
+        )
+        self.service.set_references(references)
+        self.client.set_references(references)
+
+        self.client.open(None)
+
+    def teardown_method(self):
+        self.client.close(None)
+
+    def test_crud_operations(self):
+        assert self.client.is_open()
+        DummyClientFixture(self.client).test_crud_operations()
+
+    def test_same_values_and_errors(self):
+        dummy = self.client.call_command('create_dummy', '123', {'dummy': Dummy(None, 'Key', 'Content', [])})
+        assert isinstance(dummy, dict)
+        assert dummy['key'] == 'Key'
+
+        with pytest.raises(BadRequestException) as err:
+            self.client.call_command('create_dummy', '123', {})
+        assert err.value.correlation_id == '123'
+
+        results = self.client.call_commands('123', [
+            {'command': 'get_dummy_by_id', 'args': {'dummy_id': dummy['id']}},
+            {'command': 'unknown'}
+        ])
+        assert results[0] == dummy
+        assert isinstance(results[1], BadRequestException)
+
+    def test_missing_service(self):
+        client = DummyCommandableHttpClient()
+        client.configure(inproc_config)
+        client.set_references(References())
+
+        with pytest.raises(ConnectionException):
+            client.open(None)
@@ -6,10 +6,15 @@
     :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
     :license: MIT, see LICENSE for more details.
 """
+import json
+import time
+from threading import Thread
 
+import requests
 from pip_services3_commons.config import ConfigParams
 from pip_services3_commons.refer import Descriptor, References
 
+from pip_services3_rpc.services import SSLCherryPyServer
 from .DummyClientFixture import DummyClientFixture
 from .DummyRestClient import DummyRestClient
 from ..DummyController import DummyController
@@ -61,3 +66,66 @@ class TestDummyRestClient:
 
     def test_crud_operations(self):
         self.fixture.test_crud_operations()
+
+    def test_keep_alive_session(self):
+        session = self.client._client
+        assert isinstance(session, requests.Session)
+
+        self.fixture.test_crud_operations()
+        assert session is self.client._client
+
+        self.client.close(None)
+        assert self.client._client is None
+
+
+def remote_port_app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [json.dumps(environ['REMOTE_PORT']).encode('utf-8')]
+
+
+class TestRestClientKeepAlive:
+    server = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.server = SSLCherryPyServer(host='localhost', port=3011)
+        Thread(target=cls.server.run, args=(remote_port_app,), daemon=True).start()
+        time.sleep(0.5)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+
+    def create_client(self, keep_alive_timeout: int) -> DummyRestClient:
+        client = DummyRestClient()
+        client.configure(ConfigParams.from_tuples(
+            "connection.protocol", "http",
+            "connection.host", "localhost",
+            "connection.port", 3011,
+            "options.keep_alive_timeout", keep_alive_timeout
+        ))
+        client.open(None)
+        return client
+
+    def test_connection_reuse(self):
+        client = self.create_client(5000)
+        try:
+            ports = {client._call('GET', '/') for _ in range(5)}
+            # All calls are sent over the same server-side connection
+            assert len(ports) == 1
+        finally:
+            client.close(None)
+
+    def test_idle_connection_expiration(self):
+        client = self.create_client(100)
+        try:
+            port1 = client._call('GET', '/')
+            assert client._call('GET', '/') == port1
+
+            time.sleep(0.3)
+            # The connection stayed idle longer than keep alive timeout and is reopened
+            port2 = client._call('GET', '/')
+            assert port2 != port1
+            assert client._call('GET', '/') == port2
+        finally:
+            client.close(None)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.clients.test_HedgingPolicy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+
+from pip_services3_commons.config import ConfigParams
+
+from pip_services3_rpc.clients import HedgingPolicy, RestClient
+from pip_services3_rpc.services import RestService
+
+
+def create_policy(*tuples) -> HedgingPolicy:
+    policy = HedgingPolicy()
+    policy.configure(ConfigParams.from_tuples('options.hedging', True, *tuples))
+    return policy
+
+
+class ReplicaRestService(RestService):
+
+    def __init__(self, name: str, delay: float):
+        super(ReplicaRestService, self).__init__()
+        self._base_route = 'replica'
+        self.__name = name
+        self.__delay = delay
+
+    def __get_name(self):
+        time.sleep(self.__delay)
+        return self.send_result({'name': self.__name})
+
+    def register(self):
+        self.register_route('get', '/name', None, self.__get_name)
+
+
+class ReplicaRestClient(RestClient):
+
+    def __init__(self):
+        super(ReplicaRestClient, self).__init__()
+        self._base_route = 'replica'
+
+    def get_name(self) -> str:
+        return self._call('get', '/name', None)['name']
+
+
+class TestHedgingPolicy:
+
+    def test_can_hedge(self):
+        policy = create_policy()
+        assert policy.can_hedge('get')
+        assert policy.can_hedge('HEAD')
+        assert not policy.can_hedge('post')
+        assert policy.can_hedge('post', idempotent=True)
+        assert not HedgingPolicy().can_hedge('get')
+
+    def test_delay(self):
+        policy = create_policy('options.hedge_delay', 200, 'options.hedge_min_samples', 10,
+                               'options.hedge_percentile', 90)
+        assert policy.get_delay() == 0.2
+
+        for duration in range(1, 101):
+            policy.record(duration)
+        assert policy.get_delay() == 0.091
+
+    def test_budget(self):
+        policy = create_policy('options.hedge_budget', 2, 'options.hedge_budget_ratio', 0.5)
+        assert policy.withdraw()
+        assert policy.withdraw()
+        assert not policy.withdraw()
+
+        policy.deposit()
+        assert not policy.withdraw()
+        policy.deposit()
+        assert policy.withdraw()
+
+    def test_rest_client(self):
+        services = []
+        for (name, port, delay) in [('slow', 3027, 0.5), ('fast', 3028, 0)]:
+            service = ReplicaRestService(name, delay)
+            service.configure(ConfigParams.from_tuples(
+                'connection.protocol', 'http',
+                'connection.host', 'localhost',
+                'connection.port', port
+            ))
+            service.open(None)
+            services.append(service)
+
+        client = ReplicaRestClient()
+        client.configure(ConfigParams.from_tuples(
+            'connections.slow.uri', 'http://localhost:3027',
+            'connections.fast.uri', 'http://localhost:3028',
+            'options.hedging', True,
+            'options.hedge_delay', 50,
+            'options.hedge_budget', 2,
+            'options.hedge_budget_ratio', 0
+        ))
+        client.open(None)
+        try:
+            # Calls to the slow replica are hedged on the fast one
+            for _ in range(2):
+                start = time.perf_counter()
+                assert client.get_name() == 'fast'
+                assert time.perf_counter() - start < 0.4
+
+            # When the budget is exhausted the slow replica is awaited
+            assert client.get_name() == 'slow'
+        finally:
+            client.close(None)
+            for service in services:
+                service.close(None)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.clients.test_HttpClientCache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from typing import List
+
+import bottle
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.refer import References, Descriptor
+from pip_services3_components.count import CachedCounters, CounterType, Counter
+
+from pip_services3_rpc.clients import HttpClientCache, RestClient
+from pip_services3_rpc.services import RestService, HttpResponseCache
+
+
+def create_cache(*tuples) -> HttpClientCache:
+    cache = HttpClientCache()
+    cache.configure(ConfigParams.from_tuples('options.cache', True, *tuples))
+    return cache
+
+
+class MemoryCounters(CachedCounters):
+
+    def _save(self, counters: List[Counter]):
+        pass
+
+
+class ReferenceRestService(RestService):
+
+    def __init__(self):
+        super(ReferenceRestService, self).__init__()
+        self._base_route = 'reference'
+        self.calls = 0
+        self.cache = HttpResponseCache()
+
+    def __get_fresh(self):
+        self.calls += 1
+        bottle.response.headers['Cache-Control'] = 'max-age=60'
+        return self.send_result({'calls': self.calls})
+
+    def __get_validated(self):
+        self.calls += 1
+        return self.send_result({'name': 'countries'})
+
+    def __get_uncached(self):
+        self.calls += 1
+        return self.send_result({'calls': self.calls})
+
+    def register(self):
+        self.register_route('get', '/fresh', None, self.__get_fresh)
+        self.register_route('get', '/validated', None, self.__get_validated, cache=self.cache)
+        self.register_route('get', '/uncached', None, self.__get_uncached)
+
+
+class TestHttpClientCache:
+    service = None
+    client = None
+    counters = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.service = ReferenceRestService()
+        cls.service.configure(ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3032
+        ))
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+
+    def setup_method(self):
+        self.service.calls = 0
+        self.counters = MemoryCounters()
+        self.client = RestClient()
+        self.client._base_route = 'reference'
+        self.client.configure(ConfigParams.from_tuples(
+            'connection.uri', 'http://localhost:3032',
+            'options.cache', True
+        ))
+        self.client.set_references(References.from_tuples(
+            Descriptor('pip-services', 'counters', 'memory', 'default', '1.0'), self.counters
+        ))
+        self.client.open(None)
+
+    def teardown_method(self):
+        self.client.close(None)
+
+    def get_count(self, name: str) -> int:
+        counter = self.counters.get(name, CounterType.Increment)
+        return counter.count or 0
+
+    def test_fresh_hits(self):
+        for correlation_id in ['1', '2', '3']:
+            assert self.client._call('get', '/fresh', correlation_id) == {'calls': 1}
+        assert self.service.calls == 1
+        assert self.get_count('reference.get.cache_miss_count') == 1
+        assert self.get_count('reference.get.cache_hit_count') == 2
+
+        assert self.client._call('get', '/fresh', None, {'lang': 'en'}) == {'calls': 2}
+
+    def test_revalidation(self):
+        for _ in range(3):
+            assert self.client._call('get', '/validated') == {'name': 'countries'}
+        assert self.get_count('reference.get.cache_miss_count') == 1
+        assert self.get_count('reference.get.cache_revalidated_count') == 2
+        # Responses are answered from the server cache, so the handler runs once
+        assert self.service.calls == 1
+
+    def test_not_cached(self):
+        assert self.client._call('get', '/uncached') == {'calls': 1}
+        assert self.client._call('get', '/uncached') == {'calls': 2}
+        assert self.get_count('reference.get.cache_miss_count') == 2
+
+    def test_freshness(self):
+        cache = create_cache()
+        assert cache.put('a', 200, {'Cache-Control': 'public, max-age=60'}, b'1')
+        assert cache.get('a').is_fresh()
+
+        assert cache.put('b', 200, {'Cache-Control': 'max-age=60', 'Age': '60', 'ETag': '"1"'}, b'1')
+        assert not cache.get('b').is_fresh()
+
+        assert cache.put('c', 200, {'Cache-Control': 'no-cache', 'ETag': '"1"'}, b'1')
+        assert not cache.get('c').is_fresh()
+        assert cache.get_conditions(cache.get('c')) == {'If-None-Match': '"1"'}
+
+        assert not cache.put('d', 200, {'Cache-Control': 'no-store', 'ETag': '"1"'}, b'1')
+        assert not cache.put('e', 200, {}, b'1')
+        assert not cache.put('f', 404, {'Cache-Control': 'max-age=60'}, b'1')
+        assert cache.get('d') is None
+
+    def test_eviction(self):
+        cache = create_cache('options.cache_max_entries', 2, 'options.cache_max_size', 5)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, 200, {'Cache-Control': 'max-age=60'}, b'12')
+        assert cache.get('a') is None
+        assert cache.get('b') is not None
+
+        cache.put('d', 200, {'Cache-Control': 'max-age=60'}, b'1234')
+        assert cache.get('b') is None and cache.get('c') is None
+        assert cache.get('d') is not None
+
+    def test_keys(self):
+        cache = create_cache()
+        assert cache.get_key('/a', {'b': 1, 'a': 2, 'correlation_id': '1'}) \
+            == cache.get_key('/a', {'a': 2, 'b': 1, 'correlation_id': '2'})
+        assert not HttpClientCache().can_cache('GET')
+        assert not cache.can_cache('POST')
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.clients.test_LoadBalancer
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import pytest
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ConfigException
+
+from pip_services3_rpc.clients import LoadBalancer, RestClient
+from pip_services3_rpc.services import RestService
+
+URIS = ['http://host1:8080', 'http://host2:8080', 'http://host3:8080']
+
+
+def create_balancer(*tuples) -> LoadBalancer:
+    balancer = LoadBalancer()
+    balancer.configure(ConfigParams.from_tuples(*tuples))
+    balancer.set_endpoints(URIS)
+    return balancer
+
+
+class ReplicaRestService(RestService):
+
+    def __init__(self, name: str):
+        super(ReplicaRestService, self).__init__()
+        self._base_route = 'replica'
+        self.__name = name
+
+    def __get_name(self):
+        return self.send_result({'name': self.__name})
+
+    def register(self):
+        self.register_route('get', '/name', None, self.__get_name)
+
+
+class ReplicaRestClient(RestClient):
+
+    def __init__(self):
+        super(ReplicaRestClient, self).__init__()
+        self._base_route = 'replica'
+
+    def get_name(self) -> str:
+        return self._call('get', '/name', None)['name']
+
+
+class TestLoadBalancer:
+
+    def test_round_robin(self):
+        balancer = create_balancer()
+        uris = [balancer.acquire() for _ in range(6)]
+        assert uris == URIS + URIS
+
+    def test_least_requests(self):
+        balancer = create_balancer('options.balancing', 'least_requests')
+        first = balancer.acquire()
+        second = balancer.acquire()
+        third = balancer.acquire()
+        assert {first, second, third} == set(URIS)
+
+        balancer.release(second)
+        assert balancer.acquire() == second
+
+    def test_p2c(self):
+        balancer = create_balancer('options.balancing', 'p2c')
+        for uri in URIS:
+            balancer.release(uri, 100 if uri != URIS[1] else 1)
+
+        # The fastest endpoint wins every comparison it takes part in
+        uris = [balancer.acquire() for _ in range(30)]
+        for uri in uris:
+            balancer.release(uri, 100 if uri != URIS[1] else 1)
+        assert uris.count(URIS[1]) > 10
+        assert all(uri in URIS for uri in uris)
+
+    def test_ejection(self):
+        balancer = create_balancer('options.eject_failures', 2, 'options.eject_timeout', 60000)
+        balancer.release(URIS[0], failed=True)
+        assert balancer.get_healthy_endpoints() == URIS
+
+        balancer.release(URIS[0], failed=True)
+        assert balancer.get_healthy_endpoints() == URIS[1:]
+        assert URIS[0] not in [balancer.acquire() for _ in range(4)]
+
+        # When all endpoints are ejected they are used anyway
+        for uri in URIS[1:]:
+            balancer.release(uri, failed=True)
+            balancer.release(uri, failed=True)
+        assert balancer.get_healthy_endpoints() == []
+        assert balancer.acquire() in URIS
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ConfigException):
+            create_balancer('options.balancing', 'random')
+
+    def test_rest_client(self):
+        services = []
+        for (name, port) in [('a', 3022), ('b', 3023)]:
+            service = ReplicaRestService(name)
+            service.configure(ConfigParams.from_tuples(
+                'connection.protocol', 'http',
+                'connection.host', 'localhost',
+                'connection.port', port
+            ))
+            service.open(None)
+            services.append(service)
+
+        # The third replica is down, calls to it are retried on other replicas
+        client = ReplicaRestClient()
+        client.configure(ConfigParams.from_tuples(
+            'connections.a.uri', 'http://localhost:3022',
+            'connections.b.uri', 'http://localhost:3023',
+            'connections.c.uri', 'http://localhost:3024',
+            'options.eject_failures', 1,
+            'options.retry_delay', 1
+        ))
+        client.open(None)
+        try:
+            names = [client.get_name() for _ in range(10)]
+            assert set(names) == {'a', 'b'}
+            assert client._balancer.get_healthy_endpoints() == ['http://localhost:3022', 'http://localhost:3023']
+        finally:
+            client.close(None)
+            for service in services:
+                service.close(None)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.clients.test_RestClientRetries
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+import time
+from threading import Thread
+from typing import List
+
+import pytest
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import InvocationException, ApplicationException, ErrorDescription
+from pip_services3_commons.refer import References, Descriptor
+from pip_services3_components.count import CachedCounters, CounterType, Counter
+
+from pip_services3_rpc.clients import RestClient
+from pip_services3_rpc.services import SSLCherryPyServer
+
+hits = []
+
+
+def failing_app(environ, start_response):
+    hits.append(environ['PATH_INFO'])
+    if environ['PATH_INFO'] == '/slow':
+        time.sleep(1.5)
+    start_response('503 Service Unavailable', [('Content-Type', 'application/json')])
+    return [json.dumps(ErrorDescription.from_json({
+        'type': None, 'category': 'Unknown', 'status': 503, 'code': 'UNAVAILABLE', 'message': 'Service is unavailable',
+        'details': None, 'correlation_id': None, 'cause': None, 'stack_trace': None
+    }).to_json()).encode('utf-8')]
+
+
+class MemoryCounters(CachedCounters):
+
+    def _save(self, counters: List[Counter]):
+        pass
+
+
+class TestRestClientRetries:
+    server = None
+    client = None
+    counters = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.server = SSLCherryPyServer(host='localhost', port=3012)
+        Thread(target=cls.server.run, args=(failing_app,), daemon=True).start()
+        time.sleep(0.5)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+
+    def setup_method(self):
+        hits.clear()
+        self.counters = MemoryCounters()
+        self.client = self.create_client(3012, self.counters)
+
+    def teardown_method(self):
+        self.client.close(None)
+
+    def create_client(self, port: int, counters: MemoryCounters) -> RestClient:
+        client = RestClient()
+        client.configure(ConfigParams.from_tuples(
+            "connection.protocol", "http",
+            "connection.host", "localhost",
+            "connection.port", port,
+            "options.retries", 2,
+            "options.retry_delay", 10,
+            "options.timeout", 1000
+        ))
+        client.set_references(References.from_tuples(
+            Descriptor('pip-services', 'counters', 'memory', 'default', '1.0'), counters
+        ))
+        client.open(None)
+        return client
+
+    def get_count(self, name: str, counters: MemoryCounters = None) -> int:
+        counter = (counters or self.counters).get(name, CounterType.Increment)
+        return counter.count or 0
+
+    def test_retry_idempotent_call(self):
+        with pytest.raises(ApplicationException):
+            self.client._call('GET', '/unavailable')
+
+        assert len(hits) == 3
+        assert self.get_count('rest.get.attempt_count') == 3
+        assert self.get_count('rest.get.retry_count') == 2
+
+    def test_not_retry_post_call(self):
+        with pytest.raises(ApplicationException):
+            self.client._call('POST', '/unavailable')
+
+        assert len(hits) == 1
+        assert self.get_count('rest.post.attempt_count') == 1
+        assert self.get_count('rest.post.retry_count') == 0
+
+    def test_not_retry_post_after_read_error(self):
+        with pytest.raises(InvocationException):
+            self.client._call('POST', '/slow')
+
+        assert len(hits) == 1
+        assert self.get_count('rest.post.retry_count') == 0
+
+    def test_call_timeout(self):
+        start = time.perf_counter()
+        with pytest.raises(InvocationException):
+            self.client._call('GET', '/slow', timeout=300)
+
+        # The read timeout is shortened to the call timeout and no time is left for retries
+        assert time.perf_counter() - start < 1
+        assert len(hits) == 1
+
+    def test_retry_connect_error(self):
+        counters = MemoryCounters()
+        client = self.create_client(3013, counters)
+        try:
+            with pytest.raises(InvocationException):
+                client._call('POST', '/unavailable')
+
+            assert self.get_count('rest.post.attempt_count', counters) == 3
+            assert self.get_count('rest.post.retry_count', counters) == 2
+        finally:
+            client.close(None)
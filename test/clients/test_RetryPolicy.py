@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.clients.test_RetryPolicy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: (c) Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+
+from pip_services3_commons.config import ConfigParams
+
+from pip_services3_rpc.clients import RetryPolicy
+
+
+class TestRetryPolicy:
+
+    def test_retriable_failures(self):
+        policy = RetryPolicy()
+        policy.configure(ConfigParams.from_tuples("options.retries", 2))
+
+        assert policy.can_retry('GET', 0, status=503)
+        assert policy.can_retry('PUT', 0, error=True)
+        assert policy.can_retry('POST', 0, connect_error=True)
+
+        assert policy.can_retry('POST', 0, status=429)
+
+        assert not policy.can_retry('GET', 0, status=500)
+        assert not policy.can_retry('POST', 0, status=503)
+        assert not policy.can_retry('POST', 0, error=True)
+        assert not policy.can_retry('GET', 2, status=503)
+
+    def test_backoff_delay(self):
+        policy = RetryPolicy()
+        policy.configure(ConfigParams.from_tuples(
+            "options.retry_delay", 100,
+            "options.retry_max_delay", 1000
+        ))
+
+        for attempt in range(10):
+            delay = policy.get_delay(attempt)
+            assert 0 <= delay <= min(1.0, 0.1 * 2 ** attempt)
+
+        assert policy.get_delay(0, '0.5') == 0.5
+
+        # Server asks to wait longer than the maximum delay
+        assert policy.can_retry('GET', 0, status=503, retry_after='0.5')
+        assert not policy.can_retry('GET', 0, status=503, retry_after='120')
+
+    def test_retry_budget(self):
+        policy = RetryPolicy()
+        policy.configure(ConfigParams.from_tuples(
+            "options.retry_budget", 2,
+            "options.retry_budget_ratio", 0.5
+        ))
+
+        assert policy.can_retry('GET', 0, status=503)
+        assert policy.can_retry('GET', 0, status=503)
+        assert not policy.can_retry('GET', 0, status=503)
+
+        policy.deposit()
+        policy.deposit()
+        assert policy.can_retry('GET', 0, status=503)
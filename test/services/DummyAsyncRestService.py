@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+    test.services.DummyAsyncRestService
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Dummy REST service with coroutine handlers
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+
+import bottle
+from pip_services3_commons.errors import UnauthorizedException
+
+from pip_services3_rpc.services import RestService
+
+
+class DummyAsyncRestService(RestService):
+
+    def __init__(self):
+        super(DummyAsyncRestService, self).__init__()
+        self._base_route = 'dummy'
+
+    async def __get_value(self, value):
+        await asyncio.sleep(0.1)
+        # The request must stay the same after other handlers were executed
+        return self.send_result({
+            'value': value,
+            'query': bottle.request.query.get('value'),
+            'correlation_id': self._get_correlation_id()
+        })
+
+    async def __get_secret(self):
+        return self.send_result({'secret': 'abc'})
+
+    def __authorize(self):
+        if bottle.request.query.get('token') != 'valid':
+            raise UnauthorizedException(None, 'NOT_AUTHORIZED', 'Token is not valid')
+
+    def __intercept(self):
+        bottle.response.set_header('X-Intercepted', 'true')
+        bottle.response.set_header('X-Interceptors', bottle.response.get_header('X-Interceptors', '') + 'values;')
+
+    def __intercept_service(self):
+        bottle.response.set_header('X-Interceptors', bottle.response.get_header('X-Interceptors', '') + 'service;')
+
+    def register(self):
+        self.register_interceptor('/', self.__intercept_service)
+        self.register_interceptor('/values', self.__intercept)
+        self.register_route('get', '/values/<value>', None, self.__get_value)
+        self.register_route_with_auth('get', '/secret', None, self.__authorize, self.__get_secret)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+    test_AdaptiveConcurrencyLimiter
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Route concurrency limits tuned by latency
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.refer import References, Descriptor
+from pip_services3_components.count import CachedCounters, Counter, CounterType
+
+from pip_services3_rpc.services import RestService, HttpEndpoint, AdaptiveConcurrencyLimiter
+
+URL = 'http://localhost:3037/adaptive'
+
+
+class MemoryCounters(CachedCounters):
+
+    def _save(self, counters: List[Counter]):
+        pass
+
+
+class SlowRestService(RestService):
+
+    def __init__(self):
+        super(SlowRestService, self).__init__()
+        self._base_route = 'adaptive'
+
+    def __get_slow(self):
+        time.sleep(0.2)
+        return self.send_result({'slow': True})
+
+    def register(self):
+        self.register_route('get', '/slow', None, self.__get_slow)
+
+
+class TestAdaptiveConcurrencyLimiter:
+
+    def test_limit_grows_with_steady_latency(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=30)
+        limits = [limiter.record(10, limiter.get_limit()) for _ in range(100)]
+
+        assert limits[10] > 10
+        assert limits == sorted(limits)
+        assert limits[-1] == 30
+        assert limiter.get_limit() == 30
+
+    def test_limit_shrinks_when_latency_grows(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=40, min_limit=5)
+        for _ in range(50):
+            limiter.record(10, limiter.get_limit())
+        limit = limiter.get_limit()
+
+        for _ in range(30):
+            limiter.record(50, limiter.get_limit())
+        assert limiter.get_limit() < limit / 2
+        assert limiter.get_limit() >= 5
+        assert limiter.get_rtt() > 2 * limiter.get_baseline_rtt()
+
+    def test_limit_does_not_grow_when_unused(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=20)
+        for _ in range(50):
+            limiter.record(10, 2)
+        assert limiter.get_limit() == 20
+
+    def test_admission_follows_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+        assert limiter.acquire() and limiter.acquire()
+        assert not limiter.acquire()
+
+        for _ in range(30):
+            limiter.record(10, 2)
+        assert limiter.get_limit() > 2
+        assert limiter.acquire()
+
+
+class TestHttpEndpointAdaptiveConcurrency:
+    endpoint = None
+    service = None
+    counters = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.counters = MemoryCounters()
+        cls.endpoint = HttpEndpoint()
+        cls.endpoint.configure(ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3037,
+            'options.admission_queue_size', 0,
+            'options.adaptive_concurrency', True,
+            'options.adaptive_initial_limit', 1
+        ))
+        cls.endpoint.set_references(References.from_tuples(
+            Descriptor('pip-services', 'counters', 'memory', 'default', '1.0'), cls.counters
+        ))
+
+        cls.service = SlowRestService()
+        cls.service.set_references(References.from_tuples(
+            Descriptor('pip-services', 'endpoint', 'http', 'default', '1.0'), cls.endpoint
+        ))
+        cls.endpoint.open(None)
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+        cls.endpoint.close(None)
+
+    def test_route_limit(self):
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(requests.get, URL + '/slow')
+            time.sleep(0.05)
+            second = executor.submit(requests.get, URL + '/slow')
+            assert first.result().status_code == 200
+            assert second.result().status_code == 503
+
+        limit = self.counters.get('http_endpoint.get.adaptive.slow.concurrency_limit', CounterType.LastValue)
+        rtt = self.counters.get('http_endpoint.get.adaptive.slow.rtt', CounterType.LastValue)
+        assert limit.last >= 1
+        assert rtt.last >= 200
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+    test_AdmissionController
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    In-flight limits and load shedding of HTTP endpoint
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+from typing import List
+
+import requests
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.refer import References, Descriptor
+from pip_services3_components.count import CachedCounters, Counter, CounterType
+
+from pip_services3_rpc.services import RestService, HttpEndpoint, AdmissionController
+
+URL = 'http://localhost:{}/admission'
+
+
+class MemoryCounters(CachedCounters):
+
+    def _save(self, counters: List[Counter]):
+        pass
+
+
+class SlowRestService(RestService):
+
+    def __init__(self):
+        super(SlowRestService, self).__init__()
+        self._base_route = 'admission'
+        self.calls = 0
+
+    def __get_slow(self):
+        self.calls += 1
+        time.sleep(0.3)
+        return self.send_result({'calls': self.calls})
+
+    def register(self):
+        self.register_route('get', '/slow', None, self.__get_slow)
+        self.register_route('get', '/limited', None, self.__get_slow, max_in_flight=1)
+
+
+def get_all(path: str, count: int, headers: dict = None, port: int = 3034) -> List[requests.Response]:
+    with ThreadPoolExecutor(count) as executor:
+        futures = []
+        for _ in range(count):
+            futures.append(executor.submit(requests.get, URL.format(port) + path, headers=headers))
+            # Requests come in order, so it is known which of them are queued
+            time.sleep(0.02)
+        return [future.result() for future in futures]
+
+
+def open_service(port: int, *tuples) -> SlowRestService:
+    service = SlowRestService()
+    service.configure(ConfigParams.from_tuples(
+        'connection.protocol', 'http',
+        'connection.host', 'localhost',
+        'connection.port', port,
+        *tuples
+    ))
+    return service
+
+
+class TestAdmissionController:
+
+    def test_limit_and_queue(self):
+        admission = AdmissionController(1, queue_size=1, queue_timeout=1000)
+        assert admission.acquire()
+
+        results = []
+        waiter = Thread(target=lambda: results.append(admission.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        assert admission.get_waiting() == 1
+        # The queue is full
+        assert not admission.acquire()
+
+        admission.release()
+        waiter.join()
+        assert results == [True]
+        assert admission.get_in_flight() == 1
+        assert admission.get_waiting() == 0
+
+    def test_queue_timeout(self):
+        admission = AdmissionController(1, queue_size=10, queue_timeout=1000)
+        assert admission.acquire()
+
+        start = time.perf_counter()
+        assert not admission.acquire(0.1)
+        assert time.perf_counter() - start < 0.5
+        assert admission.get_waiting() == 0
+
+    def test_acquire_async(self):
+        admission = AdmissionController(1, queue_size=1, queue_timeout=100)
+        assert admission.acquire()
+
+        async def acquire():
+            return await admission.acquire_async()
+
+        assert not asyncio.run(acquire())
+        Thread(target=lambda: (time.sleep(0.03), admission.release())).start()
+        assert asyncio.run(acquire())
+        assert admission.get_in_flight() == 1
+
+
+class TestHttpEndpointAdmission:
+    endpoint = None
+    service = None
+    counters = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.counters = MemoryCounters()
+        cls.endpoint = HttpEndpoint()
+        cls.endpoint.configure(ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3034,
+            'options.max_in_flight', 2,
+            'options.admission_queue_size', 1,
+            'options.admission_queue_timeout', 1000,
+            'options.admission_retry_after', 2
+        ))
+        # Counters are given only to the endpoint that reports admission
+        cls.endpoint.set_references(References.from_tuples(
+            Descriptor('pip-services', 'counters', 'memory', 'default', '1.0'), cls.counters
+        ))
+
+        cls.service = SlowRestService()
+        cls.service.set_references(References.from_tuples(
+            Descriptor('pip-services', 'endpoint', 'http', 'default', '1.0'), cls.endpoint
+        ))
+        cls.endpoint.open(None)
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+        cls.endpoint.close(None)
+
+    def test_shed_requests(self):
+        self.counters.clear_all()
+        responses = get_all('/slow', 5)
+
+        statuses = [response.status_code for response in responses]
+        assert statuses == [200, 200, 200, 503, 503]
+        assert responses[3].headers['Retry-After'] == '2'
+        assert responses[3].json()['code'] == 'SERVICE_OVERLOADED'
+
+        assert self.counters.get('http_endpoint.shed_count', CounterType.Increment).count == 2
+        wait_time = self.counters.get('http_endpoint.queue_wait_time', CounterType.Statistics)
+        assert wait_time.count == 3
+        assert wait_time.max >= 200
+
+    def test_queue_limited_by_deadline(self):
+        responses = get_all('/slow', 3, headers={'X-Request-Timeout': '100'})
+        assert [response.status_code for response in responses] == [200, 200, 503]
+
+    def test_route_limit(self):
+        service = open_service(3035, 'options.admission_queue_size', 0)
+        service.open(None)
+        try:
+            responses = get_all('/limited', 2, port=3035)
+            assert [response.status_code for response in responses] == [200, 503]
+            responses = get_all('/slow', 2, port=3035)
+            assert [response.status_code for response in responses] == [200, 200]
+        finally:
+            service.close(None)
+
+    def test_maintenance(self):
+        service = open_service(3036, 'options.maintenance_enabled', True)
+        service.open(None)
+        try:
+            response = requests.get('http://localhost:3036/admission/slow')
+            assert response.status_code == 503
+            assert response.headers['Retry-After'] == '3600'
+            assert service.calls == 0
+        finally:
+            service.close(None)
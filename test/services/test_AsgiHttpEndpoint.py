@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+    test_AsgiHttpEndpoint
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    HTTP endpoint in ASGI server mode test
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+
+import pytest
+import requests
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ConnectionException
+from pip_services3_commons.refer import References, Descriptor
+
+from pip_services3_rpc.services import HttpEndpoint, HttpResponseSender
+from ..DummyController import DummyController
+from ..clients.DummyClientFixture import DummyClientFixture
+from ..clients.DummyRestClient import DummyRestClient
+from ..services.DummyRestService import DummyRestService
+
+pytest.importorskip('uvicorn')
+
+rest_config = ConfigParams.from_tuples(
+    "connection.protocol", "http",
+    'connection.host', 'localhost',
+    'connection.port', 3008,
+    'options.server_mode', 'asgi'
+)
+
+
+class TestAsgiHttpEndpoint:
+    service = None
+    endpoint = None
+
+    @classmethod
+    def setup_class(cls):
+        controller = DummyController()
+        cls.service = DummyRestService()
+
+        cls.endpoint = HttpEndpoint()
+        cls.endpoint.configure(rest_config)
+
+        references = References.from_tuples(
+            Descriptor("pip-services-dummies", "controller", "default", "default", "1.0"), controller,
+            Descriptor('pip-services-dummies', 'service', 'rest', 'default', '1.0'), cls.service,
+            Descriptor('pip-services', 'endpoint', 'http', 'default', '1.0'), cls.endpoint
+        )
+
+        cls.service.set_references(references)
+        cls.endpoint.open(None)
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+        cls.endpoint.close(None)
+
+    def test_sync_routes(self):
+        client = DummyRestClient()
+        client.configure(rest_config)
+        client.set_references(References())
+        client.open(None)
+
+        try:
+            DummyClientFixture(client).test_crud_operations()
+        finally:
+            client.close(None)
+
+    def test_coroutine_routes(self):
+        async def handler(value):
+            await asyncio.sleep(0.01)
+            return HttpResponseSender.send_result({'value': value})
+
+        self.endpoint.register_route('get', '/async/<value>', None, handler)
+
+        response = requests.get('http://localhost:3008/async/abc', timeout=5)
+        assert response.status_code == 200
+        assert response.json() == {'value': 'abc'}
+        assert response.headers['Cache-Control'] == 'no-cache, no-store, must-revalidate'
+
+    def test_request_too_large(self):
+        response = requests.post('http://localhost:3008/dummies', data=b'x' * (2 * 1024 * 1024), timeout=5)
+        assert response.status_code == 413
+        assert response.json()['code'] == 'REQUEST_TOO_LARGE'
+
+    def test_port_in_use(self):
+        endpoint = HttpEndpoint()
+        endpoint.configure(rest_config)
+
+        with pytest.raises(ConnectionException):
+            endpoint.open(None)
+        assert not endpoint.is_open()
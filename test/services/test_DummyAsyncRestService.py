@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+    test_DummyAsyncRestService
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    REST service with coroutine handlers test in threaded and ASGI server modes
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from pip_services3_commons.config import ConfigParams
+
+from .DummyAsyncRestService import DummyAsyncRestService
+
+modes = [('wsgi', 3014), ('asgi', 3015)]
+
+
+@pytest.fixture(scope='module', params=modes, ids=[mode for (mode, _) in modes])
+def url(request):
+    mode, port = request.param
+    if mode == 'asgi':
+        pytest.importorskip('uvicorn')
+
+    service = DummyAsyncRestService()
+    service.configure(ConfigParams.from_tuples(
+        'connection.protocol', 'http',
+        'connection.host', 'localhost',
+        'connection.port', port,
+        'options.server_mode', mode
+    ))
+    service.open(None)
+    yield f'http://localhost:{port}/dummy'
+    service.close(None)
+
+
+class TestDummyAsyncRestService:
+
+    def test_coroutine_route(self, url):
+        response = requests.get(url + '/values/abc?value=abc&correlation_id=123', timeout=5)
+        assert response.status_code == 200
+        assert response.json() == {'value': 'abc', 'query': 'abc', 'correlation_id': '123'}
+        assert response.headers['X-Intercepted'] == 'true'
+
+    def test_interceptors(self, url):
+        # Interceptors of parent routes are called first, in the order of registration
+        response = requests.get(url + '/values/abc?value=abc', timeout=5)
+        assert response.headers['X-Interceptors'] == 'service;values;'
+
+        response = requests.get(url + '/secret?token=valid', timeout=5)
+        assert response.headers['X-Interceptors'] == 'service;'
+        assert 'X-Intercepted' not in response.headers
+
+    def test_concurrent_requests(self, url):
+        values = [str(i) for i in range(10)]
+        with ThreadPoolExecutor(len(values)) as executor:
+            responses = list(executor.map(
+                lambda value: requests.get(f'{url}/values/{value}?value={value}', timeout=5).json(), values))
+
+        for (value, response) in zip(values, responses):
+            assert response['value'] == value
+            assert response['query'] == value
+
+    def test_route_with_auth(self, url):
+        response = requests.get(url + '/secret?token=valid', timeout=5)
+        assert response.status_code == 200
+        assert response.json() == {'secret': 'abc'}
+
+        response = requests.get(url + '/secret?token=invalid', timeout=5)
+        assert response.status_code == 401
+        assert response.json()['code'] == 'NOT_AUTHORIZED'
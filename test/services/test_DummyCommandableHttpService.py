@@ -25,7 +25,9 @@ rest_config = ConfigParams.from_tuples(
     "connection.protocol", "http",
     "connection.host", "localhost",
     "connection.port", 3005,
-    "swagger.enable", "true"
+    "swagger.enable", "true",
+    "batch.enabled", True,
+    "batch.max_size", 10
 )
 
 DUMMY1 = Dummy(None, 'Key 1', 'Content 1', [SubDummy('SubKey 1', 'SubContent 1')])
@@ -110,6 +112,35 @@ class TestDummyCommandableHttpService():
         if response.status_code != 204:
             return response.json()
 
+    def test_batch(self):
+        for parallel in ['false', 'true']:
+            response = requests.post('http://localhost:3005/dummy/batch?correlation_id=123&parallel=' + parallel,
+                                     json=[
+                                         {'command': 'create_dummy', 'args': {'dummy': DUMMY1.to_json()}},
+                                         {'command': 'create_dummy', 'args': {}},
+                                         {'command': 'unknown'},
+                                         {'command': 'check_correlation_id'},
+                                     ], timeout=5)
+            assert response.status_code == 200
+
+            results = response.json()
+            assert len(results) == 4
+            assert results[0]['result']['key'] == DUMMY1.key
+            assert results[1]['error']['status'] == 400
+            assert results[1]['error']['correlation_id'] == '123'
+            assert results[2]['error']['code'] == 'CMD_NOT_FOUND'
+            assert results[3]['result'] == {'correlation_id': '123'}
+
+        # Invalid batches are rejected as a whole
+        response = requests.post('http://localhost:3005/dummy/batch', json={'command': 'get_dummies'}, timeout=5)
+        assert response.status_code == 400
+        assert response.json()['code'] == 'INVALID_BATCH'
+
+        response = requests.post('http://localhost:3005/dummy/batch', json=[{'command': 'get_dummies'}] * 11,
+                                 timeout=5)
+        assert response.status_code == 400
+        assert response.json()['code'] == 'BATCH_TOO_LARGE'
+
     def test_check_correlation_id(self):
         # check transmit correlation_id over params
         result = self.invoke('/dummy/check_correlation_id?correlation_id=test_cor_id', None)
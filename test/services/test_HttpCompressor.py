@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+    test_HttpCompressor
+    ~~~~~~~~~~~~~~~~~~~
+
+    Response compression test in threaded and ASGI server modes
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import gzip
+
+import bottle
+import pytest
+import requests
+from pip_services3_commons.config import ConfigParams
+
+from pip_services3_rpc.clients import RestClient
+from pip_services3_rpc.services import RestService, HttpCompressor
+
+ITEMS = [{'id': str(i), 'name': 'Item %d' % i} for i in range(200)]
+
+modes = [('wsgi', 3017), ('asgi', 3018)]
+
+
+class CompressedRestService(RestService):
+
+    def __init__(self):
+        super(CompressedRestService, self).__init__()
+        self._base_route = 'compressed'
+
+    def __get_items(self):
+        return self.send_result({'data': ITEMS})
+
+    async def __get_items_async(self):
+        return self.send_result({'data': ITEMS})
+
+    def __get_item(self):
+        return self.send_result(ITEMS[0])
+
+    def __get_image(self):
+        bottle.response.content_type = 'image/png'
+        return b'\x89PNG' + b'\x00' * 4096
+
+    def register(self):
+        self.register_route('get', '/items', None, self.__get_items)
+        self.register_route('get', '/items_async', None, self.__get_items_async)
+        self.register_route('get', '/item', None, self.__get_item)
+        self.register_route('get', '/image', None, self.__get_image)
+
+
+class CompressedRestClient(RestClient):
+
+    def __init__(self):
+        super(CompressedRestClient, self).__init__()
+        self._base_route = 'compressed'
+
+    def get_items(self) -> dict:
+        return self._call('get', '/items', None)
+
+
+@pytest.fixture(scope='module', params=modes, ids=[mode for (mode, _) in modes])
+def url(request):
+    mode, port = request.param
+    if mode == 'asgi':
+        pytest.importorskip('uvicorn')
+
+    service = CompressedRestService()
+    service.configure(ConfigParams.from_tuples(
+        'connection.protocol', 'http',
+        'connection.host', 'localhost',
+        'connection.port', port,
+        'options.server_mode', mode,
+        'options.compression_enabled', True,
+        'options.compression_min_size', 512
+    ))
+    service.open(None)
+    yield f'http://localhost:{port}/compressed'
+    service.close(None)
+
+
+def get_raw(url: str, accept_encoding: str) -> requests.Response:
+    response = requests.get(url, headers={'Accept-Encoding': accept_encoding}, stream=True, timeout=5)
+    response.raw.decode_content = False
+    response.raw_content = response.raw.read()
+    return response
+
+
+class TestHttpCompressor:
+
+    def test_gzip(self, url):
+        for route in ['/items', '/items_async']:
+            response = get_raw(url + route, 'gzip')
+            assert response.status_code == 200
+            assert response.headers['Content-Encoding'] == 'gzip'
+            assert 'Accept-Encoding' in response.headers['Vary']
+            assert int(response.headers['Content-Length']) == len(response.raw_content)
+            assert bottle.json_loads(gzip.decompress(response.raw_content)) == {'data': ITEMS}
+
+    def test_negotiation(self, url):
+        encodings = HttpCompressor.get_supported_encodings()
+
+        response = get_raw(url + '/items', 'gzip;q=0.5, deflate')
+        assert response.headers['Content-Encoding'] == 'deflate'
+
+        response = get_raw(url + '/items', 'gzip, deflate, br')
+        assert response.headers['Content-Encoding'] == encodings[0]
+
+        response = get_raw(url + '/items', 'identity')
+        assert 'Content-Encoding' not in response.headers
+        assert bottle.json_loads(response.raw_content) == {'data': ITEMS}
+
+        response = get_raw(url + '/items', 'gzip;q=0, *;q=0')
+        assert 'Content-Encoding' not in response.headers
+
+    def test_skipped_responses(self, url):
+        # Too small body
+        response = get_raw(url + '/item', 'gzip')
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert bottle.json_loads(response.raw_content) == ITEMS[0]
+
+        # Not allowed content type
+        response = get_raw(url + '/image', 'gzip')
+        assert 'Content-Encoding' not in response.headers
+        assert response.raw_content.startswith(b'\x89PNG')
+
+    def test_client_decoding(self, url):
+        client = CompressedRestClient()
+        client.configure(ConfigParams.from_tuples(
+            'connection.uri', url.rsplit('/', 1)[0]
+        ))
+        client.open(None)
+        try:
+            assert client.get_items() == {'data': ITEMS}
+        finally:
+            client.close(None)
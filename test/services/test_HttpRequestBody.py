@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+    test_HttpRequestBody
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import io
+import json
+
+import bottle
+
+from pip_services3_rpc.services import HttpRequestBody, HttpRequestDetector
+
+
+def create_request(body: bytes, content_type: str = 'application/json') -> bottle.BaseRequest:
+    return bottle.BaseRequest({
+        'REQUEST_METHOD': 'POST',
+        'CONTENT_TYPE': content_type,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body)
+    })
+
+
+class TestHttpRequestBody:
+    calls = 0
+
+    def setup_method(self):
+        self.calls = 0
+
+        def decode(value):
+            self.calls += 1
+            return json.loads(value)
+
+        HttpRequestBody.set_decoder(decode)
+
+    def teardown_method(self):
+        HttpRequestBody.set_decoder(None)
+
+    def test_parse_once(self):
+        req = create_request(b'{"connection": {"remoteAddress": "10.0.0.1"}, "name": "abc"}')
+
+        assert HttpRequestBody.get_json(req) == {'connection': {'remoteAddress': '10.0.0.1'}, 'name': 'abc'}
+        assert HttpRequestBody.get_json(req) is HttpRequestBody.get_json(req)
+        assert req.json is HttpRequestBody.get_json(req)
+        assert HttpRequestDetector.detect_address(req) == '10.0.0.1'
+        assert self.calls == 1
+
+    def test_json_string_body(self):
+        req = create_request(json.dumps(json.dumps({'name': 'abc'})).encode('utf-8'))
+
+        assert HttpRequestBody.get_json(req) == {'name': 'abc'}
+        # Bottle keeps the original value
+        assert req.json == '{"name": "abc"}'
+        assert HttpRequestBody.get_json(req) == {'name': 'abc'}
+        assert self.calls == 2
+
+    def test_no_json_body(self):
+        assert HttpRequestBody.get_json(create_request(b'')) is None
+        assert HttpRequestBody.get_json(create_request(b'name=abc', 'application/x-www-form-urlencoded')) is None
+        assert self.calls == 0
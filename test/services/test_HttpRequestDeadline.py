@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+    test_HttpRequestDeadline
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Deadline propagation between REST clients and HTTP endpoints
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import requests
+from pip_services3_commons.config import ConfigParams
+
+from pip_services3_rpc.clients import RestClient
+from pip_services3_rpc.services import RestService, HttpRequestDeadline
+
+
+class BackRestService(RestService):
+
+    def __init__(self):
+        super(BackRestService, self).__init__()
+        self._base_route = 'back'
+        self.calls = 0
+
+    def __get_remaining(self):
+        self.calls += 1
+        return self.send_result({'remaining': HttpRequestDeadline.get_remaining_time()})
+
+    def register(self):
+        self.register_route('get', '/remaining', None, self.__get_remaining)
+
+
+class DeadlineRestClient(RestClient):
+
+    def __init__(self, base_route: str):
+        super(DeadlineRestClient, self).__init__()
+        self._base_route = base_route
+
+
+class FrontRestService(RestService):
+
+    def __init__(self, client: RestClient):
+        super(FrontRestService, self).__init__()
+        self._base_route = 'front'
+        self.__client = client
+
+    def __get_remaining(self):
+        # The nested call is limited by the deadline of the incoming request
+        return self.send_result(self.__client._call('get', '/remaining'))
+
+    def register(self):
+        self.register_route('get', '/remaining', None, self.__get_remaining)
+
+
+def create_service(service: RestService, port: int) -> RestService:
+    service.configure(ConfigParams.from_tuples(
+        'connection.protocol', 'http',
+        'connection.host', 'localhost',
+        'connection.port', port
+    ))
+    service.open(None)
+    return service
+
+
+class TestHttpRequestDeadline:
+    back_service = None
+    front_service = None
+    back_client = None
+    front_client = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.back_service = create_service(BackRestService(), 3030)
+
+        cls.back_client = DeadlineRestClient('back')
+        cls.back_client.configure(ConfigParams.from_tuples('connection.uri', 'http://localhost:3030'))
+        cls.back_client.open(None)
+        cls.front_service = create_service(FrontRestService(cls.back_client), 3029)
+
+        cls.front_client = DeadlineRestClient('front')
+        cls.front_client.configure(ConfigParams.from_tuples('connection.uri', 'http://localhost:3029'))
+        cls.front_client.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.front_client.close(None)
+        cls.back_client.close(None)
+        cls.front_service.close(None)
+        cls.back_service.close(None)
+
+    def test_propagate_deadline(self):
+        result = self.front_client._call('get', '/remaining', timeout=2000)
+        assert 0 < result['remaining'] <= 2000
+
+    def test_no_deadline(self):
+        result = self.front_client._call('get', '/remaining')
+        assert result['remaining'] is None
+
+    def test_reject_expired_request(self):
+        calls = self.back_service.calls
+        response = requests.get('http://localhost:3030/back/remaining', headers={'X-Request-Timeout': '0'})
+        assert response.status_code == 504
+        assert response.json()['code'] == 'DEADLINE_EXCEEDED'
+        assert self.back_service.calls == calls
+
+    def test_ignore_malformed_timeout(self):
+        response = requests.get('http://localhost:3030/back/remaining', headers={'X-Request-Timeout': 'soon'})
+        assert response.status_code == 200
+        assert response.json()['remaining'] is None
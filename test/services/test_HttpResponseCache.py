@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+    test_HttpResponseCache
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Cached GET routes with ETag revalidation
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+
+import bottle
+import pytest
+import requests
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ConfigException, NotFoundException
+
+from pip_services3_rpc.services import RestService, HttpResponseCache
+
+URL = 'http://localhost:3031/cached'
+
+
+class CachedRestService(RestService):
+
+    def __init__(self):
+        super(CachedRestService, self).__init__()
+        self._base_route = 'cached'
+        self.calls = 0
+        self.items_cache = HttpResponseCache(ttl=200, vary_headers=['Accept-Language'])
+        self.item_cache = HttpResponseCache(max_entries=2, cache_control='private, max-age=60')
+
+    def __get_items(self):
+        self.calls += 1
+        return self.send_result({'calls': self.calls, 'query': dict(bottle.request.query.items())})
+
+    def __get_item(self, id):
+        self.calls += 1
+        if id == 'missing':
+            raise NotFoundException(None, 'NOT_FOUND', 'Item is not found')
+        return self.send_result({'id': id, 'calls': self.calls})
+
+    def __get_uncached(self):
+        return self.send_result({'calls': self.calls})
+
+    def register(self):
+        self.register_route('get', '/items', None, self.__get_items, cache=self.items_cache)
+        self.register_route('get', '/items/<id>', None, self.__get_item, cache=self.item_cache)
+        self.register_route('get', '/uncached', None, self.__get_uncached)
+
+
+class TestHttpResponseCache:
+    service = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.service = CachedRestService()
+        cls.service.configure(ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3031
+        ))
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+
+    def setup_method(self):
+        self.service.items_cache.invalidate()
+        self.service.item_cache.invalidate()
+        self.service.calls = 0
+
+    def test_cached_response(self):
+        first = requests.get(URL + '/items?b=2&a=1&correlation_id=1')
+        second = requests.get(URL + '/items?a=1&b=2&correlation_id=2')
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert self.service.calls == 1
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert first.headers['Cache-Control'] == 'no-cache'
+        assert 'Pragma' not in first.headers
+
+        requests.get(URL + '/items?a=2')
+        assert self.service.calls == 2
+
+    def test_not_modified(self):
+        response = requests.get(URL + '/items')
+        etag = response.headers['ETag']
+
+        response = requests.get(URL + '/items', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['ETag'] == etag
+
+        response = requests.get(URL + '/items', headers={'If-None-Match': '"other"'})
+        assert response.status_code == 200
+
+    def test_vary_headers(self):
+        requests.get(URL + '/items', headers={'Accept-Language': 'en'})
+        requests.get(URL + '/items', headers={'Accept-Language': 'de'})
+        requests.get(URL + '/items', headers={'Accept-Language': 'en'})
+        assert self.service.calls == 2
+
+    def test_expiration_and_invalidation(self):
+        requests.get(URL + '/items')
+        time.sleep(0.25)
+        requests.get(URL + '/items')
+        assert self.service.calls == 2
+
+        self.service.items_cache.invalidate('/cached/items')
+        requests.get(URL + '/items')
+        assert self.service.calls == 3
+
+    def test_eviction(self):
+        for id in ['1', '2', '3', '1']:
+            response = requests.get(URL + '/items/' + id)
+            assert response.headers['Cache-Control'] == 'private, max-age=60'
+        assert self.service.calls == 4
+
+        self.service.item_cache.invalidate('/cached/items/1')
+        requests.get(URL + '/items/3')
+        assert self.service.calls == 4
+        requests.get(URL + '/items/1')
+        assert self.service.calls == 5
+
+    def test_errors_not_cached(self):
+        for _ in range(2):
+            response = requests.get(URL + '/items/missing')
+            assert response.status_code == 404
+            assert 'ETag' not in response.headers
+        assert self.service.calls == 2
+
+    def test_uncached_route(self):
+        response = requests.get(URL + '/uncached')
+        assert 'ETag' not in response.headers
+        assert response.headers['Cache-Control'] == 'no-cache, no-store, must-revalidate'
+
+    def test_only_get_routes(self):
+        with pytest.raises(ConfigException):
+            self.service.register_route('post', '/items', None, lambda: None, cache=HttpResponseCache())
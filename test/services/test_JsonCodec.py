@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+    test_JsonCodec
+    ~~~~~~~~~~~~~~
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+from datetime import datetime
+
+import pytest
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.convert import JsonConverter
+from pip_services3_commons.data import DataPage
+from pip_services3_commons.errors import ConfigException
+from pip_services3_commons.refer import References, Descriptor
+
+from pip_services3_rpc.services import JsonCodec, OrjsonCodec
+from ..Dummy import Dummy
+from ..DummyController import DummyController
+from ..SubDummy import SubDummy
+from ..clients.DummyClientFixture import DummyClientFixture
+from ..clients.DummyRestClient import DummyRestClient
+from ..services.DummyRestService import DummyRestService
+
+codecs = ['json', pytest.param('orjson', marks=pytest.mark.skipif(not OrjsonCodec.is_supported(),
+                                                                   reason='orjson is not installed'))]
+
+
+class Attributes:
+
+    def __init__(self):
+        self.name = 'abc'
+        self.time = datetime(2020, 1, 2, 3, 4, 5, 6000)
+        self.tags = {'a'}
+
+
+VALUE = {
+    'page': DataPage([Dummy('1', 'Key 1', 'Content 1', [SubDummy('SubKey 1', 'SubContent 1')])], 1),
+    'attributes': Attributes(),
+    'time': datetime(2020, 1, 2, 3, 4, 5),
+    'numbers': [1, 2.5, True, None],
+    'tuple': ('x', 1),
+    1: 'numeric key'
+}
+
+
+class TestJsonCodec:
+
+    @pytest.mark.parametrize('name', codecs)
+    def test_same_as_json_converter(self, name):
+        codec = JsonCodec.create(name)
+        assert codec.name == name
+
+        text = codec.encode(VALUE)
+        assert isinstance(text, str)
+        assert json.loads(text) == json.loads(JsonConverter.to_json(VALUE))
+        assert codec.decode(text) == codec.decode(text.encode('utf-8')) == json.loads(text)
+
+        assert codec.encode(None) is None
+        assert codec.encode(VALUE['time']) == JsonConverter.to_json(VALUE['time'])
+
+    def test_unknown_codec(self):
+        with pytest.raises(ConfigException):
+            JsonCodec.create('unknown')
+
+    @pytest.mark.parametrize('name', codecs)
+    def test_rest_calls(self, name):
+        config = ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3019,
+            'options.json_codec', name
+        )
+
+        service = DummyRestService()
+        service.configure(config)
+        service.set_references(References.from_tuples(
+            Descriptor('pip-services-dummies', 'controller', 'default', 'default', '1.0'), DummyController(),
+            Descriptor('pip-services-dummies', 'service', 'rest', 'default', '1.0'), service
+        ))
+        service.open(None)
+
+        client = DummyRestClient()
+        client.configure(config)
+        client.set_references(References())
+        client.open(None)
+        try:
+            DummyClientFixture(client).test_crud_operations()
+        finally:
+            client.close(None)
+            service.close(None)
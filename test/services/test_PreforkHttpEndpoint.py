@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+    test_PreforkHttpEndpoint
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    HTTP endpoint with several worker processes test
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import datetime
+import time
+
+import pytest
+import requests
+from pip_services3_commons.config.ConfigParams import ConfigParams
+
+from pip_services3_rpc.services import HeartbeatRestService, PreforkServer
+
+rest_config = ConfigParams.from_tuples(
+    'connection.protocol', 'http',
+    'connection.host', 'localhost',
+    'connection.port', 3009,
+    'options.workers', 2
+)
+
+
+@pytest.mark.skipif(not PreforkServer.is_supported(), reason='Prefork mode is not supported')
+class TestPreforkHttpEndpoint:
+    service = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.service = HeartbeatRestService()
+        cls.service.configure(rest_config)
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+
+    def test_heartbeat(self):
+        result = None
+        # Give workers time to start
+        for _ in range(50):
+            try:
+                result = requests.get('http://localhost:3009/heartbeat', timeout=5).json()
+                break
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.1)
+
+        assert result is not None
+        assert type(datetime.datetime.strptime(result, '%Y-%m-%dT%H:%M:%S.%fZ')) == datetime.datetime
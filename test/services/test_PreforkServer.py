@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+    test_PreforkServer
+    ~~~~~~~~~~~~~~~~~~
+
+    Multi-process server supervision and counters test
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+import os
+import signal
+import time
+from threading import Thread
+from typing import List
+
+import pytest
+import requests
+from pip_services3_components.count import CachedCounters, Counter, CounterType
+
+from pip_services3_rpc.services import PreforkServer, SSLCherryPyServer
+
+PORT = 3016
+
+
+class MemoryCounters(CachedCounters):
+
+    def _save(self, counters: List[Counter]):
+        pass
+
+
+counters = MemoryCounters()
+
+
+def counting_app(environ, start_response):
+    counters.increment_one('prefork.calls')
+    counters.end_timing('prefork.time', 10 if environ['PATH_INFO'] == '/fast' else 30)
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [json.dumps(os.getpid()).encode('utf-8')]
+
+
+def wait_for(condition, timeout: float = 10) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def call(path: str = '/') -> int:
+    # A new connection for every call, so the kernel can pick another worker
+    return requests.get(f'http://localhost:{PORT}{path}', headers={'Connection': 'close'}, timeout=5).json()
+
+
+@pytest.mark.skipif(not PreforkServer.is_supported(), reason='Prefork mode is not supported')
+class TestPreforkServer:
+    server = None
+
+    @classmethod
+    def setup_class(cls):
+        PreforkServer._sync_interval = 0.1
+        PreforkServer._restart_delay = 0.1
+
+        # Calls made before the fork must not be counted by workers
+        counters.increment('prefork.calls', 100)
+
+        cls.server = PreforkServer(host='localhost', port=PORT, workers=2,
+                                   create_server=lambda: SSLCherryPyServer(host='localhost', port=PORT,
+                                                                           reuse_port=True),
+                                   counters=[counters])
+        cls.server.start(counting_app)
+        Thread(target=cls.server.run, args=(counting_app,), daemon=True).start()
+
+        assert wait_for(lambda: len(cls.server.get_worker_pids()) == 2)
+        assert wait_for(lambda: try_call() is not None)
+        assert wait_for(lambda: counters.get('prefork.calls', CounterType.Increment).count == 101)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        PreforkServer._sync_interval = 1.0
+        PreforkServer._restart_delay = 1.0
+
+    def test_combined_counters(self):
+        start_count = counters.get('prefork.calls', CounterType.Increment).count
+        pids = set(call('/fast' if i % 2 == 0 else '/slow') for i in range(20))
+        assert pids <= set(self.server.get_worker_pids())
+
+        assert wait_for(lambda: counters.get('prefork.calls', CounterType.Increment).count == start_count + 20)
+
+        timing = counters.get('prefork.time', CounterType.Interval)
+        assert wait_for(lambda: timing.count == 21)
+        assert timing.min == 10
+        assert timing.max == 30
+
+    def test_restart_worker(self):
+        pids = self.server.get_worker_pids()
+        os.kill(pids[0], signal.SIGKILL)
+
+        assert wait_for(lambda: pids[0] not in self.server.get_worker_pids()
+                        and len(self.server.get_worker_pids()) == 2)
+        assert wait_for(lambda: try_call() is not None)
+
+
+def try_call():
+    try:
+        return call()
+    except requests.exceptions.ConnectionError:
+        return None
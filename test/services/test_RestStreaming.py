@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+    test_RestStreaming
+    ~~~~~~~~~~~~~~~~~~
+
+    Streamed NDJSON responses in threaded and ASGI server modes
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+
+import pytest
+import requests
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ApplicationException, InvocationException, BadRequestException
+
+from pip_services3_rpc.clients import RestClient
+from pip_services3_rpc.services import RestService
+
+ITEMS = [{'id': str(i), 'name': 'Item %d' % i} for i in range(5000)]
+
+modes = [('wsgi', 3020), ('asgi', 3021)]
+
+
+class StreamingRestService(RestService):
+
+    def __init__(self):
+        super(StreamingRestService, self).__init__()
+        self._base_route = 'streaming'
+
+    def __get_items(self):
+        return self.send_stream(item for item in ITEMS)
+
+    async def __get_items_async(self):
+        return self.send_stream(ITEMS)
+
+    def __get_empty(self):
+        return self.send_stream([])
+
+    def __get_array(self):
+        return self.send_result(ITEMS[:10])
+
+    def __get_failed(self):
+        def items():
+            raise BadRequestException(None, 'NO_ITEMS', 'Items are not available')
+            yield
+
+        return self.send_stream(items())
+
+    def __get_broken(self):
+        def items():
+            yield from ITEMS
+            raise Exception('Connection to database is lost')
+
+        return self.send_stream(items())
+
+    def register(self):
+        self.register_route('get', '/items', None, self.__get_items)
+        self.register_route('get', '/items_async', None, self.__get_items_async)
+        self.register_route('get', '/empty', None, self.__get_empty)
+        self.register_route('get', '/array', None, self.__get_array)
+        self.register_route('get', '/failed', None, self.__get_failed)
+        self.register_route('get', '/broken', None, self.__get_broken)
+
+
+class StreamingRestClient(RestClient):
+
+    def __init__(self):
+        super(StreamingRestClient, self).__init__()
+        self._base_route = 'streaming'
+
+    def get_items(self, route: str) -> list:
+        return list(self._call_stream('get', route, None))
+
+
+@pytest.fixture(scope='module', params=modes, ids=[mode for (mode, _) in modes])
+def port(request):
+    mode, port = request.param
+    if mode == 'asgi':
+        pytest.importorskip('uvicorn')
+
+    service = StreamingRestService()
+    service.configure(ConfigParams.from_tuples(
+        'connection.protocol', 'http',
+        'connection.host', 'localhost',
+        'connection.port', port,
+        'options.server_mode', mode
+    ))
+    service.open(None)
+    yield port
+    service.close(None)
+
+
+@pytest.fixture
+def client(port):
+    client = StreamingRestClient()
+    client.configure(ConfigParams.from_tuples(
+        'connection.uri', f'http://localhost:{port}',
+        'options.retries', 0
+    ))
+    client.open(None)
+    yield client
+    client.close(None)
+
+
+class TestRestStreaming:
+
+    def test_chunked_response(self, port):
+        for route in ['/items', '/items_async']:
+            response = requests.get(f'http://localhost:{port}/streaming' + route, timeout=5)
+            assert response.status_code == 200
+            assert response.headers['Content-Type'] == 'application/x-ndjson'
+            assert response.headers['Transfer-Encoding'] == 'chunked'
+            assert 'Content-Length' not in response.headers
+            assert [json.loads(line) for line in response.text.splitlines()] == ITEMS
+
+    def test_read_stream(self, client):
+        assert client.get_items('/items') == ITEMS
+        assert client.get_items('/items_async') == ITEMS
+        assert client.get_items('/empty') == []
+
+        items = client._call_stream('get', '/items')
+        assert next(items) == ITEMS[0]
+        items.close()
+
+    def test_read_array(self, client):
+        assert client.get_items('/array') == ITEMS[:10]
+
+    def test_errors(self, client):
+        with pytest.raises(ApplicationException) as error:
+            client.get_items('/failed')
+        assert error.value.code == 'NO_ITEMS'
+
+        with pytest.raises(InvocationException):
+            client.get_items('/broken')
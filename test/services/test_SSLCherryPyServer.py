@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+    test_SSLCherryPyServer
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Thread pool of cheroot server test
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+
+import requests
+
+from pip_services3_rpc.services import SSLCherryPyServer
+
+
+def slow_app(environ, start_response):
+    time.sleep(0.5)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'OK']
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSSLCherryPyServer:
+
+    def test_thread_pool_growth(self):
+        reported = []
+        server = SSLCherryPyServer(host='localhost', port=3010, threads=1, max_threads=3, backlog=16,
+                                   shutdown_timeout=1, balance_interval=0.05, stats_interval=0.05,
+                                   on_stats=reported.append)
+        Thread(target=server.run, args=(slow_app,), daemon=True).start()
+
+        try:
+            assert wait_for(lambda: server.get_thread_stats() is not None)
+            assert server.get_thread_stats()['threads'] == 1
+
+            with ThreadPoolExecutor(4) as executor:
+                futures = [executor.submit(requests.get, 'http://localhost:3010', timeout=5) for _ in range(4)]
+
+                assert wait_for(lambda: server.get_thread_stats()['threads'] == 3)
+
+                for future in futures:
+                    assert future.result().text == 'OK'
+
+            assert wait_for(lambda: len(reported) > 0)
+            assert max(stats['threads'] for stats in reported) <= 3
+        finally:
+            server.shutdown()
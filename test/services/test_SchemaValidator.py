@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+    test_SchemaValidator
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import pytest
+from pip_services3_commons.convert import TypeCode
+from pip_services3_commons.validate import ObjectSchema, ArraySchema, MapSchema, FilterParamsSchema, \
+    PagingParamsSchema, ValueComparisonRule, ValidationException, Schema
+
+from pip_services3_rpc.services import SchemaValidator
+
+SUB_SCHEMA = ObjectSchema(True) \
+    .with_required_property('key', TypeCode.String) \
+    .with_optional_property('content', 'String')
+
+SCHEMA = ObjectSchema(True) \
+    .with_optional_property('correlation_id', TypeCode.String) \
+    .with_optional_property('filter', FilterParamsSchema()) \
+    .with_optional_property('paging', PagingParamsSchema()) \
+    .with_required_property('body', ObjectSchema(False)
+                            .with_optional_property('id', TypeCode.String)
+                            .with_required_property('key', TypeCode.String)
+                            .with_optional_property('count', TypeCode.Integer, ValueComparisonRule('GT', 0))
+                            .with_optional_property('created', TypeCode.DateTime)
+                            .with_optional_property('flag', bool)
+                            .with_optional_property('tags', ArraySchema(TypeCode.String))
+                            .with_optional_property('attrs', MapSchema(TypeCode.String, TypeCode.Long))
+                            .with_optional_property('array', ArraySchema(SUB_SCHEMA)))
+
+VALUES = [
+    None,
+    'abc',
+    {},
+    {'body': None},
+    {'body': {'key': 'A'}},
+    {'body': {'key': 'A', 'id': '1', 'count': 5, 'created': '2020-01-01T00:00:00Z', 'flag': True,
+              'tags': ['a', 'b'], 'attrs': {'a': 1, 'b': 2.5}, 'array': [{'key': 'B', 'content': 'C'}]},
+     'filter': {'name': 'abc'}, 'paging': {'skip': 1, 'take': 10}, 'correlation_id': '123'},
+    {'body': {'id': 1, 'count': -1, 'created': 'not a date', 'flag': 'yes', 'tags': 'a',
+              'attrs': ['a'], 'array': [{'content': 1, 'other': 2}, None, 'x'], 'unknown': 1},
+     'filter': [], 'paging': 'abc', 'extra': True},
+    {'body': {'key': 'A', 'tags': [1, None, 'b'], 'attrs': {'a': 'b'}}, 1: 'numeric key'},
+]
+
+
+def to_tuples(results):
+    return [(r.get_path(), r.get_type(), r.get_code(), r.get_message(), r.get_expected(), r.get_actual())
+            for r in results]
+
+
+class TestSchemaValidator:
+
+    @pytest.mark.parametrize('value', VALUES)
+    def test_same_results(self, value):
+        expected = to_tuples(SCHEMA.validate(value))
+        actual = to_tuples(SchemaValidator(SCHEMA).validate(value))
+        assert actual == expected
+
+    def test_custom_schema(self):
+        class CustomSchema(Schema):
+            def _perform_validation(self, path, value, results):
+                super()._perform_validation(path, value, results)
+                results.append('custom')
+
+        schema = ObjectSchema().with_optional_property('value', CustomSchema())
+        assert SchemaValidator(schema).validate({'value': 1}) == ['custom']
+
+    def test_validate_and_throw_exception(self):
+        validator = SchemaValidator(SCHEMA)
+        validator.validate_and_throw_exception('123', VALUES[5])
+
+        with pytest.raises(ValidationException) as error:
+            validator.validate_and_throw_exception('123', VALUES[6])
+
+        expected = SCHEMA.validate_and_return_exception('123', VALUES[6])
+        assert error.value.message == expected.message
+        assert error.value.correlation_id == '123'
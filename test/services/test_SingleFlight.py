@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+    test_SingleFlight
+    ~~~~~~~~~~~~~~~~~
+
+    Coalescing of identical concurrent calls in services and clients
+
+    :copyright: Conceptual Vision Consulting LLC 2015-2016, see AUTHORS for more details.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import List
+
+import bottle
+import pytest
+import requests
+from pip_services3_commons.config import ConfigParams
+from pip_services3_commons.errors import ApplicationException, NotFoundException
+from pip_services3_commons.refer import References, Descriptor
+from pip_services3_components.count import CachedCounters, CounterType, Counter
+
+from pip_services3_rpc.clients import RestClient
+from pip_services3_rpc.services import RestService, SingleFlight
+
+URL = 'http://localhost:3033/flight'
+
+
+class MemoryCounters(CachedCounters):
+
+    def _save(self, counters: List[Counter]):
+        pass
+
+
+class SlowRestService(RestService):
+
+    def __init__(self):
+        super(SlowRestService, self).__init__()
+        self._base_route = 'flight'
+        self.calls = 0
+        self.__flight = SingleFlight()
+
+    def __get_report(self):
+        self.calls += 1
+        time.sleep(0.3)
+        bottle.response.headers['X-Report'] = str(self.calls)
+        return self.send_result({'calls': self.calls})
+
+    def __get_missing(self):
+        self.calls += 1
+        time.sleep(0.3)
+        raise NotFoundException(None, 'NOT_FOUND', 'Report is not found')
+
+    def register(self):
+        self.register_route('get', '/shared', None, self.__flight.wrap(self.__get_report))
+        self.register_route('get', '/missing', None, self.__flight.wrap(self.__get_missing))
+        self.register_route('get', '/report', None, self.__get_report)
+
+
+def run_concurrently(func, count: int = 5) -> list:
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(lambda _: func(), range(count)))
+
+
+class TestSingleFlight:
+    service = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.service = SlowRestService()
+        cls.service.configure(ConfigParams.from_tuples(
+            'connection.protocol', 'http',
+            'connection.host', 'localhost',
+            'connection.port', 3033
+        ))
+        cls.service.open(None)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.service.close(None)
+
+    def setup_method(self):
+        self.service.calls = 0
+
+    def test_execute(self):
+        flight = SingleFlight()
+        started = Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            return 'result'
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.execute, 'key', slow)
+            started.wait()
+            follower = executor.submit(flight.execute, 'key', lambda: 'other')
+            assert leader.result() == ('result', False)
+            assert follower.result() == ('result', True)
+
+        # Completed calls are not shared
+        assert flight.execute('key', lambda: 'new') == ('new', False)
+
+    def test_shared_handler(self):
+        responses = run_concurrently(lambda: requests.get(URL + '/shared'))
+        assert self.service.calls == 1
+        for response in responses:
+            assert response.status_code == 200
+            assert response.json() == {'calls': 1}
+            assert response.headers['X-Report'] == '1'
+
+    def test_shared_error(self):
+        responses = run_concurrently(lambda: requests.get(URL + '/missing'))
+        assert self.service.calls == 1
+        for response in responses:
+            assert response.status_code == 404
+
+    def test_client(self):
+        counters = MemoryCounters()
+        client = RestClient()
+        client._base_route = 'flight'
+        client.configure(ConfigParams.from_tuples(
+            'connection.uri', 'http://localhost:3033',
+            'options.single_flight', True
+        ))
+        client.set_references(References.from_tuples(
+            Descriptor('pip-services', 'counters', 'memory', 'default', '1.0'), counters
+        ))
+        client.open(None)
+        try:
+            results = run_concurrently(lambda: client._call('get', '/report', 'cid'))
+            assert results == [{'calls': 1}] * 5
+            assert self.service.calls == 1
+            assert counters.get('flight.get.coalesced_count', CounterType.Increment).count == 4
+
+            # Errors are raised as without coalescing
+            with pytest.raises(ApplicationException):
+                client._call('get', '/missing')
+        finally:
+            client.close(None)